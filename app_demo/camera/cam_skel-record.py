@@ -10,6 +10,8 @@ from mediapipe.tasks.python import vision
 from mediapipe.framework.formats import landmark_pb2
 from mediapipe import solutions
 
+from timestamp_overlay import TimestampOverlay
+
 # Suppress TensorFlow warnings
 os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
 
@@ -74,6 +76,7 @@ def start_recording(cap, filename):
 
 
     print("Recording started. Press 'q' to stop.")
+    overlay = TimestampOverlay()
 
     while cap.isOpened():
         ret, frame = cap.read()
@@ -85,8 +88,7 @@ def start_recording(cap, filename):
         detection_result = detector.detect(mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb))
         annotated_frame = draw_landmarks_on_image(frame_rgb, detection_result)
 
-        timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        cv2.putText(annotated_frame, timestamp, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2, cv2.LINE_AA)
+        overlay.draw(annotated_frame)
 
         out.write(cv2.cvtColor(annotated_frame, cv2.COLOR_RGB2BGR))
         #cv2.imshow("Recording", cv2.cvtColor(annotated_frame, cv2.COLOR_RGB2BGR))
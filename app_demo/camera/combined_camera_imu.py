@@ -7,6 +7,8 @@ import os
 import datetime
 import json
 
+from timestamp_overlay import TimestampOverlay
+
 def start_recording(filename):
     # Create pipeline
     pipeline = dai.Pipeline()
@@ -65,6 +67,7 @@ def start_recording(filename):
                 return False
             
             print(f"Recording started: {output_file}")
+            overlay = TimestampOverlay()
             
             while True:
                 inRgb = qRgb.tryGet()
@@ -74,8 +77,7 @@ def start_recording(filename):
                     frame = inRgb.getCvFrame()
                     
                     # Add timestamp
-                    timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    cv2.putText(frame, timestamp, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2, cv2.LINE_AA)
+                    overlay.draw(frame)
                     
                     # Write frame
                     out.write(frame)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Burned-in timestamp overlay
+The text changes once per second, so it is rendered into an anti-aliased
+alpha tile once per second and blended into each frame instead of calling
+cv2.putText on every frame. Same pixels, position and style as the putText
+call it replaces: white FONT_HERSHEY_SIMPLEX, scale 1, thickness 2 at
+(10, 30), LINE_AA.
+"""
+
+import datetime
+import time
+
+import cv2
+import numpy as np
+
+
+class TimestampOverlay:
+    def __init__(self, origin=(10, 30), scale=1, color=(255, 255, 255), thickness=2):
+        self.origin = origin
+        self.scale = scale
+        self.color = color
+        self.thickness = thickness
+        self.second = None
+
+    def render(self, text):
+        """Alpha tile for one string, cropped to its ink"""
+        (width, height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, self.scale, self.thickness)
+        pad = self.thickness + 1
+        coverage = np.zeros((height + baseline + 2 * pad, width + 2 * pad), np.uint8)
+        cv2.putText(coverage, text, (pad, height + pad), cv2.FONT_HERSHEY_SIMPLEX, self.scale, 255,
+                    self.thickness, cv2.LINE_AA)
+        x, y, ink_width, ink_height = cv2.boundingRect(coverage)
+        coverage = coverage[y:y + ink_height, x:x + ink_width]
+        # frame * (255 - alpha) / 255 + colour * alpha / 255
+        self.inverse = cv2.merge([255 - coverage] * 3)
+        self.tint = cv2.merge([cv2.multiply(coverage, channel / 255.0) for channel in self.color])
+        self.top = self.origin[1] - height - pad + y
+        self.left = self.origin[0] - pad + x
+
+    def draw(self, frame):
+        """Draw the current local time into the frame"""
+        now = time.time()
+        if int(now) != self.second:
+            self.second = int(now)
+            self.render(datetime.datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M:%S'))
+        top, left = max(self.top, 0), max(self.left, 0)
+        bottom = min(self.top + self.inverse.shape[0], frame.shape[0])
+        right = min(self.left + self.inverse.shape[1], frame.shape[1])
+        if top >= bottom or left >= right:
+            return
+        tile = (slice(top - self.top, bottom - self.top), slice(left - self.left, right - self.left))
+        # In place: the ROI view shares the frame's memory
+        roi = frame[top:bottom, left:right]
+        cv2.multiply(roi, self.inverse[tile], dst=roi, scale=1 / 255.0)
+        cv2.add(roi, self.tint[tile], dst=roi)
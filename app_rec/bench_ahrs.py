@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+AHRS benchmark
+Usage: python bench_ahrs.py [--rate 400] [--duration 60] [--sessions 8] [--budget 5]
+
+Runs the Madgwick and Mahony filters (recorder/ahrs.py) over a synthetic
+IMU stream (swaying tilt, gyro noise and bias) and reports:
+- live cost: filter update plus the orientation record, per sample and as
+  a share of one core at --rate (exits non-zero above --budget percent)
+- tilt error against the true orientation
+- offline throughput of fuse() for --sessions streams, and of the NumPy
+  path (all streams as array columns) vs the float path (one by one)
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from recorder import ahrs
+from recorder.ahrs import DEFAULT_PARAMS, OrientationFilter, fuse
+
+# fuse()'s own threshold, restored after forcing each path
+MIN_VECTOR_STREAMS_DEFAULT = ahrs.MIN_VECTOR_STREAMS
+
+
+def synthetic_imu(rate, duration, seed=0):
+    """(times, gyro rad/s, accel m/s^2, true gravity direction) for a swaying sensor"""
+    rng = np.random.default_rng(seed)
+    times = np.arange(0.0, duration, 1.0 / rate)
+    roll = 0.4 * np.sin(2 * np.pi * 0.2 * times)
+    pitch = 0.2 * np.sin(2 * np.pi * 0.13 * times + 1.0)
+    gyro = np.stack([np.gradient(roll, times), np.gradient(pitch, times), np.zeros_like(times)], axis=1)
+    gyro += rng.normal(0.0, 0.01, gyro.shape) + (0.005, -0.003, 0.002)
+    # Gravity in the sensor frame for roll about x then pitch about y
+    down = np.stack([-np.sin(pitch), np.sin(roll) * np.cos(pitch), np.cos(roll) * np.cos(pitch)], axis=1)
+    accel = 9.81 * down + rng.normal(0.0, 0.05, down.shape)
+    return times, gyro, accel, down
+
+
+def gravity(quaternions):
+    """Gravity direction in the sensor frame for (N, 4) quaternions"""
+    w, x, y, z = quaternions.T
+    return np.stack([2 * (x * z - w * y), 2 * (w * x + y * z), w * w - x * x - y * y + z * z], axis=1)
+
+
+def run_live(method, times, gyro, accel):
+    """Quaternions and seconds per sample of the live path"""
+    orientation = OrientationFilter(method)
+    gyro_samples = [tuple(sample) for sample in gyro.tolist()]
+    accel_samples = [tuple(sample) for sample in accel.tolist()]
+    quaternions = []
+    start = time.perf_counter()
+    for t, g, a in zip(times.tolist(), gyro_samples, accel_samples):
+        w, x, y, z = orientation.update(g, a, t)
+        quaternions.append({'w': w, 'x': x, 'y': y, 'z': z, 'device_time': t})
+    elapsed = time.perf_counter() - start
+    return np.array([(q['w'], q['x'], q['y'], q['z']) for q in quaternions]), elapsed / len(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AHRS cost and accuracy benchmark")
+    parser.add_argument('--rate', type=float, default=400.0, help="IMU sample rate (Hz)")
+    parser.add_argument('--duration', type=float, default=60.0, help="seconds of IMU data")
+    parser.add_argument('--sessions', type=int, default=8, help="streams fused together offline")
+    parser.add_argument('--budget', type=float, default=5.0, help="allowed live cost (percent of one core)")
+    args = parser.parse_args()
+
+    times, gyro, accel, down = synthetic_imu(args.rate, args.duration)
+    print(f"AHRS benchmark: {len(times)} samples at {args.rate:g} Hz")
+
+    over_budget = False
+    for method in sorted(DEFAULT_PARAMS):
+        quaternions, per_sample = run_live(method, times, gyro, accel)
+        core_percent = per_sample * args.rate * 100.0
+        over_budget |= core_percent > args.budget
+        settled = int(args.rate * 2)
+        cosine = np.clip(np.sum(gravity(quaternions[settled:]) * down[settled:], axis=1), -1.0, 1.0)
+        error = np.degrees(np.arccos(cosine))
+        print(f"{method:9s} live: {per_sample * 1e6:6.2f} us/sample = {core_percent:.2f}% of a core "
+              f"(budget {args.budget:g}%); tilt error mean {error.mean():.2f} deg, max {error.max():.2f} deg")
+
+        streams = [synthetic_imu(args.rate, args.duration, seed)[:3] for seed in range(args.sessions)]
+        samples = sum(len(stream[0]) for stream in streams)
+        rates = {}
+        for path, min_streams in (('numpy', 1), ('float', args.sessions + 1)):
+            ahrs.MIN_VECTOR_STREAMS = min_streams
+            start = time.perf_counter()
+            fuse(streams, method)
+            rates[path] = samples / (time.perf_counter() - start) / 1e3
+        print(f"{method:9s} offline, {args.sessions} sessions: {rates['numpy']:5.0f}k samples/s as NumPy columns, "
+              f"{rates['float']:5.0f}k samples/s one by one (fuse() switches at {MIN_VECTOR_STREAMS_DEFAULT})")
+        ahrs.MIN_VECTOR_STREAMS = MIN_VECTOR_STREAMS_DEFAULT
+
+    if over_budget:
+        print("Live cost over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
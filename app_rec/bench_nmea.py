@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+NMEA parser throughput benchmark
+Usage: python bench_nmea.py [log.nmea ...]
+
+Replays recorded NMEA logs (one sentence per line) through NmeaParser.
+Without arguments a synthetic multi-GNSS log is generated instead.
+"""
+
+import sys
+import time
+
+from nmea_parser import NmeaParser, xor_checksum
+
+
+def with_checksum(body):
+    """Wrap a sentence body as $body*CS"""
+    return f"${body}*{xor_checksum(body.encode('ascii')):02X}"
+
+
+def synthesize_nmea(epochs=1000, start_seconds=12 * 3600, date="191026"):
+    """Generate a multi-constellation log: GGA/RMC/VTG/GSA/GSV per epoch"""
+    lines = []
+    for n in range(epochs):
+        seconds = start_seconds + n
+        hhmmss = f"{seconds // 3600 % 24:02d}{seconds // 60 % 60:02d}{seconds % 60:02d}.00"
+        lat = f"{3204.0 + (n % 600) / 1000.0:.5f}"
+        lon = f"{3448.0 + (n % 600) / 1000.0:010.5f}"
+        lines.append(with_checksum(f"GNGGA,{hhmmss},{lat},N,{lon},E,1,12,0.8,42.1,M,18.3,M,,"))
+        lines.append(with_checksum(f"GNRMC,{hhmmss},A,{lat},N,{lon},E,1.25,87.3,{date},,,A"))
+        lines.append(with_checksum("GNVTG,87.3,T,,M,1.25,N,2.31,K,A"))
+        lines.append(with_checksum("GNGSA,A,3,02,05,12,15,18,24,25,29,,,,,1.4,0.8,1.1,1"))
+        lines.append(with_checksum("GPGSV,2,1,08,02,45,120,42,05,30,060,38,12,70,300,45,15,15,200,33"))
+        lines.append(with_checksum("GLGSV,1,1,04,65,40,100,40,66,22,180,36,72,55,270,41,81,10,020,30"))
+    return lines
+
+
+def load_logs(paths):
+    lines = []
+    for path in paths:
+        with open(path, 'r', errors='ignore') as f:
+            lines.extend(line.strip() for line in f if line.startswith('$'))
+    return lines
+
+
+def run_benchmark(lines, repeats=5):
+    """Parse all lines `repeats` times; returns best sentences/second"""
+    best = 0.0
+    parser = None
+    for _ in range(repeats):
+        parser = NmeaParser()
+        parse = parser.parse
+        start = time.perf_counter()
+        for line in lines:
+            parse(line, 0.0)
+        elapsed = time.perf_counter() - start
+        best = max(best, len(lines) / elapsed)
+    return best, parser.stats()
+
+
+def main():
+    if len(sys.argv) > 1:
+        lines = load_logs(sys.argv[1:])
+        source = ', '.join(sys.argv[1:])
+    else:
+        lines = synthesize_nmea()
+        source = "synthetic multi-GNSS log"
+
+    if not lines:
+        print("No NMEA sentences found")
+        return
+
+    print(f"NMEA benchmark: {len(lines)} sentences from {source}")
+    rate, stats = run_benchmark(lines)
+    print(f"Throughput: {rate:,.0f} sentences/s ({1e6 / rate:.2f} us/sentence)")
+    print(f"Parser stats: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Burned-in overlay benchmark
+Usage: python bench_overlay.py [--frames 3000] [--fps 15]
+
+Draws the camera3 timestamp and frame counter onto 1080p frames with
+cv2.putText (overlay.draw_info) and with the cached tiles
+(overlay.InfoOverlay), with the timestamp advancing at --fps, and reports
+the per-frame cost of each and how many overlay pixels differ.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from recorder.overlay import InfoOverlay, draw_info
+
+
+def time_per_frame(draw, frame, frames, fps, repeats=3):
+    """Best mean microseconds per frame over `repeats` runs"""
+    best = None
+    start_time = time.time()
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for n in range(frames):
+            draw(frame, start_time + n / fps, n + 1, fps)
+        elapsed = (time.perf_counter() - start) / frames * 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Burned-in overlay benchmark")
+    parser.add_argument('--frames', type=int, default=3000, help="frames per run")
+    parser.add_argument('--fps', type=float, default=15.0, help="video frame rate (timestamp changes once per second)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (1080, 1920, 3), dtype=np.uint8)
+
+    put_text = time_per_frame(draw_info, frame, args.frames, args.fps)
+    cached = time_per_frame(InfoOverlay().draw, frame, args.frames, args.fps)
+
+    # Same overlay both ways on a plain background
+    reference = np.full((100, 480, 3), 64, np.uint8)
+    tiles = reference.copy()
+    draw_info(reference, 1e9, 1234, args.fps)
+    InfoOverlay().draw(tiles, 1e9, 1234, args.fps)
+    text_pixels = np.count_nonzero(np.any(reference != 64, axis=2))
+    error = np.abs(reference.astype(int) - tiles)
+    different = np.count_nonzero(np.any(error > 1, axis=2))
+
+    print(f"Overlay benchmark: {args.frames} frames at {args.fps:g} FPS, 1920x1080")
+    print(f"cv2.putText:  {put_text:8.1f} us/frame")
+    print(f"cached tiles: {cached:8.1f} us/frame ({put_text / cached:.1f}x faster, "
+          f"{100.0 * cached / put_text:.0f}% of the cost)")
+    print(f"Pixels differing by more than 1 level: {different} of {text_pixels} overlay pixels "
+          f"({100.0 * different / max(1, text_pixels):.1f}%, largest difference {error.max()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Hardware-free recorder benchmark
+Usage: python bench_recorder.py [--duration 30] [--fps 30] [--imu-rate 400]
+                                [--replay video.avi] [--skeleton] [--gps]
+                                [--output result.json] [--baseline result.json]
+
+Runs the real recording loop (recorder.core) against the simulated DepthAI
+device in fake_depthai.py: 1080p frames (synthetic, or replayed from a
+video file) and IMU packets at 400-500 Hz through non-blocking queues. With
+--gps, synthetic NMEA is written to a pseudo-terminal that the real GPS
+reader opens as its serial port.
+
+The camera runs at the recorder's output rate unless --fps sets the sensor
+rate (--fps 30 reproduces discarding every other frame on the host).
+
+Reports sustained FPS, XLink frame bytes, the probe latency distributions (perf_probes.py),
+CPU and memory. With --baseline, exits non-zero when FPS or a probe's p95
+is worse than the baseline by more than --tolerance.
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import fake_depthai
+from bench_nmea import synthesize_nmea
+from recorder import core, load_config
+
+# Probes compared against a baseline
+KEY_PROBES = ('frame.total', 'rgb.getCvFrame', 'overlay.text', 'skeleton.detect',
+              'write.camera3', 'imu.parse', 'gps.parse')
+
+
+def load_replay_frames(path, limit):
+    """Decode up to `limit` frames of a video file into memory"""
+    import cv2
+    capture = cv2.VideoCapture(str(path))
+    frames = []
+    while len(frames) < limit:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(frame)
+    capture.release()
+    if not frames:
+        raise RuntimeError(f"No frames could be read from {path}")
+    return frames
+
+
+class FakeGps:
+    """Pseudo-terminal serial port streaming synthetic NMEA at 1 Hz"""
+
+    def __init__(self, epochs=3600):
+        self.master, slave = os.openpty()
+        self.port = os.ttyname(slave)
+        self.slave = slave
+        # Start at the current UTC time so GPS-disciplined timestamps stay continuous
+        now = time.gmtime()
+        self.lines = synthesize_nmea(epochs, start_seconds=now.tm_hour * 3600 + now.tm_min * 60 + now.tm_sec + 1,
+                                     date=time.strftime('%d%m%y', now))
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="sim-gps")
+        self.thread.daemon = True
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def run(self):
+        # Six sentences per epoch, one epoch per second
+        epoch = 0
+        next_time = time.monotonic()
+        while not self.stop_event.is_set() and epoch * 6 < len(self.lines):
+            chunk = '\r\n'.join(self.lines[epoch * 6:epoch * 6 + 6]) + '\r\n'
+            os.write(self.master, chunk.encode('ascii'))
+            epoch += 1
+            next_time += 1.0
+            self.stop_event.wait(max(0.0, next_time - time.monotonic()))
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join(timeout=2)
+        os.close(self.master)
+        os.close(self.slave)
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def rss_bytes():
+    """Current resident set size"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+class ResourceSampler:
+    """Samples process CPU and RSS once per second while recording"""
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self.samples = []
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="sampler")
+        self.thread.daemon = True
+
+    def start(self):
+        self.start_wall = time.monotonic()
+        self.start_cpu = cpu_seconds()
+        self.thread.start()
+        return self
+
+    def run(self):
+        last_wall, last_cpu = self.start_wall, self.start_cpu
+        while not self.stop_event.wait(self.interval):
+            wall, cpu = time.monotonic(), cpu_seconds()
+            self.samples.append({'cpu_percent': 100.0 * (cpu - last_cpu) / (wall - last_wall),
+                                 'rss_bytes': rss_bytes()})
+            last_wall, last_cpu = wall, cpu
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join(timeout=2)
+        wall = time.monotonic() - self.start_wall
+        cpu = cpu_seconds() - self.start_cpu
+        rss = [s['rss_bytes'] for s in self.samples if s['rss_bytes']]
+        return {
+            'cpu_percent': 100.0 * cpu / wall if wall > 0 else 0.0,
+            'cpu_percent_peak': max((s['cpu_percent'] for s in self.samples), default=None),
+            'cores': os.cpu_count(),
+            'rss_mb': rss[-1] / 2**20 if rss else None,
+            'rss_mb_peak': max(rss) / 2**20 if rss else None,
+            # ru_maxrss is in KiB on Linux
+            'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+        }
+
+
+def run_benchmark(args):
+    """One recording session against the simulated device; returns the result dict"""
+    fake_depthai.configure(fps=args.fps or 30.0, imu_rate=args.imu_rate)
+    if args.replay:
+        fake_depthai.configure(frames=load_replay_frames(args.replay, args.replay_frames))
+
+    # The recorder imports depthai on first use; hand it the simulator instead
+    core.dai = fake_depthai
+
+    fake_gps = FakeGps().start() if args.gps else None
+    recordings_dir = Path(args.recordings_dir or tempfile.mkdtemp(prefix="sogo_bench_"))
+
+    config = load_config(overrides={
+        'name': 'benchmark',
+        'recordings_dir': str(recordings_dir),
+        'inputs': [],
+        'sinks': [],
+        'cameras': {'camera1': {'enabled': False}, 'camera2': {'enabled': False}},
+        'depthai': {'pacing': args.pacing, 'camera_fps': args.fps},
+        'skeleton': {'enabled': args.skeleton},
+        'depth': {'enabled': args.depth, 'fps': args.depth_fps},
+        'ahrs': {'enabled': args.ahrs},
+        'gps': {'enabled': bool(fake_gps), 'port': fake_gps.port if fake_gps else None,
+                'protocol': None, 'pps_pin': None},
+        'profiling': {'enabled': True, 'print_report': False},
+    })
+    recorder = core.MultiCameraRecorder(config)
+    recorder.models_ready.wait(timeout=120)
+
+    recorder.start_recording()
+    session = recorder.session_timestamp
+    time.sleep(args.warmup)
+
+    # Measure the steady state only
+    core.PROFILER.reset()
+    frames_at_start = recorder.stats.frames_written
+    received_at_start = recorder.stats.frames_received
+    sampler = ResourceSampler().start()
+    started = time.monotonic()
+    time.sleep(args.duration)
+    elapsed = time.monotonic() - started
+    frames = recorder.stats.frames_written - frames_at_start
+    received = recorder.stats.frames_received - received_at_start
+    frame_bytes = core.PROFILER.counters.get('rgb.bytes', 0)
+    resources = sampler.stop()
+
+    recorder.cleanup()
+    if fake_gps:
+        fake_gps.stop()
+
+    with open(recordings_dir / f"perf_{session}.json") as f:
+        perf = json.load(f)
+    outputs = {path.name: path.stat().st_size for path in recordings_dir.glob(f"*_{session}.*")}
+    if not args.keep and not args.recordings_dir:
+        shutil.rmtree(recordings_dir, ignore_errors=True)
+
+    return {
+        'settings': {
+            'duration_s': args.duration,
+            'sensor_fps': args.fps or config['depthai']['fps'],
+            'target_fps': config['depthai']['fps'],
+            'imu_rate': args.imu_rate,
+            'replay': str(args.replay) if args.replay else None,
+            'skeleton': recorder.skeleton_enabled,
+            'depth_fps': args.depth_fps if args.depth else None,
+            'gps': bool(fake_gps),
+        },
+        'fps_written': frames / elapsed,
+        'fps_received': received / elapsed,
+        'frames_dropped': perf['frames']['dropped'],
+        'io_dropped': perf.get('io_dropped', {}),
+        'pacing': perf.get('pacing'),
+        'probes': perf['probes'],
+        'counters': perf['counters'],
+        'xlink_mb_s': frame_bytes / elapsed / 1e6,
+        'resources': resources,
+        'startup': perf['startup'],
+        'outputs': outputs,
+    }
+
+
+def print_result(result):
+    settings = result['settings']
+    resources = result['resources']
+    print(f"\nRecorder benchmark: {settings['duration_s']:g} s, sensor {settings['sensor_fps']:g} fps "
+          f"-> target {settings['target_fps']:g} fps, IMU {settings['imu_rate']:g} Hz, "
+          f"skeleton {'on' if settings['skeleton'] else 'off'}, GPS {'on' if settings['gps'] else 'off'}")
+    print(f"Sustained FPS: {result['fps_written']:.2f} written, {result['fps_received']:.2f} received, "
+          f"{result['frames_dropped']} device drops, I/O drops {sum(result['io_dropped'].values())}")
+    print(f"XLink: {result['xlink_mb_s']:.1f} MB/s of camera3 frames")
+    depth = result['probes'].get('depth.receive')
+    if settings.get('depth_fps'):
+        received = depth['count'] if depth else 0
+        dropped = result['counters'].get('depth.dropped', 0)
+        print(f"Depth: {(received - dropped) / settings['duration_s']:.2f} FPS stored (target {settings['depth_fps']:g}), "
+              f"{dropped} dropped for the budget")
+    pacing = result.get('pacing')
+    if pacing:
+        print(f"Pacing ({pacing['mode']}): {pacing['effective_fps']:.2f} FPS effective vs {pacing['target_fps']:g} "
+              f"target, {pacing['duplicated']} duplicated, {pacing['dropped']} dropped")
+    print(f"CPU: {resources['cpu_percent']:.0f}% avg, {resources['cpu_percent_peak'] or 0:.0f}% peak "
+          f"({resources['cores']} cores); RSS {resources['rss_mb'] or 0:.0f} MB, "
+          f"max {resources['max_rss_mb']:.0f} MB")
+    print(core.PROFILER.format_report({'probes': result['probes'], 'counters': result['counters']}))
+
+
+def compare(result, baseline, tolerance):
+    """Regressions against a baseline result (list of messages)"""
+    regressions = []
+    if result['fps_written'] < baseline['fps_written'] * (1.0 - tolerance):
+        regressions.append(f"FPS {result['fps_written']:.2f} < baseline {baseline['fps_written']:.2f}")
+    for name in KEY_PROBES:
+        now, before = result['probes'].get(name), baseline['probes'].get(name)
+        if now and before and now['p95_ms'] > before['p95_ms'] * (1.0 + tolerance):
+            regressions.append(f"{name} p95 {now['p95_ms']:.2f} ms > baseline {before['p95_ms']:.2f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hardware-free recorder benchmark")
+    parser.add_argument('--duration', type=float, default=30.0, help="measured seconds")
+    parser.add_argument('--warmup', type=float, default=3.0, help="seconds recorded before measuring")
+    parser.add_argument('--fps', type=float, help="camera sensor rate (default: the output fps)")
+    parser.add_argument('--imu-rate', type=float, default=400.0, help="simulated IMU packets per second")
+    parser.add_argument('--replay', type=Path, help="video file to replay instead of synthetic frames")
+    parser.add_argument('--replay-frames', type=int, default=300, help="frames of --replay held in memory")
+    parser.add_argument('--pacing', choices=('cfr', 'vfr'), default='cfr', help="camera3 frame pacing mode")
+    parser.add_argument('--ahrs', action='store_true', help="run the live orientation filter")
+    parser.add_argument('--depth', action='store_true', help="record the simulated stereo depth stream")
+    parser.add_argument('--depth-fps', type=float, default=5.0, help="depth frame rate")
+    parser.add_argument('--skeleton', action='store_true', help="run pose detection (needs mediapipe)")
+    parser.add_argument('--gps', action='store_true', help="stream synthetic NMEA through a pty")
+    parser.add_argument('--recordings-dir', help="keep outputs here instead of a temp dir")
+    parser.add_argument('--keep', action='store_true', help="keep the temp recordings dir")
+    parser.add_argument('--output', type=Path, help="write the result as JSON")
+    parser.add_argument('--baseline', type=Path, help="result JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.10, help="allowed regression (fraction)")
+    args = parser.parse_args()
+
+    result = run_benchmark(args)
+    print_result(result)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Result written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION: {message}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
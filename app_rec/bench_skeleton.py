@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Batch skeleton extraction throughput benchmark
+Usage: python bench_skeleton.py [--video recordings/camera3_X.avi] [--frames 300]
+                                [--workers 1 2 4] [--model models/pose_landmarker_full.task]
+
+Runs recorder/batch_skeleton.py over the same video with each worker count
+and reports frames/s and scaling efficiency against one worker. Without
+--video, synthetic 1080p frames are used; they contain no people, so only
+the pose detector stage runs and throughput is optimistic.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from recorder.batch_skeleton import run_batch
+
+
+def write_test_video(path, source, frames):
+    """First `frames` frames of source (or synthetic frames) as an MJPG AVI"""
+    import cv2
+    if source:
+        capture = cv2.VideoCapture(str(source))
+        fps = capture.get(cv2.CAP_PROP_FPS) or 15.0
+        images = []
+        while len(images) < frames:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            images.append(frame)
+        capture.release()
+        if not images:
+            raise RuntimeError(f"No frames could be read from {source}")
+    else:
+        from fake_depthai import synthetic_frames
+        fps = 15.0
+        images = synthetic_frames(1920, 1080, frames)
+
+    height, width = images[0].shape[:2]
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), fps, (width, height))
+    for image in images:
+        writer.write(image)
+    writer.release()
+    return len(images)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch skeleton extraction benchmark")
+    parser.add_argument('--video', type=Path, help="video to process (default: synthetic frames)")
+    parser.add_argument('--frames', type=int, default=300, help="frames taken from the video")
+    parser.add_argument('--workers', type=int, nargs='+', help="worker counts (default: 1, 2, 4 ... cores)")
+    parser.add_argument('--chunk', type=int, default=30, help="frames per work unit")
+    parser.add_argument('--model', help="pose model (default: the config's skeleton model)")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({1, cores} | {n for n in (2, 4, 8, 16) if n < cores})
+
+    workdir = Path(tempfile.mkdtemp(prefix="sogo_skeleton_bench_"))
+    try:
+        frames = write_test_video(workdir / "camera3_bench.avi", args.video, args.frames)
+        print(f"Skeleton batch benchmark: {frames} frames, chunks of {args.chunk}, {cores} cores")
+        print(f"{'workers':>8} {'frames/s':>10} {'per worker':>11} {'speedup':>8} {'efficiency':>11}")
+
+        single = None
+        for workers in worker_counts:
+            summary = run_batch(workdir, workdir / f"out_{workers}", model=args.model, workers=workers,
+                                chunk=args.chunk, force=True)
+            if summary['failed'] or not summary['frames']:
+                print(f"{workers:>8} failed")
+                continue
+            if single is None and workers == 1:
+                single = summary['fps']
+            speedup = summary['fps'] / single if single else None
+            print(f"{workers:>8} {summary['fps']:>10.1f} {summary['fps_per_worker']:>11.1f} "
+                  + (f"{speedup:>7.2f}x {100.0 * speedup / workers:>10.0f}%" if speedup else ""))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Interrupt-driven button handling
+Edge events instead of polling, with gesture detection (single, double and
+long press) so one button can drive several actions.
+
+Backends, tried in order:
+  gpiod v2  - request_lines + wait_edge_events/read_edge_events, kernel debounce
+  gpiod v1  - LINE_REQ_EV_BOTH_EDGES + event_wait/event_read, software debounce
+  sysfs     - /sys/class/gpio edge=both, poll(POLLPRI) on an open value file
+
+The button is active-low (pull-up), so a falling edge is a press.
+"""
+
+import datetime
+import os
+import select
+import threading
+import time
+
+try:
+    import gpiod
+except ImportError:
+    gpiod = None
+
+
+class GestureDetector:
+    """Turns press/release edges into single, double and long press gestures
+
+    Single presses are reported once the double-press window has passed
+    (only when a double-press handler exists). If immediate_single() returns
+    True at press time, the single press is reported on the edge itself and
+    the rest of that press is ignored - used for sub-millisecond start.
+    """
+
+    def __init__(self, on_single=None, on_double=None, on_long=None, immediate_single=None,
+                 long_press=1.5, double_window=0.4, debounce=0.02):
+        self.on_single = on_single
+        self.on_double = on_double
+        self.on_long = on_long
+        self.immediate_single = immediate_single
+        self.long_press = long_press
+        self.double_window = double_window
+        self.debounce = debounce
+
+        self.pressed_at = None
+        self.last_edge = None
+        self.long_fired = False
+        self.suppress = False
+        self.pending_single = None
+
+    def emit(self, handler, name):
+        if handler is None:
+            return
+        try:
+            handler()
+        except Exception as e:
+            print(f"Error handling {name} button gesture: {e}")
+
+    def edge(self, pressed, timestamp):
+        """Feed one edge (pressed=True for falling/active) at a monotonic timestamp"""
+        if self.last_edge is not None and timestamp - self.last_edge < self.debounce:
+            return
+        self.last_edge = timestamp
+
+        if pressed:
+            if self.pressed_at is not None:
+                return
+            self.pressed_at = timestamp
+            self.long_fired = False
+            self.suppress = False
+            if self.pending_single is None and self.immediate_single and self.immediate_single():
+                self.suppress = True
+                self.emit(self.on_single, "single")
+            return
+
+        if self.pressed_at is None:
+            return
+        pressed_at, self.pressed_at = self.pressed_at, None
+        if self.suppress or self.long_fired:
+            return
+        if timestamp - pressed_at >= self.long_press and self.on_long:
+            self.emit(self.on_long, "long")
+            return
+
+        if self.on_double is None:
+            self.emit(self.on_single, "single")
+        elif self.pending_single is not None and timestamp - self.pending_single <= self.double_window:
+            self.pending_single = None
+            self.emit(self.on_double, "double")
+        else:
+            self.pending_single = timestamp
+
+    def poll(self, now):
+        """Fire time-based gestures (long press while held, expired single)"""
+        if self.pressed_at is not None and not self.long_fired and not self.suppress \
+                and self.on_long and now - self.pressed_at >= self.long_press:
+            self.long_fired = True
+            self.pending_single = None
+            self.emit(self.on_long, "long")
+        if self.pending_single is not None and self.pressed_at is None \
+                and now - self.pending_single > self.double_window:
+            self.pending_single = None
+            self.emit(self.on_single, "single")
+
+    def next_deadline(self):
+        """Monotonic time of the next timer-based gesture, or None"""
+        deadlines = []
+        if self.pressed_at is not None and not self.long_fired and not self.suppress and self.on_long:
+            deadlines.append(self.pressed_at + self.long_press)
+        if self.pending_single is not None:
+            deadlines.append(self.pending_single + self.double_window)
+        return min(deadlines) if deadlines else None
+
+
+class ButtonEvents:
+    """Edge-event button reader feeding a GestureDetector on its own thread"""
+
+    BACKENDS = ('gpiod_v2', 'gpiod_v1', 'sysfs')
+
+    def __init__(self, pin, detector, chip='gpiochip0', debounce_ms=20, backends=None):
+        self.pin = pin
+        self.detector = detector
+        self.chip_name = chip
+        self.debounce_ms = debounce_ms
+        self.backends = backends or self.BACKENDS
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.backend = None
+
+        # Backend handles
+        self.request = None
+        self.chip = None
+        self.line = None
+        self.value_file = None
+        self.poller = None
+
+    def start(self):
+        for backend in [getattr(self, f"open_{name}") for name in self.backends]:
+            try:
+                if backend():
+                    break
+            except Exception as e:
+                print(f"Button backend {backend.__name__} failed: {e}")
+        else:
+            print("❌ No button backend available, continuing without button")
+            return False
+
+        self.thread = threading.Thread(target=self.run, name="button")
+        self.thread.daemon = True
+        self.thread.start()
+        print(f"✅ Button on GPIO{self.pin} using {self.backend} edge events")
+        return True
+
+    def open_gpiod_v2(self):
+        if gpiod is None or not hasattr(gpiod, 'request_lines'):
+            return False
+        from gpiod.line import Bias, Clock, Direction, Edge
+        settings = gpiod.LineSettings(
+            direction=Direction.INPUT,
+            edge_detection=Edge.BOTH,
+            bias=Bias.PULL_UP,
+            debounce_period=datetime.timedelta(milliseconds=self.debounce_ms),
+            event_clock=Clock.MONOTONIC,
+        )
+        self.request = gpiod.request_lines(f"/dev/{self.chip_name}", consumer="button",
+                                           config={self.pin: settings})
+        self.backend = "gpiod v2"
+        # Kernel does the debouncing
+        self.detector.debounce = 0.0
+        return True
+
+    def open_gpiod_v1(self):
+        if gpiod is None or not hasattr(gpiod, 'LINE_REQ_EV_BOTH_EDGES'):
+            return False
+        self.chip = gpiod.Chip(self.chip_name)
+        self.line = self.chip.get_line(self.pin)
+        flags = getattr(gpiod, 'LINE_REQ_FLAG_BIAS_PULL_UP', 0)
+        self.line.request(consumer="button", type=gpiod.LINE_REQ_EV_BOTH_EDGES, flags=flags)
+        self.backend = "gpiod v1"
+        self.detector.debounce = self.debounce_ms / 1000.0
+        return True
+
+    def open_sysfs(self):
+        base = f"/sys/class/gpio/gpio{self.pin}"
+        if not os.path.exists(base):
+            with open("/sys/class/gpio/export", "w") as f:
+                f.write(str(self.pin))
+            time.sleep(0.1)
+        with open(f"{base}/direction", "w") as f:
+            f.write("in")
+        with open(f"{base}/edge", "w") as f:
+            f.write("both")
+        # Value file stays open; poll() wakes on POLLPRI when the edge fires
+        self.value_file = open(f"{base}/value", "r")
+        self.value_file.read()
+        self.poller = select.poll()
+        self.poller.register(self.value_file, select.POLLPRI | select.POLLERR)
+        self.backend = "sysfs"
+        self.detector.debounce = self.debounce_ms / 1000.0
+        return True
+
+    def wait_timeout(self):
+        """Sleep until the next edge or gesture deadline (max 0.5 s, to notice stop)"""
+        deadline = self.detector.next_deadline()
+        if deadline is None:
+            return 0.5
+        return min(0.5, max(0.0, deadline - time.monotonic()))
+
+    def read_edges(self, timeout):
+        """Block for edges; returns a list of (pressed, monotonic_timestamp)"""
+        if self.backend == "gpiod v2":
+            if not self.request.wait_edge_events(datetime.timedelta(seconds=timeout)):
+                return []
+            from gpiod.edge_event import EdgeEvent
+            return [(event.event_type == EdgeEvent.Type.FALLING_EDGE, event.timestamp_ns / 1e9)
+                    for event in self.request.read_edge_events()]
+
+        if self.backend == "gpiod v1":
+            sec = int(timeout)
+            if not self.line.event_wait(sec=sec, nsec=int((timeout - sec) * 1e9)):
+                return []
+            event = self.line.event_read()
+            # v1 event timestamps are CLOCK_REALTIME; stamp with monotonic for the detector
+            return [(event.type == gpiod.LineEvent.FALLING_EDGE, time.monotonic())]
+
+        if not self.poller.poll(timeout * 1000):
+            return []
+        self.value_file.seek(0)
+        value = self.value_file.read().strip()
+        return [(value == "0", time.monotonic())]
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                for pressed, timestamp in self.read_edges(self.wait_timeout()):
+                    self.detector.edge(pressed, timestamp)
+                self.detector.poll(time.monotonic())
+            except Exception as e:
+                print(f"Error reading button events: {e}")
+                self.stop_event.wait(0.5)
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=1)
+            self.thread = None
+        try:
+            if self.request:
+                self.request.release()
+            if self.line:
+                self.line.release()
+            if self.chip:
+                self.chip.close()
+            if self.value_file:
+                self.value_file.close()
+        except Exception:
+            pass
+        self.request = self.chip = self.line = self.value_file = None
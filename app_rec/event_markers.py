@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Event markers
+Timestamped operator annotations during a recording session.
+
+Markers are written as they happen to markers_<session>.json, one JSON line
+each. When the session closes, an index (markers_index_<session>.json) lists
+every marker with its offset into the session and the camera3 frame number,
+so post-processing can seek straight to the marked windows.
+
+Sources: a button gesture, stdin (main_no_gpio.py) or the local control
+socket, which accepts lines such as:
+
+    echo "mark near miss" | nc -U /tmp/sogo_control.sock
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+
+CONTROL_SOCKET_PATH = '/tmp/sogo_control.sock'
+
+
+class MarkerChannel:
+    """Marker stream for one session"""
+
+    def __init__(self, stream, index_path, now_fn=time.time, frame_index_fn=None,
+                 window_before=10.0, window_after=10.0):
+        self.stream = stream
+        self.index_path = index_path
+        self.now_fn = now_fn
+        self.frame_index_fn = frame_index_fn
+        self.window_before = window_before
+        self.window_after = window_after
+        self.session_start = now_fn()
+        self.session_start_monotonic = time.monotonic()
+        self.markers = []
+        self.lock = threading.Lock()
+
+    def mark(self, source, label=None):
+        """Record a marker; returns the marker record"""
+        host_monotonic = time.monotonic()
+        with self.lock:
+            marker = {
+                'index': len(self.markers),
+                'timestamp': self.now_fn(),
+                'host_monotonic': host_monotonic,
+                'session_time': host_monotonic - self.session_start_monotonic,
+                'frame': self.frame_index_fn() if self.frame_index_fn else None,
+                'source': source,
+                'label': label,
+            }
+            self.markers.append(marker)
+        self.stream.write(marker)
+        print(f"Marker #{marker['index']} at {marker['session_time']:.2f}s ({source}){': ' + label if label else ''}")
+        return marker
+
+    def close(self):
+        """Write the marker index for the session"""
+        index = {
+            'session_start': self.session_start,
+            'window_before': self.window_before,
+            'window_after': self.window_after,
+            'markers': [
+                {
+                    'index': m['index'],
+                    'label': m['label'],
+                    'source': m['source'],
+                    'timestamp': m['timestamp'],
+                    'session_time': m['session_time'],
+                    'frame': m['frame'],
+                    'window': [max(0.0, m['session_time'] - self.window_before),
+                               m['session_time'] + self.window_after],
+                }
+                for m in self.markers
+            ],
+        }
+        with open(self.index_path, 'w') as f:
+            json.dump(index, f, indent=2)
+        return index
+
+
+class ControlSocket:
+    """Local Unix stream socket accepting text commands ('mark [label]')"""
+
+    def __init__(self, handler, path=CONTROL_SOCKET_PATH):
+        self.handler = handler
+        self.path = path
+        self.server = None
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    def start(self):
+        try:
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.server.bind(self.path)
+            self.server.listen(4)
+            self.server.settimeout(0.5)
+        except OSError as e:
+            print(f"Control socket disabled: {e}")
+            self.server = None
+            return False
+        self.thread = threading.Thread(target=self.run, name="control-socket")
+        self.thread.daemon = True
+        self.thread.start()
+        print(f"Control socket listening on {self.path}")
+        return True
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                conn, _ = self.server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            with conn:
+                conn.settimeout(1.0)
+                try:
+                    data = b''
+                    while not data.endswith(b'\n'):
+                        chunk = conn.recv(1024)
+                        if not chunk:
+                            break
+                        data += chunk
+                    for line in data.decode('utf-8', errors='ignore').splitlines():
+                        reply = self.handle_line(line.strip())
+                        conn.sendall((reply + '\n').encode('utf-8'))
+                except OSError as e:
+                    print(f"Control socket error: {e}")
+
+    def handle_line(self, line):
+        if not line:
+            return "error empty command"
+        command, _, argument = line.partition(' ')
+        try:
+            return self.handler(command.lower(), argument.strip() or None) or "ok"
+        except Exception as e:
+            return f"error {e}"
+
+    def stop(self):
+        self.stop_event.set()
+        if self.server:
+            self.server.close()
+            self.server = None
+        if self.thread:
+            self.thread.join(timeout=1)
+            self.thread = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
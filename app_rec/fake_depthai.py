@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Simulated DepthAI device
+Stands in for the depthai module so the real recording loop can run on any
+Linux box (see bench_recorder.py). Implements the subset of the API the
+recorder uses: Pipeline/nodes, Device, non-blocking output queues, ImgFrame
+and IMU messages, StereoDepth frames and calibration intrinsics.
+
+Node settings (setPreviewSize, setFps, ...) are recorded rather than
+checked, so pipelines built for the real device work unchanged. Each output
+queue is fed by its own producer thread at the configured rate; like a
+non-blocking device queue, a full queue drops its oldest message.
+
+    import fake_depthai
+    fake_depthai.configure(fps=30, imu_rate=400)
+"""
+
+import datetime
+import math
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# Simulation settings, see configure()
+SIMULATION = {
+    'fps': 30.0,
+    'imu_rate': 400.0,
+    'imu_packets_per_message': 1,
+    'frames': None,
+    'synthetic_frames': 30,
+}
+
+
+def configure(**settings):
+    """Change the simulation settings (camera fps, IMU rate, replay frames)"""
+    unknown = set(settings) - set(SIMULATION)
+    if unknown:
+        raise ValueError(f"Unknown simulation settings: {', '.join(sorted(unknown))}")
+    SIMULATION.update(settings)
+
+
+class Constants:
+    """Enum-like namespace: any attribute is its own name"""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return f"{self.prefix}.{name}"
+
+
+CameraBoardSocket = Constants('CameraBoardSocket')
+IMUSensor = Constants('IMUSensor')
+
+
+class ColorCameraProperties:
+    SensorResolution = Constants('SensorResolution')
+    ColorOrder = Constants('ColorOrder')
+
+
+class MonoCameraProperties:
+    SensorResolution = Constants('SensorResolution')
+
+
+class Endpoint:
+    """Node input or output; link() connects an output to an input"""
+
+    def __init__(self, node, name):
+        self.node = node
+        self.name = name
+        self.links = []
+
+    def link(self, other):
+        self.links.append(other)
+        other.links.append(self)
+
+
+class Node:
+    """Pipeline node recording its settings"""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.settings = {}
+        self.endpoints = {}
+        self.initialConfig = self
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name in ('settings', 'endpoints', 'pipeline'):
+            raise AttributeError(name)
+        if name[:3] in ('set', 'ena'):
+            def setter(*args, **kwargs):
+                self.settings.setdefault(name, []).append(args if not kwargs else (args, kwargs))
+            return setter
+        if name not in self.endpoints:
+            self.endpoints[name] = Endpoint(self, name)
+        return self.endpoints[name]
+
+    def setting(self, name, default=None):
+        """Last arguments given to a setter"""
+        calls = self.settings.get(name)
+        if not calls:
+            return default
+        return calls[-1]
+
+
+class node:
+    """Node types (dai.node.ColorCamera etc.)"""
+
+    class ColorCamera(Node):
+        kind = 'ColorCamera'
+
+    class MonoCamera(Node):
+        kind = 'MonoCamera'
+
+    class StereoDepth(Node):
+        kind = 'StereoDepth'
+        PresetMode = Constants('PresetMode')
+
+    class IMU(Node):
+        kind = 'IMU'
+
+    class VideoEncoder(Node):
+        kind = 'VideoEncoder'
+
+    class XLinkOut(Node):
+        kind = 'XLinkOut'
+
+
+class Pipeline:
+    def __init__(self):
+        self.nodes = []
+
+    def create(self, node_type):
+        created = node_type(self)
+        self.nodes.append(created)
+        return created
+
+    def stream_source(self, stream_name):
+        """Node feeding the XLinkOut with this stream name"""
+        for candidate in self.nodes:
+            if candidate.kind == 'XLinkOut' and candidate.setting('setStreamName') == (stream_name,):
+                for link in candidate.input.links:
+                    return link.node, link.name
+        raise RuntimeError(f"No XLinkOut stream named '{stream_name}'")
+
+
+class Timestamped:
+    """Host-monotonic timestamps, as DepthAI reports them"""
+
+    def getTimestamp(self):
+        return datetime.timedelta(seconds=self.timestamp)
+
+    def getTimestampDevice(self):
+        return datetime.timedelta(seconds=self.timestamp)
+
+
+class ImgFrame(Timestamped):
+    def __init__(self, frame, sequence_num, timestamp):
+        self.frame = frame
+        self.sequence_num = sequence_num
+        self.timestamp = timestamp
+
+    def getCvFrame(self):
+        # The real call converts/copies out of the message buffer
+        return self.frame.copy()
+
+    def getFrame(self):
+        return self.frame
+
+    def getSequenceNum(self):
+        return self.sequence_num
+
+    def getWidth(self):
+        return self.frame.shape[1]
+
+    def getHeight(self):
+        return self.frame.shape[0]
+
+
+class Vector(Timestamped):
+    def __init__(self, timestamp, **values):
+        self.timestamp = timestamp
+        self.__dict__.update(values)
+
+
+class IMUPacket:
+    def __init__(self, timestamp, phase):
+        # Gentle sway so filters and motion detectors see realistic signals
+        sway = math.sin(phase)
+        self.acceleroMeter = Vector(timestamp, x=0.3 * sway, y=0.1 * sway, z=9.81, accuracy=3)
+        self.gyroscope = Vector(timestamp, x=0.05 * math.cos(phase), y=0.02 * sway, z=0.01, accuracy=3)
+        half = 0.05 * sway
+        self.rotationVector = Vector(timestamp, i=half, j=0.0, k=0.0, real=math.sqrt(1.0 - half * half),
+                                     accuracy=0.01)
+
+
+class IMUData:
+    def __init__(self, packets):
+        self.packets = packets
+
+
+def synthetic_depth(width, height, count):
+    """uint16 millimetre depth: a floor ramp with a person-sized block moving across"""
+    rows = np.linspace(4000, 1000, height, dtype=np.float32)[:, None]
+    background = np.repeat(rows, width, axis=1).astype(np.uint16)
+    background[:, :width // 20] = 0
+    frames = []
+    block = max(8, height // 3)
+    for n in range(count):
+        frame = background.copy()
+        x = (n * width // max(1, count)) % max(1, width - block)
+        frame[height // 3:height // 3 + block, x:x + block // 2] = 2000
+        frames.append(frame)
+    return frames
+
+
+class CalibrationHandler:
+    """Pinhole intrinsics for a ~69 degree horizontal field of view"""
+
+    def getCameraIntrinsics(self, socket, width=1920, height=1080):
+        focal = width / (2 * math.tan(math.radians(69.0) / 2))
+        return [[focal, 0.0, width / 2], [0.0, focal, height / 2], [0.0, 0.0, 1.0]]
+
+
+def synthetic_frames(width, height, count):
+    """Textured frames with a moving block, so encoders do real work"""
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    background[:, :, 0] = np.linspace(0, 255, width, dtype=np.uint8)
+    frames = []
+    block = max(8, height // 6)
+    for n in range(count):
+        frame = background.copy()
+        x = (n * width // max(1, count)) % max(1, width - block)
+        frame[height // 3:height // 3 + block, x:x + block] = (40, 200, 40)
+        frames.append(frame)
+    return frames
+
+
+class DataOutputQueue:
+    """Non-blocking output queue fed by a producer thread"""
+
+    def __init__(self, name, maxSize, produce, interval):
+        self.name = name
+        self.messages = deque(maxlen=maxSize)
+        self.produce = produce
+        self.interval = interval
+        self.sent = 0
+        self.taken = 0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=f"sim-{name}")
+        self.thread.daemon = True
+        self.thread.start()
+
+    @property
+    def dropped(self):
+        """Messages overwritten before the host took them"""
+        return self.sent - self.taken - len(self.messages)
+
+    def run(self):
+        next_time = time.monotonic()
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+            if now < next_time:
+                self.stop_event.wait(next_time - now)
+                continue
+            # deque(maxlen) drops the oldest message when full
+            self.messages.append(self.produce(self.sent, next_time))
+            self.sent += 1
+            next_time += self.interval
+            if now - next_time > 1.0:
+                # Fell far behind (stalled host); resynchronize instead of bursting
+                next_time = now
+
+    def tryGet(self):
+        try:
+            message = self.messages.popleft()
+        except IndexError:
+            return None
+        self.taken += 1
+        return message
+
+    def get(self):
+        while True:
+            message = self.tryGet()
+            if message is not None:
+                return message
+            time.sleep(0.001)
+
+    def has(self):
+        return bool(self.messages)
+
+    def close(self):
+        self.stop_event.set()
+        self.thread.join(timeout=1)
+
+
+class Device:
+    """Runs a pipeline by feeding its XLinkOut streams with simulated data"""
+
+    def __init__(self, pipeline, *args, **kwargs):
+        self.pipeline = pipeline
+        self.queues = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def readCalibration(self):
+        return CalibrationHandler()
+
+    def getOutputQueue(self, name, maxSize=4, blocking=False):
+        if name in self.queues:
+            return self.queues[name]
+        source, output = self.pipeline.stream_source(name)
+        if source.kind == 'IMU':
+            queue = self.imu_queue(name, maxSize)
+        elif source.kind == 'StereoDepth':
+            queue = self.depth_queue(name, maxSize, source)
+        else:
+            queue = self.camera_queue(name, maxSize, source, output)
+        self.queues[name] = queue
+        return queue
+
+    def camera_queue(self, name, maxSize, camera, output):
+        size = camera.setting('setPreviewSize') if output == 'preview' else camera.setting('setVideoSize')
+        width, height = size if size else (1920, 1080)
+        fps = camera.setting('setFps', (SIMULATION['fps'],))[0]
+        frames = SIMULATION['frames'] or synthetic_frames(width, height, SIMULATION['synthetic_frames'])
+
+        def produce(sequence_num, timestamp):
+            return ImgFrame(frames[sequence_num % len(frames)], sequence_num, timestamp)
+
+        return DataOutputQueue(name, maxSize, produce, 1.0 / fps)
+
+    def depth_queue(self, name, maxSize, stereo):
+        width, height = stereo.setting('setOutputSize', (640, 400))
+        # Depth runs at the mono cameras' rate
+        mono = stereo.left.links[0].node if stereo.left.links else None
+        fps = mono.setting('setFps', (SIMULATION['fps'],))[0] if mono else SIMULATION['fps']
+        frames = synthetic_depth(width, height, SIMULATION['synthetic_frames'])
+
+        def produce(sequence_num, timestamp):
+            return ImgFrame(frames[sequence_num % len(frames)], sequence_num, timestamp)
+
+        return DataOutputQueue(name, maxSize, produce, 1.0 / fps)
+
+    def imu_queue(self, name, maxSize):
+        rate = SIMULATION['imu_rate']
+        per_message = SIMULATION['imu_packets_per_message']
+        interval = 1.0 / rate
+
+        def produce(sequence_num, timestamp):
+            first = sequence_num * per_message
+            return IMUData([
+                IMUPacket(timestamp - (per_message - 1 - i) * interval, (first + i) * interval * 2 * math.pi)
+                for i in range(per_message)
+            ])
+
+        return DataOutputQueue(name, maxSize, produce, interval * per_message)
+
+    def close(self):
+        for queue in self.queues.values():
+            queue.close()
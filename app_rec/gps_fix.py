@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+GPS fix assembler
+Merges the parsed NMEA sentences of one receiver epoch (same UTC time) into a
+single fix record, so the GPS stream holds one line per fix instead of 3+.
+
+Timed sentences (GGA, RMC) open/close epochs; untimed ones (VTG, GSA, GSV)
+are attached to the epoch currently being assembled. An epoch is emitted
+when a sentence with a different UTC time arrives, or on flush().
+"""
+
+import datetime
+import time
+
+
+def utc_timestamp(utc_time, utc_date):
+    """Receiver hhmmss.ss + ddmmyy -> POSIX seconds (None if incomplete)"""
+    if not utc_time or not utc_date or len(utc_time) < 6 or len(utc_date) != 6:
+        return None
+    try:
+        moment = datetime.datetime(
+            2000 + int(utc_date[4:6]), int(utc_date[2:4]), int(utc_date[0:2]),
+            int(utc_time[0:2]), int(utc_time[2:4]), int(utc_time[4:6]),
+            tzinfo=datetime.timezone.utc,
+        )
+    except ValueError:
+        return None
+    fraction = float(utc_time[6:]) if len(utc_time) > 7 else 0.0
+    return moment.timestamp() + fraction
+
+
+class FixAssembler:
+    """Accumulates sentences per UTC epoch and emits fused fix records"""
+
+    def __init__(self):
+        self.current = None
+        self.last_date = None
+        self.satellites_in_view = {}
+
+        # Counters
+        self.fixes = 0
+        self.sentences = 0
+
+    def new_epoch(self, utc_time, host_time, host_monotonic):
+        return {
+            'utc_time': utc_time,
+            'utc_date': self.last_date,
+            'utc_timestamp': None,
+            'host_time': host_time,
+            'host_monotonic': host_monotonic,
+            'fix_quality': None,
+            'status': None,
+            'latitude': None,
+            'longitude': None,
+            'altitude': None,
+            'speed_kmh': None,
+            'course': None,
+            'satellites': None,
+            'satellites_in_view': None,
+            'hdop': None,
+            'pdop': None,
+            'vdop': None,
+            'fix_type': None,
+            'talker': None,
+        }
+
+    def feed(self, data, host_monotonic=None):
+        """Add one parsed sentence; returns a completed fix or None"""
+        if data is None:
+            return None
+        if host_monotonic is None:
+            host_monotonic = time.monotonic()
+        self.sentences += 1
+
+        completed = None
+        sentence_type = data['type']
+        utc_time = data.get('time')
+
+        if utc_time is not None:
+            if self.current is not None and self.current['utc_time'] != utc_time:
+                completed = self.finish()
+            if self.current is None:
+                self.current = self.new_epoch(utc_time, data.get('timestamp'), host_monotonic)
+        elif self.current is None:
+            # Untimed sentence before the first timed one - nothing to attach to
+            return None
+
+        fix = self.current
+        if sentence_type == 'GGA':
+            fix['fix_quality'] = data['quality']
+            fix['latitude'] = data['latitude']
+            fix['longitude'] = data['longitude']
+            fix['altitude'] = data['altitude']
+            fix['satellites'] = data['satellites']
+            fix['hdop'] = data['hdop']
+            fix['talker'] = data['talker']
+        elif sentence_type == 'RMC':
+            fix['status'] = data['status']
+            if data['date']:
+                fix['utc_date'] = self.last_date = data['date']
+            if fix['latitude'] is None:
+                fix['latitude'] = data['latitude']
+                fix['longitude'] = data['longitude']
+            fix['speed_kmh'] = data['speed_kmh']
+            fix['course'] = data['course']
+            if fix['talker'] is None:
+                fix['talker'] = data['talker']
+        elif sentence_type == 'VTG':
+            if data['speed_kmh'] is not None:
+                fix['speed_kmh'] = data['speed_kmh']
+            if data['course_true'] is not None:
+                fix['course'] = data['course_true']
+        elif sentence_type == 'GSA':
+            fix['fix_type'] = data['fix_type']
+            fix['pdop'] = data['pdop']
+            fix['vdop'] = data['vdop']
+            if fix['hdop'] is None:
+                fix['hdop'] = data['hdop']
+        elif sentence_type == 'GSV':
+            if data['satellites_in_view'] is not None:
+                self.satellites_in_view[data['talker']] = data['satellites_in_view']
+                fix['satellites_in_view'] = sum(self.satellites_in_view.values())
+
+        return completed
+
+    def finish(self):
+        """Close the current epoch and return it"""
+        fix = self.current
+        self.current = None
+        if fix is None:
+            return None
+        if fix['utc_date'] is None:
+            fix['utc_date'] = self.last_date
+        fix['utc_timestamp'] = utc_timestamp(fix['utc_time'], fix['utc_date'])
+        self.fixes += 1
+        return fix
+
+    def flush(self):
+        """Emit the epoch in progress (end of session)"""
+        return self.finish()
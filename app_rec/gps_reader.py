@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+GPS serial reader
+Configures receiver baud and update rate (UBX for u-blox, PMTK for MediaTek)
+and reads NMEA in bulk chunks without blocking stop.
+
+Settings come from constructor arguments. The recorder passes its `gps`
+config section, where the GPS_* environment variables are applied
+(recorder/config.py).
+"""
+
+import select
+import struct
+import time
+
+import serial
+
+# Longest partial line kept between reads. NMEA sentences are at most 82
+# characters; more without a newline is noise (wrong baud, binary output).
+MAX_PENDING = 1024
+
+
+def nmea_command(body):
+    """Build a $body*CS sentence (used for PMTK commands)"""
+    checksum = 0
+    for b in body.encode('ascii'):
+        checksum ^= b
+    return f"${body}*{checksum:02X}\r\n".encode('ascii')
+
+
+def ubx_message(msg_class, msg_id, payload):
+    """Build a UBX frame with its Fletcher-8 checksum"""
+    header = struct.pack('<BBH', msg_class, msg_id, len(payload))
+    ck_a = ck_b = 0
+    for b in header + payload:
+        ck_a = (ck_a + b) & 0xFF
+        ck_b = (ck_b + ck_a) & 0xFF
+    return b'\xb5\x62' + header + payload + bytes((ck_a, ck_b))
+
+
+def ubx_set_rate(rate_hz):
+    """UBX CFG-RATE: measurement period in ms, 1 nav solution per measurement, UTC time ref"""
+    period_ms = int(round(1000.0 / rate_hz))
+    return ubx_message(0x06, 0x08, struct.pack('<HHH', period_ms, 1, 0))
+
+
+def ubx_set_baud(baudrate):
+    """UBX CFG-PRT for UART1: 8N1, UBX+NMEA in, UBX+NMEA out"""
+    payload = struct.pack('<BBHIIHHHH', 1, 0, 0, 0x08D0, baudrate, 0x0003, 0x0003, 0, 0)
+    return ubx_message(0x06, 0x00, payload)
+
+
+def pmtk_set_rate(rate_hz):
+    """PMTK220: position fix interval in ms"""
+    return nmea_command(f"PMTK220,{int(round(1000.0 / rate_hz))}")
+
+
+def pmtk_set_baud(baudrate):
+    """PMTK251: set NMEA port baud rate"""
+    return nmea_command(f"PMTK251,{baudrate}")
+
+
+class GpsReader:
+    """Non-blocking NMEA line reader for a serial GPS receiver"""
+
+    def __init__(self, port='/dev/ttyUSB0', baudrate=9600, target_baudrate=None,
+                 update_rate_hz=None, protocol=None, poll_interval=0.05):
+        self.port = port
+        self.baudrate = baudrate
+        self.target_baudrate = target_baudrate
+        self.update_rate_hz = update_rate_hz
+        self.protocol = protocol
+        self.poll_interval = poll_interval
+        self.serial = None
+
+        # Counters
+        self.bytes_read = 0
+        self.lines_read = 0
+        self.bytes_discarded = 0
+
+    def open(self):
+        """Open the port and apply receiver configuration"""
+        self.serial = serial.Serial(self.port, baudrate=self.baudrate, timeout=0)
+        print(f"GPS serial connection opened: {self.port} @ {self.baudrate}")
+        if self.protocol:
+            self.configure_receiver()
+        return self
+
+    def configure_receiver(self):
+        """Send baud / update rate commands, then follow the receiver to the new baud"""
+        if self.protocol == 'ubx':
+            set_baud, set_rate = ubx_set_baud, ubx_set_rate
+        elif self.protocol == 'pmtk':
+            set_baud, set_rate = pmtk_set_baud, pmtk_set_rate
+        else:
+            print(f"Unknown GPS protocol '{self.protocol}', receiver not configured")
+            return
+
+        if self.target_baudrate and self.target_baudrate != self.baudrate:
+            self.serial.write(set_baud(self.target_baudrate))
+            self.serial.flush()
+            # Give the receiver time to finish the command before switching
+            time.sleep(0.1)
+            self.serial.baudrate = self.target_baudrate
+            self.baudrate = self.target_baudrate
+            self.serial.reset_input_buffer()
+            print(f"GPS baud switched to {self.baudrate}")
+
+        if self.update_rate_hz:
+            self.serial.write(set_rate(self.update_rate_hz))
+            self.serial.flush()
+            print(f"GPS update rate set to {self.update_rate_hz} Hz")
+
+    def wait_readable(self):
+        """Block up to poll_interval for incoming data"""
+        try:
+            select.select([self.serial.fileno()], [], [], self.poll_interval)
+        except (AttributeError, OSError, ValueError):
+            time.sleep(self.poll_interval)
+
+    def read_lines(self, stop_event):
+        """Yield (line, host_time, host_monotonic) until stop_event is set
+
+        Each read pulls everything pending on the port; the chunk is split
+        into complete lines and the partial tail is kept for the next read,
+        unless it grows past MAX_PENDING bytes without a newline.
+        """
+        pending = b''
+        while not stop_event.is_set():
+            waiting = self.serial.in_waiting
+            if not waiting:
+                self.wait_readable()
+                continue
+
+            chunk = self.serial.read(waiting)
+            host_time = time.time()
+            host_monotonic = time.monotonic()
+            self.bytes_read += len(chunk)
+
+            pending += chunk
+            lines = pending.split(b'\n')
+            pending = lines.pop()
+            if len(pending) > MAX_PENDING:
+                if not self.bytes_discarded:
+                    print(f"GPS: no line end in {len(pending)} bytes, discarding (baud mismatch?)")
+                # Keep a sentence that may have just started
+                start = pending.rfind(b'$', len(pending) - MAX_PENDING)
+                kept = pending[start:] if start >= 0 else b''
+                self.bytes_discarded += len(pending) - len(kept)
+                pending = kept
+            for raw in lines:
+                line = raw.strip()
+                if line.startswith(b'$'):
+                    self.lines_read += 1
+                    yield line.decode('ascii', errors='ignore'), host_time, host_monotonic
+
+    def close(self):
+        if self.serial:
+            self.serial.close()
+            self.serial = None
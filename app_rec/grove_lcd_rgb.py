@@ -37,3 +37,30 @@ def set_rgb(r, g, b):
     bus.write_byte_data(DISPLAY_RGB_ADDR, 4, r)
     bus.write_byte_data(DISPLAY_RGB_ADDR, 3, g)
     bus.write_byte_data(DISPLAY_RGB_ADDR, 2, b)
+
+# Low-level helpers for incremental redraw (used by lcd_service)
+
+def init_display():
+    text_command(0x28)  # 2 lines, 5x8 font
+    text_command(0x08 | 0x04)  # display on, cursor off
+    text_command(0x01)  # clear display
+    time.sleep(0.05)
+
+def set_cursor(col, row):
+    text_command(0x80 | ((0x40 if row else 0x00) + col))
+
+def write_chars(data):
+    # Control byte 0x40 (Co=0, RS=1) lets the controller take a run of data bytes
+    try:
+        bus.write_i2c_block_data(DISPLAY_TEXT_ADDR, 0x40, list(data))
+    except OSError:
+        for b in data:
+            bus.write_byte_data(DISPLAY_TEXT_ADDR, 0x40, b)
+
+def init_backlight():
+    bus.write_byte_data(DISPLAY_RGB_ADDR, 0, 0)
+    bus.write_byte_data(DISPLAY_RGB_ADDR, 1, 0)
+    bus.write_byte_data(DISPLAY_RGB_ADDR, 0x08, 0xaa)
+
+def set_channel(register, value):
+    bus.write_byte_data(DISPLAY_RGB_ADDR, register, value)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Non-blocking Grove LCD RGB status service
+All I2C traffic runs on one background thread. Callers post the desired
+text/colour with show() and return immediately; if several updates arrive
+while the display is busy, only the latest one is drawn.
+
+Redraws are diff-based: the service keeps a shadow copy of the 16x2 screen,
+moves the cursor to each changed run of characters and sends the run as one
+I2C block write. Colour registers are only written when a channel changes.
+"""
+
+import threading
+
+LCD_COLS = 16
+LCD_ROWS = 2
+
+# Unchanged characters between two changed runs cheaper to resend than a cursor move
+RUN_GAP = 2
+
+
+def layout_text(text):
+    """Lay text out on the 16x2 grid the same way grove_lcd_rgb.set_text does"""
+    rows = [[], []]
+    row = 0
+    for c in text:
+        if c == '\n' or len(rows[row]) == LCD_COLS:
+            row += 1
+            if row == LCD_ROWS:
+                break
+            if c == '\n':
+                continue
+        rows[row].append(c)
+    return [''.join(r).ljust(LCD_COLS)[:LCD_COLS] for r in rows]
+
+
+def changed_runs(old, new):
+    """(start, end) column ranges where new differs from old, merging small gaps"""
+    runs = []
+    start = None
+    last_diff = None
+    for col in range(LCD_COLS):
+        if old is not None and old[col] == new[col]:
+            continue
+        if start is not None and col - last_diff <= RUN_GAP + 1:
+            last_diff = col
+            continue
+        if start is not None:
+            runs.append((start, last_diff + 1))
+        start = last_diff = col
+    if start is not None:
+        runs.append((start, last_diff + 1))
+    return runs
+
+
+class LcdService:
+    """Background LCD writer with a latest-wins command slot"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wake_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        # Latest requested state (None = no change requested)
+        self.pending_text = None
+        self.pending_rgb = None
+
+        # What is actually on the display (None = unknown, redraw everything)
+        self.shadow_rows = [None] * LCD_ROWS
+        self.shadow_rgb = None
+
+        self.lcd = None
+        self.available = False
+
+        # Counters
+        self.requests = 0
+        self.redraws = 0
+        self.i2c_writes = 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="lcd")
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def show(self, text=None, rgb=None):
+        """Request new text and/or backlight colour; never blocks on I2C"""
+        with self.lock:
+            if text is not None:
+                self.pending_text = text
+            if rgb is not None:
+                self.pending_rgb = tuple(rgb)
+            self.requests += 1
+        self.wake_event.set()
+
+    def set_text(self, text):
+        self.show(text=text)
+
+    def set_rgb(self, r, g, b):
+        self.show(rgb=(r, g, b))
+
+    def open_display(self):
+        """Import the I2C driver and initialize the controller (on the LCD thread)"""
+        try:
+            import grove_lcd_rgb
+            grove_lcd_rgb.init_display()
+            grove_lcd_rgb.init_backlight()
+            self.lcd = grove_lcd_rgb
+            self.available = True
+            self.shadow_rows = [' ' * LCD_COLS] * LCD_ROWS
+            self.shadow_rgb = None
+            print("LCD initialized successfully")
+        except Exception as e:
+            print(f"LCD initialization failed: {e}")
+            self.available = False
+
+    def draw_text(self, text):
+        rows = layout_text(text)
+        for row in range(LCD_ROWS):
+            for start, end in changed_runs(self.shadow_rows[row], rows[row]):
+                self.lcd.set_cursor(start, row)
+                self.lcd.write_chars(rows[row][start:end].encode('ascii', 'replace'))
+                self.i2c_writes += 2
+            self.shadow_rows[row] = rows[row]
+
+    def draw_rgb(self, rgb):
+        # PCA9633 PWM registers: 4 = red, 3 = green, 2 = blue
+        for register, value, old in zip((4, 3, 2), rgb, self.shadow_rgb or (None, None, None)):
+            if value != old:
+                self.lcd.set_channel(register, value)
+                self.i2c_writes += 1
+        self.shadow_rgb = rgb
+
+    def run(self):
+        self.open_display()
+        while not self.stop_event.is_set():
+            self.wake_event.wait(0.5)
+            self.wake_event.clear()
+            with self.lock:
+                text, self.pending_text = self.pending_text, None
+                rgb, self.pending_rgb = self.pending_rgb, None
+            if not self.available or (text is None and rgb is None):
+                continue
+            try:
+                if rgb is not None and rgb != self.shadow_rgb:
+                    self.draw_rgb(rgb)
+                if text is not None:
+                    self.draw_text(text)
+                self.redraws += 1
+            except Exception as e:
+                print(f"LCD update failed: {e}")
+                # Display state unknown - full redraw on the next request
+                self.shadow_rows = [None] * LCD_ROWS
+                self.shadow_rgb = None
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
+        if self.thread:
+            self.thread.join(timeout=1)
+            self.thread = None
+
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'redraws': self.redraws,
+            'i2c_writes': self.i2c_writes,
+        }
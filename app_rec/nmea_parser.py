@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+NMEA 0183 parser
+Checksum-validated, table-dispatched parsing of GGA, RMC, VTG, GSA and GSV
+sentences from any talker (GP, GN, GL, GA, GB, BD, GQ).
+
+Coordinates are converted to signed decimal degrees and numeric fields to
+int/float once, at parse time, so consumers never re-parse strings.
+"""
+
+import time
+
+# Talker IDs we accept (GPS, multi-GNSS, GLONASS, Galileo, BeiDou, QZSS)
+TALKERS = frozenset(('GP', 'GN', 'GL', 'GA', 'GB', 'BD', 'GQ'))
+
+# GSA/GSV NMEA 4.10+ system IDs
+SYSTEM_IDS = {1: 'GPS', 2: 'GLONASS', 3: 'GALILEO', 4: 'BEIDOU', 5: 'QZSS'}
+
+
+def xor_checksum(data):
+    """XOR of all bytes in data, folded as one big integer (no per-byte loop)"""
+    n = int.from_bytes(data, 'little')
+    width = len(data)
+    while width > 1:
+        half = (width + 1) // 2
+        n = (n >> (half * 8)) ^ (n & ((1 << (half * 8)) - 1))
+        width = half
+    return n
+
+
+def _float(field):
+    return float(field) if field else None
+
+
+def _int(field):
+    return int(field) if field else None
+
+
+def _coordinate(value, hemisphere):
+    """Convert NMEA ddmm.mmmm / dddmm.mmmm to signed decimal degrees"""
+    if not value:
+        return None
+    raw = float(value)
+    degrees = int(raw // 100)
+    decimal = degrees + (raw - degrees * 100) / 60.0
+    if hemisphere in ('S', 'W'):
+        decimal = -decimal
+    return decimal
+
+
+def _parse_gga(fields):
+    # GGA - Global Positioning System Fix Data
+    if len(fields) < 14:
+        return None
+    return {
+        'type': 'GGA',
+        'time': fields[0] or None,
+        'latitude': _coordinate(fields[1], fields[2]),
+        'longitude': _coordinate(fields[3], fields[4]),
+        'quality': _int(fields[5]),
+        'satellites': _int(fields[6]),
+        'hdop': _float(fields[7]),
+        'altitude': _float(fields[8]),
+        'geoid_height': _float(fields[10]),
+        'dgps_age': _float(fields[12]),
+    }
+
+
+def _parse_rmc(fields):
+    # RMC - Recommended Minimum sentence C
+    if len(fields) < 11:
+        return None
+    speed_knots = _float(fields[6])
+    # Magnetic variation is plain degrees (not ddmm.mmmm); west is negative
+    variation = _float(fields[9])
+    if variation is not None and fields[10] == 'W':
+        variation = -variation
+    return {
+        'type': 'RMC',
+        'time': fields[0] or None,
+        'status': fields[1] or None,
+        'latitude': _coordinate(fields[2], fields[3]),
+        'longitude': _coordinate(fields[4], fields[5]),
+        'speed_knots': speed_knots,
+        'speed_kmh': speed_knots * 1.852 if speed_knots is not None else None,
+        'course': _float(fields[7]),
+        'date': fields[8] or None,
+        'variation': variation,
+        'mode': (fields[11] or None) if len(fields) > 11 else None,
+    }
+
+
+def _parse_vtg(fields):
+    # VTG - Course over ground and Ground speed
+    if len(fields) < 8:
+        return None
+    return {
+        'type': 'VTG',
+        'course_true': _float(fields[0]),
+        'course_magnetic': _float(fields[2]),
+        'speed_knots': _float(fields[4]),
+        'speed_kmh': _float(fields[6]),
+    }
+
+
+def _parse_gsa(fields):
+    # GSA - DOP and active satellites
+    if len(fields) < 17:
+        return None
+    return {
+        'type': 'GSA',
+        'mode': fields[0] or None,
+        'fix_type': _int(fields[1]),
+        'satellites_used': [int(prn) for prn in fields[2:14] if prn],
+        'pdop': _float(fields[14]),
+        'hdop': _float(fields[15]),
+        'vdop': _float(fields[16]),
+        'system': SYSTEM_IDS.get(_int(fields[17])) if len(fields) > 17 and fields[17] else None,
+    }
+
+
+def _parse_gsv(fields):
+    # GSV - Satellites in view (up to 4 per sentence)
+    if len(fields) < 3:
+        return None
+    satellites = []
+    for i in range(3, len(fields) - 3, 4):
+        if fields[i]:
+            satellites.append({
+                'prn': int(fields[i]),
+                'elevation': _int(fields[i + 1]),
+                'azimuth': _int(fields[i + 2]),
+                'snr': _int(fields[i + 3]),
+            })
+    return {
+        'type': 'GSV',
+        'total_messages': _int(fields[0]),
+        'message_number': _int(fields[1]),
+        'satellites_in_view': _int(fields[2]),
+        'satellites': satellites,
+    }
+
+
+# Precompiled dispatch: sentence formatter -> parse function
+PARSERS = {
+    'GGA': _parse_gga,
+    'RMC': _parse_rmc,
+    'VTG': _parse_vtg,
+    'GSA': _parse_gsa,
+    'GSV': _parse_gsv,
+}
+
+
+class NmeaParser:
+    """Stateless-per-sentence NMEA parser with running counters"""
+
+    def __init__(self, require_checksum=True, keep_unknown=False):
+        self.require_checksum = require_checksum
+        self.keep_unknown = keep_unknown
+
+        # Counters
+        self.parsed = 0
+        self.bad_checksum = 0
+        self.malformed = 0
+        self.unsupported = 0
+
+    def parse(self, line, timestamp=None):
+        """Parse one sentence; returns a dict, or None if invalid/unsupported"""
+        line = line.strip()
+        if len(line) < 7 or line[0] != '$':
+            self.malformed += 1
+            return None
+
+        star = line.rfind('*')
+        if star != -1:
+            body = line[1:star]
+            try:
+                expected = int(line[star + 1:star + 3], 16)
+            except ValueError:
+                self.malformed += 1
+                return None
+            if xor_checksum(body.encode('ascii', 'replace')) != expected:
+                self.bad_checksum += 1
+                return None
+        elif self.require_checksum:
+            self.bad_checksum += 1
+            return None
+        else:
+            body = line[1:]
+
+        fields = body.split(',')
+        address = fields[0]
+        talker = address[:2]
+        handler = PARSERS.get(address[2:]) if talker in TALKERS else None
+
+        if handler is None:
+            self.unsupported += 1
+            if self.keep_unknown:
+                return {
+                    'timestamp': timestamp if timestamp is not None else time.time(),
+                    'type': 'RAW',
+                    'sentence': line,
+                }
+            return None
+
+        try:
+            data = handler(fields[1:])
+        except ValueError:
+            data = None
+        if data is None:
+            self.malformed += 1
+            return None
+
+        data['talker'] = talker
+        data['timestamp'] = timestamp if timestamp is not None else time.time()
+        self.parsed += 1
+        return data
+
+    def stats(self):
+        """Counters for reporting"""
+        return {
+            'parsed': self.parsed,
+            'bad_checksum': self.bad_checksum,
+            'malformed': self.malformed,
+            'unsupported': self.unsupported,
+        }
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Timing probes
+Low-overhead latency histograms for the recording hot paths.
+
+A probe is timed with time.perf_counter_ns() around the measured call and
+record()ed in nanoseconds. Each thread gets its own preallocated histogram
+per probe, so recording is a few integer operations with no lock; the
+histograms are only merged when a report is taken.
+
+Buckets are log-linear: 8 per power of two, so percentiles are within
+about 6%.
+
+    from perf_probes import probe
+    DETECT = probe('detect')
+
+    start = time.perf_counter_ns()
+    result = detector.detect(image)
+    DETECT.record(time.perf_counter_ns() - start)
+"""
+
+import threading
+from array import array
+
+SUB_BITS = 3
+SUB_BUCKETS = 1 << SUB_BITS
+# Up to 2**40 ns (~18 minutes); longer samples land in the last bucket
+MAX_BITS = 40
+BUCKETS = (MAX_BITS + 1) * SUB_BUCKETS
+
+
+def bucket_index(ns):
+    """Log-linear bucket for a non-negative duration in ns"""
+    if ns < SUB_BUCKETS:
+        return max(0, ns)
+    bits = ns.bit_length()
+    if bits > MAX_BITS:
+        return BUCKETS - 1
+    return (bits - SUB_BITS) * SUB_BUCKETS + (ns >> (bits - SUB_BITS - 1)) - SUB_BUCKETS
+
+
+def bucket_value(index):
+    """Representative duration (bucket midpoint) in ns"""
+    if index < SUB_BUCKETS:
+        return float(index)
+    octave, sub = divmod(index, SUB_BUCKETS)
+    shift = octave - 1
+    low = (SUB_BUCKETS + sub) << shift
+    return low + ((1 << shift) - 1) / 2.0
+
+
+class Histogram:
+    """One thread's samples for one probe"""
+
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * BUCKETS))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, ns):
+        self.counts[bucket_index(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def reset(self):
+        self.counts = array('Q', bytes(8 * BUCKETS))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+
+class Probe:
+    """Named timing probe with per-thread histograms"""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.local = threading.local()
+        self.histograms = []
+        self.lock = threading.Lock()
+
+    def histogram(self):
+        """This thread's histogram (created on the thread's first sample)"""
+        histogram = Histogram()
+        with self.lock:
+            self.histograms.append(histogram)
+        self.local.histogram = histogram
+        return histogram
+
+    def record(self, ns):
+        """Add one duration in nanoseconds"""
+        if not self.profiler.enabled:
+            return
+        try:
+            histogram = self.local.histogram
+        except AttributeError:
+            histogram = self.histogram()
+        histogram.add(ns)
+
+    def reset(self):
+        with self.lock:
+            for histogram in self.histograms:
+                histogram.reset()
+
+    def summary(self):
+        """Merged count, mean, percentiles and max in milliseconds (None if no samples)"""
+        with self.lock:
+            histograms = list(self.histograms)
+        merged = array('Q', bytes(8 * BUCKETS))
+        count = total = peak = 0
+        for histogram in histograms:
+            counts = histogram.counts
+            for i in range(BUCKETS):
+                if counts[i]:
+                    merged[i] += counts[i]
+            count += histogram.count
+            total += histogram.total
+            peak = max(peak, histogram.max)
+        if not count:
+            return None
+
+        summary = {'count': count, 'mean_ms': total / count / 1e6}
+        targets = [('p50_ms', 0.50), ('p95_ms', 0.95), ('p99_ms', 0.99)]
+        seen = 0
+        for i in range(BUCKETS):
+            seen += merged[i]
+            while targets and seen >= targets[0][1] * count:
+                key, _ = targets.pop(0)
+                # Never report a percentile above the observed maximum
+                summary[key] = min(bucket_value(i), peak) / 1e6
+            if not targets:
+                break
+        summary['max_ms'] = peak / 1e6
+        summary['total_s'] = total / 1e9
+        return summary
+
+
+class Profiler:
+    """Registry of probes and event counters"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.probes = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def probe(self, name):
+        with self.lock:
+            if name not in self.probes:
+                self.probes[name] = Probe(self, name)
+            return self.probes[name]
+
+    def count(self, name, n=1):
+        """Bump an event counter (drops, retries, ...)"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self):
+        """Clear all samples (start of a session)"""
+        with self.lock:
+            probes = list(self.probes.values())
+            self.counters = {}
+        for p in probes:
+            p.reset()
+
+    def report(self):
+        """Summary of every probe with samples, plus counters"""
+        with self.lock:
+            probes = list(self.probes.values())
+        summaries = {}
+        for p in probes:
+            summary = p.summary()
+            if summary is not None:
+                summaries[p.name] = summary
+        return {'probes': summaries, 'counters': dict(self.counters)}
+
+    def format_report(self, report=None):
+        """Report as a console table"""
+        report = report or self.report()
+        lines = [f"{'probe':<18} {'count':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"]
+        for name, s in sorted(report['probes'].items()):
+            lines.append(f"{name:<18} {s['count']:>8} {s['p50_ms']:>8.2f} {s['p95_ms']:>8.2f} "
+                         f"{s['p99_ms']:>8.2f} {s['max_ms']:>8.2f}")
+        for name, value in sorted(report['counters'].items()):
+            lines.append(f"{name:<18} {value:>8}")
+        return '\n'.join(lines)
+
+
+# Process-wide profiler used by the recorder and the helper modules
+PROFILER = Profiler()
+
+
+def probe(name):
+    """Probe on the process-wide profiler"""
+    return PROFILER.probe(name)
@@ -0,0 +1,17 @@
+"""
+Recorder package
+The engine behind main.py, main_alternative.py, main_gpiod.py,
+main_no_gpio.py and rec_vid_btn.py. Each launcher only picks its default
+inputs, sinks and features; everything else is shared.
+"""
+
+from .config import DEFAULT_CONFIG, load_config, parse_args, overrides_from_args
+from .core import MultiCameraRecorder
+
+
+def main(defaults=None, argv=None):
+    """Launcher entry point: build the config and run the recorder"""
+    args = parse_args(argv)
+    config = load_config(args.config, defaults, overrides_from_args(args))
+    recorder = MultiCameraRecorder(config)
+    recorder.run()
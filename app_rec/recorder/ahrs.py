@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+IMU orientation fusion
+Madgwick and Mahony AHRS filters (gyroscope + accelerometer, no
+magnetometer) giving an orientation quaternion at the gyroscope rate, for
+IMUs without an on-chip ROTATION_VECTOR (e.g. the BMI270 on OAK models
+without the BNO086).
+
+Live, the recorder feeds each IMU packet through OrientationFilter and
+writes orientation_<session>.json ("ahrs": {"enabled": true}). Offline,
+whole sessions are fused from their gyroscope/accelerometer streams:
+
+    python -m recorder.ahrs recordings --method mahony
+
+The filter steps are written with plain arithmetic so the same code runs
+on floats (live, one sample at a time: no per-sample NumPy overhead) and on
+NumPy arrays (offline, many sessions advanced together, one array operation
+per term). Yaw drifts slowly without a magnetometer. Quaternions are
+(w, x, y, z), sensor frame to world frame with z up. See bench_ahrs.py.
+"""
+
+import argparse
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_PARAMS = {
+    'madgwick': {'beta': 0.05},
+    'mahony': {'kp': 1.0, 'ki': 0.02},
+}
+
+# Below this many streams the float path is faster than NumPy columns
+MIN_VECTOR_STREAMS = 16
+
+
+def madgwick_step(q, gyro, accel, dt, sqrt, beta):
+    """One Madgwick IMU update; q, gyro, accel are tuples of floats or arrays"""
+    w, x, y, z = q
+    gx, gy, gz = gyro
+    ax, ay, az = accel
+
+    # Rate of change from the gyroscope: 0.5 * q * (0, g)
+    dw = 0.5 * (-x * gx - y * gy - z * gz)
+    dx = 0.5 * (w * gx + y * gz - z * gy)
+    dy = 0.5 * (w * gy - x * gz + z * gx)
+    dz = 0.5 * (w * gz + x * gy - y * gx)
+
+    # Gradient step towards the measured gravity; skipped when accel is zero
+    norm = sqrt(ax * ax + ay * ay + az * az)
+    valid = norm > 1e-9
+    inv = valid / (norm + 1e-12)
+    ax, ay, az = ax * inv, ay * inv, az * inv
+    f1 = 2 * (x * z - w * y) - ax
+    f2 = 2 * (w * x + y * z) - ay
+    f3 = 1 - 2 * (x * x + y * y) - az
+    s0 = -2 * y * f1 + 2 * x * f2
+    s1 = 2 * z * f1 + 2 * w * f2 - 4 * x * f3
+    s2 = -2 * w * f1 + 2 * z * f2 - 4 * y * f3
+    s3 = 2 * x * f1 + 2 * y * f2
+    scale = beta * valid / (sqrt(s0 * s0 + s1 * s1 + s2 * s2 + s3 * s3) + 1e-12)
+    dw -= s0 * scale
+    dx -= s1 * scale
+    dy -= s2 * scale
+    dz -= s3 * scale
+
+    w, x, y, z = w + dw * dt, x + dx * dt, y + dy * dt, z + dz * dt
+    inv = 1.0 / sqrt(w * w + x * x + y * y + z * z)
+    return w * inv, x * inv, y * inv, z * inv
+
+
+def mahony_step(q, integral, gyro, accel, dt, sqrt, kp, ki):
+    """One Mahony update; returns (q, integral)"""
+    w, x, y, z = q
+    gx, gy, gz = gyro
+    ax, ay, az = accel
+
+    norm = sqrt(ax * ax + ay * ay + az * az)
+    inv = (norm > 1e-9) / (norm + 1e-12)
+    ax, ay, az = ax * inv, ay * inv, az * inv
+
+    # Error between measured and estimated gravity directions
+    vx = 2 * (x * z - w * y)
+    vy = 2 * (w * x + y * z)
+    vz = w * w - x * x - y * y + z * z
+    ex = ay * vz - az * vy
+    ey = az * vx - ax * vz
+    ez = ax * vy - ay * vx
+
+    ix, iy, iz = integral
+    ix, iy, iz = ix + ki * ex * dt, iy + ki * ey * dt, iz + ki * ez * dt
+    gx, gy, gz = gx + kp * ex + ix, gy + kp * ey + iy, gz + kp * ez + iz
+
+    half = 0.5 * dt
+    w, x, y, z = (w + (-x * gx - y * gy - z * gz) * half,
+                  x + (w * gx + y * gz - z * gy) * half,
+                  y + (w * gy - x * gz + z * gx) * half,
+                  z + (w * gz + x * gy - y * gx) * half)
+    inv = 1.0 / sqrt(w * w + x * x + y * y + z * z)
+    return (w * inv, x * inv, y * inv, z * inv), (ix, iy, iz)
+
+
+def tilt_quaternion(ax, ay, az):
+    """Orientation (yaw 0) whose gravity matches an accelerometer reading"""
+    roll = math.atan2(ay, az)
+    pitch = math.atan2(-ax, math.sqrt(ay * ay + az * az))
+    cr, sr = math.cos(roll / 2), math.sin(roll / 2)
+    cp, sp = math.cos(pitch / 2), math.sin(pitch / 2)
+    return cr * cp, sr * cp, cr * sp, -sr * sp
+
+
+class OrientationFilter:
+    """Live AHRS: one update per IMU sample, quaternion out"""
+
+    def __init__(self, method='madgwick', params=None):
+        if method not in DEFAULT_PARAMS:
+            raise ValueError(f"Unknown AHRS method '{method}' ({', '.join(DEFAULT_PARAMS)})")
+        self.method = method
+        self.params = dict(DEFAULT_PARAMS[method], **(params or {}))
+        self.q = None
+        self.integral = (0.0, 0.0, 0.0)
+        self.last_time = None
+
+    def update(self, gyro, accel, timestamp):
+        """Advance to `timestamp` (s) with gyro (rad/s) and accel (any unit); returns (w, x, y, z)"""
+        if self.q is None:
+            self.q = tilt_quaternion(*accel)
+            self.last_time = timestamp
+            return self.q
+        dt = timestamp - self.last_time
+        self.last_time = timestamp
+        if dt <= 0 or dt > 1.0:
+            # Duplicate or stale sample: keep the estimate
+            return self.q
+        if self.method == 'madgwick':
+            self.q = madgwick_step(self.q, gyro, accel, dt, math.sqrt, self.params['beta'])
+        else:
+            self.q, self.integral = mahony_step(self.q, self.integral, gyro, accel, dt, math.sqrt,
+                                                self.params['kp'], self.params['ki'])
+        return self.q
+
+
+def fuse(streams, method='madgwick', params=None):
+    """Offline AHRS over several recordings at once
+
+    streams: list of (times (N,), gyro (N, 3), accel (N, 3)) arrays. From
+    MIN_VECTOR_STREAMS streams on, all advance together, one NumPy operation
+    per filter term per sample index (shorter streams padded with dt = 0);
+    fewer run one by one through OrientationFilter. Returns a list of (N, 4)
+    quaternion arrays, identical either way.
+    """
+    params = dict(DEFAULT_PARAMS[method], **(params or {}))
+    count = len(streams)
+    if count < MIN_VECTOR_STREAMS:
+        return [fuse_one(times, gyro, accel, method, params) for times, gyro, accel in streams]
+
+    length = max(len(times) for times, _, _ in streams)
+    dts = np.zeros((length, count))
+    gyro = np.zeros((length, 3, count))
+    accel = np.zeros((length, 3, count))
+    for column, (times, stream_gyro, stream_accel) in enumerate(streams):
+        n = len(times)
+        step = np.diff(times, prepend=times[0])
+        # Same rule as live: skip duplicate and stale samples
+        step[(step <= 0) | (step > 1.0)] = 0.0
+        dts[:n, column] = step
+        gyro[:n, :, column] = stream_gyro
+        accel[:n, :, column] = stream_accel
+
+    first = [tilt_quaternion(*accel[0, :, column]) for column in range(count)]
+    q = tuple(np.array(component) for component in zip(*first))
+    integral = (np.zeros(count),) * 3
+    out = np.empty((length, 4, count))
+    out[0] = q
+    for n in range(1, length):
+        if method == 'madgwick':
+            q = madgwick_step(q, gyro[n], accel[n], dts[n], np.sqrt, params['beta'])
+        else:
+            q, integral = mahony_step(q, integral, gyro[n], accel[n], dts[n], np.sqrt,
+                                      params['kp'], params['ki'])
+        out[n] = q
+    return [out[:len(times), :, column] for column, (times, _, _) in enumerate(streams)]
+
+
+def fuse_one(times, gyro, accel, method='madgwick', params=None):
+    """(N, 4) quaternions of one stream through the live filter"""
+    orientation = OrientationFilter(method, params)
+    update = orientation.update
+    return np.array([update(g, a, t) for t, g, a in zip(times.tolist(), gyro.tolist(), accel.tolist())])
+
+
+def read_xyz(path):
+    """(device times, (N, 3) values) of a gyroscope/accelerometer stream"""
+    times, values = [], []
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            times.append(record.get('device_time', record['timestamp']))
+            values.append((record['x'], record['y'], record['z']))
+    return np.array(times, np.float64), np.array(values, np.float64).reshape(-1, 3)
+
+
+def load_session_imu(recordings_dir, session):
+    """(times, gyro, accel) of a session; accel sampled at each gyro time (newest before it)"""
+    recordings_dir = Path(recordings_dir)
+    times, gyro = read_xyz(recordings_dir / f"gyroscope_{session}.json")
+    accel_times, accel = read_xyz(recordings_dir / f"accelerometer_{session}.json")
+    if not len(times) or not len(accel_times):
+        raise ValueError(f"Session {session} has no gyroscope/accelerometer samples")
+    index = np.clip(np.searchsorted(accel_times, times, side='right') - 1, 0, len(accel_times) - 1)
+    return times, gyro, accel[index]
+
+
+def orientation_records(times, quaternions):
+    """Orientation stream records, as the recorder writes them live"""
+    for t, (w, x, y, z) in zip(times.tolist(), quaternions.tolist()):
+        yield {'w': w, 'x': x, 'y': y, 'z': z, 'device_time': t}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline IMU orientation (AHRS) for recorded sessions")
+    parser.add_argument('recordings_dir', help="directory with gyroscope_/accelerometer_ streams")
+    parser.add_argument('--session', action='append', default=[], help="only this session (repeatable)")
+    parser.add_argument('--method', choices=sorted(DEFAULT_PARAMS), default='madgwick')
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=VALUE',
+                        help="filter parameter, e.g. beta=0.1 (repeatable)")
+    parser.add_argument('--force', action='store_true', help="overwrite existing orientation streams")
+    args = parser.parse_args()
+
+    recordings_dir = Path(args.recordings_dir)
+    sessions = args.session or sorted(path.name[len('accelerometer_'):-len('.json')]
+                                      for path in recordings_dir.glob('accelerometer_*.json'))
+    todo = []
+    for session in sessions:
+        output = recordings_dir / f"orientation_{session}.json"
+        if output.exists() and not args.force:
+            print(f"{output.name} exists, skipping (--force to redo)")
+            continue
+        try:
+            todo.append((session, output, load_session_imu(recordings_dir, session)))
+        except Exception as e:
+            print(f"Skipping {session}: {e}")
+    if not todo:
+        return
+
+    params = {name: float(value) for name, value in (param.split('=', 1) for param in args.param)}
+    results = fuse([streams for _, _, streams in todo], args.method, params)
+    for (session, output, (times, _, _)), quaternions in zip(todo, results):
+        with open(output, 'w') as f:
+            for record in orientation_records(times, quaternions):
+                f.write(json.dumps(record) + '\n')
+        print(f"{output.name}: {len(times)} samples ({args.method})")
+
+
+if __name__ == "__main__":
+    main()
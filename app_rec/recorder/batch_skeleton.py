@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Batch skeleton extraction
+Runs pose detection offline over recorded videos (camera1/2/3), for sessions
+recorded with skeleton detection off or to redo them with a heavier model.
+Output uses the live skeleton stream format, one file per video:
+skeleton_<session>.json for camera3 (as the recorder names it) and
+skeleton_<camera>_<session>.json for camera1/2.
+
+Usage (from app_rec/):
+    python -m recorder.batch_skeleton recordings --workers 4
+    python -m recorder.batch_skeleton recordings --model models/pose_landmarker_heavy.task --force
+
+Videos are split into chunks of --chunk frames and spread over a process
+pool with one detector per worker, so a single long video also uses every
+core. Each finished chunk is checkpointed under <output>.parts/; an
+interrupted run picks up at the first missing chunk.
+
+camera3 frames take their recorded timestamps from frames_<session>.json
+(the loader replay.py uses), so offline records line up with live ones and
+with the IMU; CFR duplicate slots are skipped, as live detection never sees
+them. Frames without metadata (camera1/2, burned-in overlays) are stamped
+at the session start (see replay.py) + n / fps. Raw .h264 files from
+rpicam-vid carry no frame rate (--h264-fps is used instead) and no frame
+count. Their frames are counted once (ffprobe -count_packets, else a
+decode-only pass) and they are split into chunks like the other videos.
+
+--world adds MediaPipe's world landmarks. camera3 sessions recorded with
+the depth stream also get depth-lifted 3D joints (landmarks_3d), from the
+newest depth image at or before each frame, as the recorder does live.
+"""
+
+import argparse
+import bisect
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .config import load_config
+from .depth import load_depth_index, lift_points
+from .replay import SessionReplay, load_frame_records
+
+VIDEO_PATTERN = re.compile(r'^(camera[123])_(.+)\.(avi|mp4|mkv|h264)$')
+
+# Pose detector of this worker process, see init_worker()
+DETECTOR = None
+
+
+def init_worker(model):
+    """Load one pose detector per worker process"""
+    global DETECTOR
+    from .skeleton import PoseDetector
+    DETECTOR = PoseDetector(model)
+
+
+def write_atomic(path, lines):
+    """Write lines to path via a temp file, so a checkpoint is never half written"""
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w') as f:
+        for line in lines:
+            f.write(line)
+            f.write('\n')
+    os.replace(tmp, path)
+
+
+def open_at(video, frame):
+    """Capture positioned at a frame index"""
+    import cv2
+    capture = cv2.VideoCapture(str(video))
+    if frame:
+        capture.set(cv2.CAP_PROP_POS_FRAMES, frame)
+        if int(capture.get(cv2.CAP_PROP_POS_FRAMES)) != frame:
+            # Raw streams can't seek; decode up to the frame instead
+            capture.release()
+            capture = cv2.VideoCapture(str(video))
+            for _ in range(frame):
+                if not capture.grab():
+                    break
+    return capture
+
+
+class DepthLookup:
+    """Depth image of a session for each camera3 frame (newest at or before it)"""
+
+    def __init__(self, depth):
+        self.directory = Path(depth['directory'])
+        self.intrinsics = depth['intrinsics']
+        self.window = depth['window']
+        self.max_gap = depth['max_gap']
+        self.rgb_frames = [rgb_frame for rgb_frame, _ in depth['frames']]
+        self.depth_frames = [depth_frame for _, depth_frame in depth['frames']]
+        self.cached = (None, None)
+
+    def image(self, frame):
+        """(depth_frame, image) for a video frame, or None"""
+        position = bisect.bisect_right(self.rgb_frames, frame) - 1
+        if position < 0 or frame - self.rgb_frames[position] > self.max_gap:
+            return None
+        depth_frame = self.depth_frames[position]
+        if self.cached[0] != depth_frame:
+            import cv2
+            image = cv2.imread(str(self.directory / f"{depth_frame:06d}.png"), cv2.IMREAD_UNCHANGED)
+            self.cached = (depth_frame, image)
+        return self.cached if self.cached[1] is not None else None
+
+
+def process_chunk(task):
+    """Detect poses on frames [start, end) of a video and checkpoint the records"""
+    from .skeleton import landmark_array
+    started = time.perf_counter()
+    capture = open_at(task['video'], task['start'])
+    depth = DepthLookup(task['depth']) if task['depth'] else None
+    lines = []
+    index = task['start']
+    try:
+        while task['end'] is None or index < task['end']:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            recorded = task['frames'].get(index)
+            if recorded is not None and recorded[1]:
+                # CFR duplicate slot: the previous image again, never detected live
+                index += 1
+                continue
+            result = DETECTOR.detect(frame)
+            timestamp = recorded[0] if recorded is not None else task['start_time'] + index / task['fps']
+            points_3d = None
+            image = depth.image(index) if depth and result.pose_landmarks else None
+            if image is not None:
+                points_3d = lift_points(landmark_array(result)[..., :2], image[1], depth.intrinsics, depth.window)
+            for record in DETECTOR.records(result, timestamp, index, task['world'], points_3d):
+                if image is not None:
+                    record['depth_frame'] = image[0]
+                lines.append(json.dumps(record))
+            index += 1
+    finally:
+        capture.release()
+
+    write_atomic(Path(task['part']), lines)
+    return {'frames': index - task['start'], 'poses': len(lines), 'seconds': time.perf_counter() - started}
+
+
+def count_frames(video):
+    """Frames in a video without a frame index: ffprobe's packet count, else a decode-only pass"""
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-count_packets',
+             '-show_entries', 'stream=nb_read_packets', '-of', 'csv=p=0', str(video)],
+            capture_output=True, text=True, timeout=600)
+        if result.returncode == 0 and result.stdout.strip().isdigit():
+            return int(result.stdout.strip())
+    except Exception as e:
+        print(f"ffprobe unavailable ({e}), counting {video.name} by decoding")
+    import cv2
+    capture = cv2.VideoCapture(str(video))
+    count = 0
+    try:
+        while capture.grab():
+            count += 1
+    finally:
+        capture.release()
+    return count
+
+
+def video_info(video, h264_fps, cache_dir=None):
+    """(fps, frame count or None) of a video
+
+    Raw .h264 (rpicam-vid) has no frame rate or index, so its frames are
+    counted once and the count is kept in cache_dir for resumed runs.
+    """
+    import cv2
+    capture = cv2.VideoCapture(str(video))
+    fps = capture.get(cv2.CAP_PROP_FPS)
+    count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    capture.release()
+    if video.suffix != '.h264' and fps:
+        return fps, count if count > 0 else None
+
+    cached = Path(cache_dir) / 'frame_count' if cache_dir else None
+    if cached and cached.exists():
+        return h264_fps, int(cached.read_text())
+    count = count_frames(video)
+    if not count:
+        return h264_fps, None
+    if cached:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        cached.write_text(str(count))
+    return h264_fps, count
+
+
+def find_videos(recordings_dir, sessions=None):
+    """(camera, session, path) of every recorded video"""
+    videos = []
+    for path in sorted(Path(recordings_dir).iterdir()):
+        match = VIDEO_PATTERN.match(path.name)
+        if match and (not sessions or match.group(2) in sessions):
+            videos.append((match.group(1), match.group(2), path))
+    return videos
+
+
+def output_name(camera, session):
+    if camera == 'camera3':
+        return f"skeleton_{session}.json"
+    return f"skeleton_{camera}_{session}.json"
+
+
+def depth_info(recordings_dir, session, window):
+    """Depth lookup settings for a session's camera3 video, or None without depth"""
+    intrinsics, records = load_depth_index(recordings_dir, session)
+    if not intrinsics or not intrinsics['intrinsics'] or not records:
+        return None
+    frames = sorted((record['rgb_frame'], record['depth_frame']) for record in records)
+    gaps = sorted(later[0] - earlier[0] for earlier, later in zip(frames, frames[1:]))
+    return {
+        'directory': str(Path(recordings_dir) / f"depth_{session}"),
+        'intrinsics': intrinsics['intrinsics'],
+        'window': window,
+        # A frame uses depth at most one typical depth interval old
+        'max_gap': gaps[len(gaps) // 2] + 1 if gaps else 1,
+        'frames': frames,
+    }
+
+
+def plan_jobs(recordings_dir, output_dir, chunk, h264_fps, sessions=None, force=False,
+              world=False, depth_lift=True, depth_window=5):
+    """One job per video still to do, with the chunks not yet checkpointed"""
+    jobs = []
+    start_times = {}
+    for camera, session, video in find_videos(recordings_dir, sessions):
+        output = Path(output_dir) / output_name(camera, session)
+        parts_dir = output.with_name(output.name + '.parts')
+        if force:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+        elif output.exists():
+            continue
+
+        if session not in start_times:
+            start_times[session] = SessionReplay(recordings_dir, session).start_time
+        fps, count = video_info(video, h264_fps, parts_dir)
+        if count is None:
+            ranges = [(0, None)]
+        else:
+            ranges = [(start, min(start + chunk, count)) for start in range(0, count, chunk)]
+
+        depth = None
+        frame_records = {}
+        if camera == 'camera3':
+            if depth_lift:
+                depth = depth_info(recordings_dir, session, depth_window)
+            # (timestamp, duplicate) per frame, as recorded live
+            frame_records = {frame: (record['timestamp'], bool(record.get('duplicate')))
+                             for frame, record in load_frame_records(recordings_dir, session).items()}
+
+        parts_dir.mkdir(parents=True, exist_ok=True)
+        parts = [parts_dir / f"{start:08d}-{end if end is not None else 'end'}.json" for start, end in ranges]
+        tasks = [
+            {'video': str(video), 'start': start, 'end': end, 'fps': fps,
+             'start_time': start_times[session], 'part': str(part), 'world': world, 'depth': depth,
+             'frames': {frame: value for frame, value in frame_records.items()
+                        if frame >= start and (end is None or frame < end)}}
+            for (start, end), part in zip(ranges, parts) if not part.exists()
+        ]
+        jobs.append({'video': video, 'output': output, 'parts_dir': parts_dir, 'parts': parts,
+                     'tasks': tasks, 'remaining': len(tasks), 'failed': False})
+    return jobs
+
+
+def assemble(job):
+    """Concatenate a video's checkpoints into its skeleton file"""
+    tmp = job['output'].with_name(job['output'].name + '.tmp')
+    with open(tmp, 'w') as out:
+        for part in job['parts']:
+            with open(part) as f:
+                shutil.copyfileobj(f, out)
+    os.replace(tmp, job['output'])
+    shutil.rmtree(job['parts_dir'], ignore_errors=True)
+
+
+def run_batch(recordings_dir, output_dir, model=None, workers=None, chunk=300, h264_fps=30.0,
+              sessions=None, force=False, world=None):
+    """Extract skeletons for every video in recordings_dir; returns a summary dict"""
+    skeleton_config = load_config()['skeleton']
+    model = model or skeleton_config['model']
+    world = skeleton_config['world_landmarks'] if world is None else world
+    workers = workers or os.cpu_count() or 1
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    jobs = plan_jobs(recordings_dir, output_dir, chunk, h264_fps, sessions, force,
+                     world, skeleton_config['depth_lift'], skeleton_config['depth_window'])
+
+    frames = poses = 0
+    busy = 0.0
+    started = time.monotonic()
+    tasks = [(job, task) for job in jobs for task in job['tasks']]
+    print(f"Batch skeleton: {len(jobs)} videos, {len(tasks)} chunks to do, {workers} workers")
+
+    # Videos whose chunks were all checkpointed by an earlier run
+    for job in jobs:
+        if not job['remaining']:
+            assemble(job)
+            print(f"{job['output'].name}: assembled from checkpoints")
+
+    if tasks:
+        # Fresh interpreters: OpenCV and MediaPipe threads do not survive fork()
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=init_worker, initargs=(model,)) as pool:
+            futures = {pool.submit(process_chunk, task): job for job, task in tasks}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Skeleton extraction failed for {job['video'].name}: {e}")
+                    job['failed'] = True
+                    continue
+                frames += result['frames']
+                poses += result['poses']
+                busy += result['seconds']
+                job['remaining'] -= 1
+                if not job['remaining'] and not job['failed']:
+                    assemble(job)
+                    print(f"{job['output'].name}: done")
+
+    elapsed = time.monotonic() - started
+    return {
+        'videos': len(jobs),
+        'failed': sum(1 for job in jobs if job['failed']),
+        'chunks': len(tasks),
+        'frames': frames,
+        'poses': poses,
+        'workers': workers,
+        'wall_s': elapsed,
+        'fps': frames / elapsed if elapsed > 0 else 0.0,
+        'fps_per_worker': frames / busy if busy > 0 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline skeleton extraction over recorded videos")
+    parser.add_argument('recordings_dir', help="directory with the recorded videos")
+    parser.add_argument('--output', help="output directory (default: <recordings_dir>/skeleton)")
+    parser.add_argument('--session', action='append', default=[], help="only this session (repeatable)")
+    parser.add_argument('--model', help="pose model (default: the config's skeleton model)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per core)")
+    parser.add_argument('--chunk', type=int, default=300, help="frames per work unit / checkpoint")
+    parser.add_argument('--h264-fps', type=float, default=30.0, help="frame rate of raw .h264 files")
+    parser.add_argument('--force', action='store_true', help="redo videos that already have output")
+    parser.add_argument('--world', action='store_true', default=None, help="also save world landmarks")
+    args = parser.parse_args()
+
+    output_dir = args.output or str(Path(args.recordings_dir) / "skeleton")
+    summary = run_batch(args.recordings_dir, output_dir, model=args.model, workers=args.workers,
+                        chunk=args.chunk, h264_fps=args.h264_fps, sessions=args.session, force=args.force, world=args.world)
+    print(f"{summary['frames']} frames, {summary['poses']} poses in {summary['wall_s']:.1f} s: "
+          f"{summary['fps']:.1f} frames/s ({summary['fps_per_worker']:.1f} per worker)"
+          + (f", {summary['failed']} videos failed" if summary['failed'] else ""))
+
+
+if __name__ == "__main__":
+    main()
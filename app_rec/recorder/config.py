@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Recorder configuration
+One dict drives every launcher. Values are merged in this order, later
+entries winning:
+
+    DEFAULT_CONFIG < launcher defaults < config file < GPS_* environment < command line
+
+The config file is JSON (see recorder.example.json). It is read from
+--config, the SOGO_CONFIG environment variable, or recorder.json next to
+the launchers, whichever is found first.
+"""
+
+import argparse
+import copy
+import json
+import os
+from pathlib import Path
+
+from event_markers import CONTROL_SOCKET_PATH
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CONFIG_FILE = APP_DIR / "recorder.json"
+
+DEFAULT_CONFIG = {
+    'name': 'recorder',
+    'recordings_dir': 'recordings',
+
+    # Control inputs: gpiozero, gpiod, sysfs, rpigpio, stdin, socket
+    'inputs': ['stdin', 'socket'],
+    # Status sinks: led, lcd
+    'sinks': ['lcd'],
+
+    # rpicam-vid cameras; {path} is replaced with the output file
+    'cameras': {
+        'camera1': {'enabled': True, 'command': 'rpicam-vid --camera 1 --output {path}'},
+        'camera2': {'enabled': True, 'command': 'rpicam-vid --output {path}'},
+    },
+
+    'depthai': {
+        'enabled': True,
+        'width': 1920,
+        'height': 1080,
+        'fps': 15.0,
+        # Sensor frame rate; None runs the camera at 'fps' so no frames are discarded on the host
+        'camera_fps': None,
+        'codec': 'XVID',
+        'extension': 'avi',
+        'imu': True,
+        # On-chip orientation (BNO086 only); see 'ahrs' for other IMUs
+        'rotation_vector': True,
+        # frame_imu_<session>.json: IMU state interpolated at each camera3 frame (see imu_sync.py)
+        'frame_imu': True,
+        # 'metadata': raw video, overlay data in frames_<session>.json (see render.py)
+        # 'burn': timestamp, frame counter and skeleton drawn into the video
+        'overlay': 'metadata',
+        # Frame selection by device timestamp: 'cfr' (duplicate/drop onto a fixed grid) or 'vfr'
+        'pacing': 'cfr',
+    },
+
+    'skeleton': {
+        'enabled': True,
+        'model': 'models/pose_landmarker_lite.task',
+        # Also save MediaPipe's metric world landmarks (hip-centred)
+        'world_landmarks': False,
+        # With the depth stream: camera-frame 3D joints from the median depth
+        # of a depth_window x depth_window neighbourhood around each landmark
+        'depth_lift': True,
+        'depth_window': 5,
+        # Temporal landmark filter: 'none' (raw), 'one_euro' or 'kalman' (see smoothing.py)
+        'smoothing': 'none',
+        'smoothing_params': {},
+    },
+
+    # StereoDepth aligned to camera3, 16-bit PNGs (see depth.py)
+    'depth': {
+        'enabled': False,
+        # Kept well below the RGB rate; images are dropped, not RGB frames, when the Pi falls behind
+        'fps': 5.0,
+        'width': 640,
+        'height': 360,
+        'png_compression': 1,
+        'max_buffered': 4,
+    },
+
+    # Orientation from gyroscope + accelerometer (see ahrs.py): 'madgwick' or 'mahony'
+    'ahrs': {
+        'enabled': False,
+        'method': 'madgwick',
+        'params': {},
+    },
+
+    # Armed mode (see trigger.py): sessions start on motion and stop after
+    # stop_hold seconds of quiet. IMU: variance of |accel| over imu_window,
+    # (m/s^2)^2; frames: mean grey-level difference of downscaled frames
+    'trigger': {
+        'enabled': False,
+        'imu_start': 0.3,
+        'imu_stop': 0.05,
+        'imu_window': 1.0,
+        'frame_start': 8.0,
+        'frame_stop': 3.0,
+        'start_hold': 0.5,
+        'stop_hold': 10.0,
+        # Watch pipeline while idle (also the frame rate of the difference energy)
+        'watch_fps': 5.0,
+        'watch_imu_rate': 100,
+    },
+
+    'gps': {
+        'enabled': True,
+        'port': '/dev/ttyUSB0',
+        'baudrate': 9600,
+        'target_baudrate': None,
+        'update_rate_hz': None,
+        'protocol': None,
+        'pps_pin': None,
+        'nmea_latency': 0.0,
+    },
+
+    'button': {
+        'pin': 17,
+        'chip': 'gpiochip0',
+        'debounce_ms': 20,
+        'long_press': 1.5,
+        'double_window': 0.4,
+    },
+
+    # LED backend: gpiozero, gpiod, rpigpio or sysfs
+    'led': {
+        'pin': 27,
+        'backend': 'gpiozero',
+    },
+
+    'lcd': {
+        'dashboard': True,
+        'sample_interval': 1.0,
+        'page_seconds': 3.0,
+    },
+
+    'control_socket': CONTROL_SOCKET_PATH,
+
+    'io': {
+        'flush_interval': 0.25,
+        'fsync_interval': None,
+    },
+
+    # Hot-path timing probes, perf_<session>.json report
+    'profiling': {
+        'enabled': True,
+        'print_report': True,
+    },
+}
+
+# Environment variables kept from the single-file recorders
+GPS_ENVIRONMENT = {
+    'GPS_PORT': ('port', str),
+    'GPS_BAUD': ('baudrate', int),
+    'GPS_TARGET_BAUD': ('target_baudrate', int),
+    'GPS_RATE_HZ': ('update_rate_hz', float),
+    'GPS_PROTOCOL': ('protocol', str),
+    'GPS_PPS_PIN': ('pps_pin', int),
+    'GPS_NMEA_LATENCY': ('nmea_latency', float),
+}
+
+
+def merge(base, overrides):
+    """Recursively merge overrides into a copy of base"""
+    merged = copy.deepcopy(base)
+    for key, value in (overrides or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def apply_environment(config):
+    """Apply GPS_* environment variables on top of the config"""
+    for variable, (key, convert) in GPS_ENVIRONMENT.items():
+        value = os.environ.get(variable)
+        if value:
+            config['gps'][key] = convert(value)
+    return config
+
+
+def find_config_file(path=None):
+    """Explicit path, then SOGO_CONFIG, then recorder.json next to the launchers"""
+    if path:
+        return Path(path)
+    if os.environ.get('SOGO_CONFIG'):
+        return Path(os.environ['SOGO_CONFIG'])
+    if DEFAULT_CONFIG_FILE.exists():
+        return DEFAULT_CONFIG_FILE
+    return None
+
+
+def load_config(path=None, defaults=None, overrides=None):
+    """Build the recorder config (see module docstring for precedence)"""
+    config = merge(DEFAULT_CONFIG, defaults)
+    config_file = find_config_file(path)
+    if config_file:
+        with open(config_file) as f:
+            config = merge(config, json.load(f))
+        config['config_file'] = str(config_file)
+    config = apply_environment(config)
+    return merge(config, overrides)
+
+
+def parse_args(argv=None):
+    """Command line shared by all launchers"""
+    parser = argparse.ArgumentParser(description="Multi-camera recorder")
+    parser.add_argument('--config', help="JSON config file")
+    parser.add_argument('--input', action='append', dest='inputs',
+                        help="control input (repeatable): gpiozero, gpiod, sysfs, rpigpio, stdin, socket")
+    parser.add_argument('--sink', action='append', dest='sinks',
+                        help="status sink (repeatable): led, lcd")
+    parser.add_argument('--no-skeleton', action='store_true', help="disable skeleton recognition")
+    parser.add_argument('--no-gps', action='store_true', help="disable the GPS reader")
+    parser.add_argument('--depth', action='store_true', help="record the stereo depth stream")
+    parser.add_argument('--armed', action='store_true', help="start and stop sessions on motion")
+    parser.add_argument('--recordings-dir', help="output directory")
+    return parser.parse_args(argv)
+
+
+def overrides_from_args(args):
+    """Config overrides for the options given on the command line"""
+    overrides = {}
+    if args.inputs:
+        overrides['inputs'] = args.inputs
+    if args.sinks:
+        overrides['sinks'] = args.sinks
+    if args.no_skeleton:
+        overrides['skeleton'] = {'enabled': False}
+    if args.no_gps:
+        overrides['gps'] = {'enabled': False}
+    if args.depth:
+        overrides['depth'] = {'enabled': True}
+    if args.armed:
+        overrides['trigger'] = {'enabled': True}
+    if args.recordings_dir:
+        overrides['recordings_dir'] = args.recordings_dir
+    return overrides
@@ -0,0 +1,1245 @@
+#!/usr/bin/env python3
+"""
+Recorder engine
+One MultiCameraRecorder for every launcher. What it records (rpicam
+cameras, DepthAI video + IMU, skeleton, GPS) and how it is controlled
+(inputs) and shown (sinks) all come from the config dict.
+
+OpenCV, DepthAI and MediaPipe take seconds to import on a Pi, so none of
+them is imported at startup: the recorder shows ready and arms its inputs
+first, then a background thread loads them and the pose model. A recording
+started before that finishes waits for the modules in its capture thread and
+records without skeleton until the model is loaded.
+"""
+
+import json
+import math
+import sys
+import threading
+import time
+import subprocess
+from contextlib import nullcontext
+from pathlib import Path
+
+from session_writer import SessionWriter
+from event_markers import MarkerChannel
+from nmea_parser import NmeaParser
+from gps_reader import GpsReader
+from gps_fix import FixAssembler
+from session_clock import SessionClock, PpsListener
+from status_dashboard import RecorderStats
+from perf_probes import PROFILER, probe
+
+from .config import load_config
+from .inputs import create_inputs
+from .pacing import FramePacer
+from .sinks import create_sinks
+from .startup import StartupTimer
+from .trigger import MotionTrigger
+
+# Imported by load_capture_modules()
+cv2 = None
+dai = None
+overlay = None
+
+GPS_SETTINGS = ('port', 'baudrate', 'target_baudrate', 'update_rate_hz', 'protocol')
+
+# ColorCamera sensor modes, smallest first: (name, width, height)
+SENSOR_RESOLUTIONS = (('THE_1080_P', 1920, 1080), ('THE_4_K', 3840, 2160))
+
+# camera3 preview while armed: scaled on-device so the motion check stays cheap
+WATCH_PREVIEW_SIZE = (160, 90)
+
+# Hot-path timing probes (see perf_probes.py); written to perf_<session>.json
+RGB_RECEIVE = probe('rgb.receive')
+RGB_FRAME = probe('rgb.getCvFrame')
+FRAME_TOTAL = probe('frame.total')
+OVERLAY_TEXT = probe('overlay.text')
+SKELETON_CONVERT = probe('skeleton.cvtColor')
+SKELETON_DETECT = probe('skeleton.detect')
+SKELETON_RECORD = probe('skeleton.record')
+SKELETON_LIFT = probe('skeleton.lift')
+SKELETON_SMOOTH = probe('skeleton.smooth')
+AHRS_UPDATE = probe('imu.ahrs')
+FRAME_IMU = probe('imu.frame_sync')
+TRIGGER_FRAME = probe('trigger.frame')
+OVERLAY_SKELETON = probe('overlay.skeleton')
+VIDEO_SUBMIT = probe('camera3.submit')
+IMU_RECEIVE = probe('imu.receive')
+IMU_PARSE = probe('imu.parse')
+DEPTH_RECEIVE = probe('depth.receive')
+GPS_PARSE = probe('gps.parse')
+GPS_FIX = probe('gps.fix')
+
+
+def sensor_mode(width, height):
+    """Smallest sensor mode covering an output size: (name, width, height)"""
+    for mode in SENSOR_RESOLUTIONS:
+        if width <= mode[1] and height <= mode[2]:
+            return mode
+    return SENSOR_RESOLUTIONS[-1]
+
+
+def isp_scale(sensor_size, size):
+    """Smallest ISP scale (numerator, denominator) whose output still covers size"""
+    needed = max(size[0] / sensor_size[0], size[1] / sensor_size[1])
+    if needed >= 1.0:
+        return 1, 1
+    best = (1, 1)
+    # The ISP takes numerators up to 16 and denominators up to 32
+    for denominator in range(1, 33):
+        numerator = math.ceil(needed * denominator - 1e-9)
+        if numerator <= 16 and numerator / denominator < best[0] / best[1]:
+            best = (numerator, denominator)
+    return best
+
+
+def load_capture_modules(startup=None, with_depthai=True):
+    """Import OpenCV and DepthAI on first use"""
+    global cv2, dai, overlay
+    if cv2 is None:
+        with startup.phase('import cv2') if startup else nullcontext():
+            import cv2
+            from . import overlay
+    if with_depthai and dai is None:
+        with startup.phase('import depthai') if startup else nullcontext():
+            import depthai as dai
+
+
+class MultiCameraRecorder:
+    def __init__(self, config=None):
+        self.startup = StartupTimer()
+        self.config = config or load_config()
+        PROFILER.enabled = self.config['profiling']['enabled']
+        self.name = self.config['name']
+        self.recording = False
+        self.stop_recording_event = threading.Event()
+        self.gps_stop_event = threading.Event()
+        self.exit_event = threading.Event()
+
+        # Inputs run on their own threads; start/stop must not interleave
+        self.control_lock = threading.RLock()
+
+        # Recording paths
+        self.recordings_dir = Path(self.config['recordings_dir'])
+        self.recordings_dir.mkdir(exist_ok=True)
+
+        # rpicam-vid processes by camera name
+        self.camera_processes = {}
+
+        # Thread handles
+        self.depthai_thread = None
+        self.gps_thread = None
+        self.trigger_thread = None
+
+        # Motion-triggered sessions (trigger.py), None unless armed
+        self.trigger = None
+        self.disarm_event = threading.Event()
+        # Session started by the trigger (stopped by it too); manual sessions are left alone
+        self.motion_session = None
+        # Clear while the armed watch pipeline holds the DepthAI device
+        self.watch_released = threading.Event()
+        self.watch_released.set()
+
+        # Session I/O (all file writes happen on writer threads)
+        self.session_writer = None
+        self.session_timestamp = None
+
+        # Output streams
+        self.imu_file = None
+        self.gyro_file = None
+        self.skeleton_file = None
+        self.frames_file = None
+        self.gps_file = None
+        self.clock_file = None
+        self.accel_file = None
+        self.orientation_file = None
+        self.depth_index = None
+        self.depth_stream = None
+        self.depth_count = 0
+        # Live AHRS (ahrs.py), None unless "ahrs" is enabled
+        self.orientation = None
+        # Per-frame interpolated IMU state (imu_sync.py)
+        self.frame_imu = None
+        # (device time, depth_frame, image) of the newest depth image, for lifting landmarks
+        self.latest_depth = None
+        self.depth_intrinsics = None
+        # Landmark filter (smoothing.py), None when records are saved raw
+        self.smoother = None
+
+        # Burn the timestamp/counter/skeleton into camera3, or keep them as metadata
+        self.burn_overlay = self.config['depthai']['overlay'] == 'burn'
+        self.info_overlay = None
+        # camera3 frame selection by device timestamp (see pacing.py)
+        self.pacer = None
+
+        # GPS sentence parser (checksum-validated, multi-GNSS)
+        gps_config = self.config['gps']
+        self.gps_enabled = gps_config['enabled']
+        self.nmea_parser = NmeaParser()
+        self.last_gps_print = 0.0
+
+        # GPS-disciplined clock; every stream is stamped in this timebase
+        self.clock = SessionClock(nmea_latency=gps_config['nmea_latency'])
+        self.pps_listener = None
+        if self.gps_enabled and gps_config['pps_pin'] is not None:
+            with self.startup.phase('pps'):
+                self.pps_listener = PpsListener(self.clock, gps_config['pps_pin'])
+                self.pps_listener.start()
+
+        # Skeleton recognition (model loaded in the background)
+        self.pose_detector = None
+        self.skeleton_enabled = self.config['skeleton']['enabled']
+
+        # Set once OpenCV, DepthAI and the pose model are loaded (or failed)
+        self.models_ready = threading.Event()
+
+        # Counters for the status dashboard
+        self.stats = RecorderStats()
+
+        # Event markers for the current session
+        self.markers = None
+
+        # Status sinks (LED, LCD) and control inputs (button, stdin, socket)
+        with self.startup.phase('sinks'):
+            self.sinks = create_sinks(self, self.config)
+        with self.startup.phase('inputs'):
+            self.inputs = create_inputs(self, self.config)
+
+        # GPS runs for the whole process so the clock is locked before recording starts
+        if self.gps_enabled:
+            self.start_gps_thread()
+
+        print(f"Multi-Camera Recording System Initialized ({self.name})")
+        self.startup.ready()
+
+        # Heavy modules and the pose model load off the startup path
+        self.preload_thread = threading.Thread(target=self.preload, name="preload")
+        self.preload_thread.daemon = True
+        self.preload_thread.start()
+
+        if self.config['trigger']['enabled']:
+            self.arm()
+
+    def preload(self):
+        """Load OpenCV, DepthAI and the pose model in the background"""
+        try:
+            load_capture_modules(self.startup, with_depthai=self.config['depthai']['enabled'])
+        except Exception as e:
+            print(f"Error loading capture modules: {e}")
+        if self.skeleton_enabled:
+            self.initialize_pose_detector()
+        self.models_ready.set()
+        print(self.startup.report())
+
+    def get_timestamp(self):
+        """Get current timestamp for filenames"""
+        return self.clock.datetime().strftime('%Y%m%d_%H%M%S')
+
+    def initialize_pose_detector(self):
+        """Initialize MediaPipe pose detector"""
+        try:
+            with self.startup.phase('import mediapipe'):
+                from .skeleton import PoseDetector
+            # Use lite model for better performance
+            with self.startup.phase('pose model'):
+                self.pose_detector = PoseDetector(self.config['skeleton']['model'])
+            print("Skeleton recognition initialized successfully")
+
+        except Exception as e:
+            print(f"Error initializing skeleton recognition: {e}")
+            self.skeleton_enabled = False
+
+    def notify(self, event, *args):
+        """Call one event handler on every sink"""
+        for sink in self.sinks:
+            try:
+                getattr(sink, event)(*args)
+            except Exception as e:
+                print(f"Sink {type(sink).__name__} {event} failed: {e}")
+
+    def parse_gps_data(self, gps_line, host_time=None):
+        """Parse GPS NMEA data and extract useful information"""
+        try:
+            return self.nmea_parser.parse(gps_line, host_time)
+        except Exception as e:
+            print(f"Error parsing GPS data: {e}")
+            return None
+
+    def start_gps_thread(self):
+        """Start the GPS reader thread (feeds the clock, and the GPS file while recording)"""
+        self.gps_stop_event.clear()
+        self.gps_thread = threading.Thread(target=self.gps_recording_thread, name="gps")
+        self.gps_thread.daemon = True
+        self.gps_thread.start()
+
+    def gps_recording_thread(self):
+        """Thread for GPS data recording"""
+        try:
+            # Open serial connection to GPS (applies baud / update rate settings)
+            gps_config = self.config['gps']
+            gps_reader = GpsReader(**{key: gps_config[key] for key in GPS_SETTINGS}).open()
+
+            # Merges GGA/RMC/VTG/GSA/GSV of one epoch into a single fix record
+            fix_assembler = FixAssembler()
+
+            while not self.gps_stop_event.is_set():
+                try:
+                    # Bulk-read GPS data; returns as soon as stop is requested
+                    for gps_line, host_time, host_monotonic in gps_reader.read_lines(self.gps_stop_event):
+                        start = time.perf_counter_ns()
+                        gps_data = self.parse_gps_data(gps_line, host_time)
+                        fix = fix_assembler.feed(gps_data, host_monotonic)
+                        GPS_PARSE.record(time.perf_counter_ns() - start)
+                        if fix:
+                            start = time.perf_counter_ns()
+                            self.record_gps_fix(fix)
+                            GPS_FIX.record(time.perf_counter_ns() - start)
+
+                except Exception as e:
+                    print(f"Error reading GPS data: {e}")
+                    self.gps_stop_event.wait(1)  # Wait before retrying
+
+            # Last epoch in progress
+            fix = fix_assembler.flush()
+            if fix:
+                self.record_gps_fix(fix)
+
+            gps_reader.close()
+            print("GPS recording stopped")
+            if gps_reader.bytes_discarded:
+                print(f"GPS reader discarded {gps_reader.bytes_discarded} bytes without a line end")
+            print(f"GPS parser stats: {self.nmea_parser.stats()}, fixes: {fix_assembler.fixes}")
+
+        except Exception as e:
+            print(f"Error in GPS recording thread: {e}")
+
+    def record_gps_fix(self, fix):
+        """Discipline the clock with one fused GPS fix, save it and print its status"""
+        clock_updated = self.clock.add_fix(fix)
+        self.stats.gps_fix = fix
+
+        gps_file = self.gps_file
+        if gps_file:
+            fix['utc_corrected'] = self.clock.from_monotonic(fix['host_monotonic'])
+            gps_file.write(fix)
+
+        clock_file = self.clock_file
+        if clock_file and clock_updated:
+            clock_file.write(self.clock.state())
+
+        # Print GPS status (optional, at most once per second)
+        if fix['host_monotonic'] - self.last_gps_print >= 1.0:
+            self.last_gps_print = fix['host_monotonic']
+            if fix['latitude'] is not None and fix['longitude'] is not None:
+                print(f"GPS: {fix['latitude']:.6f}, {fix['longitude']:.6f} "
+                      f"({fix['talker']}, {fix['satellites']} sats, HDOP {fix['hdop']})")
+            else:
+                print(f"GPS: no fix ({fix['satellites_in_view']} sats in view)")
+
+    def toggle_recording(self):
+        """Start recording if idle, stop it otherwise"""
+        with self.control_lock:
+            if not self.recording:
+                self.start_recording()
+            else:
+                self.stop_recording()
+
+    def on_button_single(self):
+        """Handle single press - toggle recording"""
+        print("Button pressed!")
+        self.toggle_recording()
+
+    def on_button_double(self):
+        """Handle double press - mark event"""
+        self.mark_event('button')
+
+    def on_button_long(self):
+        """Handle long press - stop recording"""
+        print("Button long press!")
+        with self.control_lock:
+            if self.recording:
+                self.stop_recording()
+
+    def start_recording(self):
+        """Start recording all cameras and IMU data"""
+        with self.control_lock:
+            if self.recording:
+                print("Already recording!")
+                return
+
+            print("Starting recording...")
+            self.recording = True
+
+            # Clear the stop event flag for new recording
+            self.stop_recording_event.clear()
+
+            # Get timestamp for this recording session
+            timestamp = self.get_timestamp()
+            self.stats.reset(timestamp)
+            self.notify('recording_changed', True)
+
+            # Start RPi cameras
+            for name, camera in self.config['cameras'].items():
+                if camera['enabled']:
+                    self.start_camera_recording(name, camera['command'], timestamp)
+
+            # Session streams, and camera 3 (DepthAI) and IMU
+            self.start_session(timestamp)
+
+            print(f"Recording started - Session: {timestamp}")
+
+    def stop_recording(self):
+        """Stop all recording"""
+        with self.control_lock:
+            if not self.recording:
+                print("Not recording!")
+                return
+
+            print("Stopping recording...")
+            self.recording = False
+            self.notify('recording_changed', False)
+
+            # Stop camera processes
+            self.stop_camera_processes()
+
+            # Stop DepthAI recording and close the session streams
+            self.stop_session()
+
+            print("Recording stopped")
+
+    def arm(self):
+        """Start and stop sessions on motion (see trigger.py); False if the trigger cannot run"""
+        with self.control_lock:
+            if self.trigger_thread and self.trigger_thread.is_alive():
+                print("Already armed")
+                return True
+            if not self.config['depthai']['enabled']:
+                print("Motion trigger needs the DepthAI camera; not arming")
+                return False
+            self.trigger = MotionTrigger(self.config['trigger'])
+            self.disarm_event.clear()
+            self.trigger_thread = threading.Thread(target=self.motion_trigger_thread, name="trigger")
+            self.trigger_thread.daemon = True
+            self.trigger_thread.start()
+            return True
+
+    def disarm(self):
+        """Stop watching for motion; a running session keeps recording"""
+        self.disarm_event.set()
+        if self.trigger_thread:
+            self.trigger_thread.join(timeout=10)
+            self.trigger_thread = None
+            print("Motion trigger disarmed")
+        self.trigger = None
+        self.motion_session = None
+
+    def motion_trigger_thread(self):
+        """Armed loop: watch while idle, start on motion, stop a motion session when quiet"""
+        trigger = self.trigger
+        # The watch pipeline needs DepthAI
+        self.models_ready.wait()
+        print("Motion trigger armed")
+        while not self.disarm_event.is_set():
+            if self.recording:
+                if self.motion_session is not None and self.motion_session == self.session_timestamp:
+                    if trigger.update(time.monotonic()) == 'stop':
+                        print(f"Motion trigger: quiet for {trigger.stop_hold:g} s, stopping")
+                        with self.control_lock:
+                            if self.recording and self.motion_session == self.session_timestamp:
+                                self.stop_recording()
+                self.disarm_event.wait(0.1)
+                continue
+
+            self.motion_session = None
+            if self.watch_for_motion():
+                with self.control_lock:
+                    if not self.recording and not self.disarm_event.is_set():
+                        self.start_recording()
+                        self.motion_session = self.session_timestamp
+                        self.mark_event('trigger', 'motion')
+
+    def watch_for_motion(self):
+        """Run the low-rate watch pipeline until motion (True), recording or disarm (False)"""
+        trigger = self.trigger
+        trigger.reset()
+        self.watch_released.clear()
+        try:
+            load_capture_modules()
+            pipeline = self.create_watch_pipeline()
+            with dai.Device(pipeline) as device:
+                qRgb = device.getOutputQueue(name="rgb", maxSize=2, blocking=False)
+                qImu = None
+                if self.config['depthai']['imu']:
+                    qImu = device.getOutputQueue(name="imu", maxSize=10, blocking=False)
+                print(f"Armed: watching for motion ({trigger.status(time.monotonic())})")
+
+                while not self.disarm_event.is_set() and not self.recording:
+                    inRgb = qRgb.tryGet()
+                    inImu = qImu.tryGet() if qImu is not None else None
+                    now = time.monotonic()
+                    if inRgb is not None:
+                        trigger.add_frame(inRgb.getCvFrame(), now)
+                    if inImu is not None:
+                        for imuPacket in inImu.packets:
+                            if hasattr(imuPacket, 'acceleroMeter'):
+                                accValues = imuPacket.acceleroMeter
+                                trigger.add_accel(accValues.x, accValues.y, accValues.z)
+                        trigger.end_batch(now)
+                    if trigger.update(now) == 'start':
+                        print(f"Motion trigger: {trigger.status(now)}, starting")
+                        return True
+                    if inRgb is None and inImu is None:
+                        # A few messages per second; sleep rather than poll
+                        time.sleep(0.02)
+        except Exception as e:
+            print(f"Error in motion watch: {e}")
+            # Device busy or unplugged; try again shortly
+            self.disarm_event.wait(5)
+        finally:
+            self.watch_released.set()
+        return False
+
+    def start_camera_recording(self, name, command, timestamp):
+        """Start one rpicam-vid recording"""
+        filename = f"{name}_{timestamp}.h264"
+        filepath = self.recordings_dir / filename
+        cmd = command.format(path=filepath)
+
+        try:
+            print(f"Starting {name} with command: {cmd}")
+
+            process = subprocess.Popen(
+                cmd,
+                shell=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+
+            # Check if process started successfully
+            if process.poll() is None:
+                self.camera_processes[name] = process
+                print(f"{name} recording started successfully: {filename}")
+            else:
+                stdout, stderr = process.communicate()
+                print(f"{name} failed to start. stdout: {stdout.decode()}")
+                print(f"{name} failed to start. stderr: {stderr.decode()}")
+
+        except Exception as e:
+            print(f"Error starting {name}: {e}")
+
+    def stop_camera_processes(self):
+        """Stop RPi camera recording processes"""
+        for name, process in self.camera_processes.items():
+            process.terminate()
+            process.wait()
+            print(f"{name} stopped")
+        self.camera_processes = {}
+
+    def start_session(self, timestamp):
+        """Open the session streams and start the DepthAI thread"""
+        depthai_config = self.config['depthai']
+        self.open_session_streams(
+            timestamp,
+            imu=depthai_config['enabled'] and depthai_config['imu'],
+            gps=self.gps_enabled,
+        )
+
+        if depthai_config['enabled']:
+            # The armed watch pipeline lets go of the device once recording is set
+            if not self.watch_released.wait(timeout=10):
+                print("Motion watch did not release the DepthAI device")
+            self.depthai_thread = threading.Thread(
+                target=self.depthai_recording_thread,
+                args=(timestamp,),
+                name="depthai",
+            )
+            self.depthai_thread.daemon = True
+            self.depthai_thread.start()
+
+        print(f"Session streams open: {timestamp} (clock source: {self.clock.source})")
+        print(f"Skeleton recognition {'enabled' if self.skeleton_enabled else 'disabled'}")
+
+    def open_session_streams(self, timestamp, imu, gps):
+        """Session writer with the IMU, skeleton, GPS/clock and marker streams"""
+        io_config = self.config['io']
+        self.session_writer = SessionWriter(
+            self.recordings_dir,
+            flush_interval=io_config['flush_interval'],
+            fsync_interval=io_config['fsync_interval'],
+        )
+        self.stats.session_writer = self.session_writer
+        self.session_timestamp = timestamp
+        PROFILER.reset()
+
+        if imu:
+            self.imu_file = self.session_writer.open_json_stream('imu_vector', f"imu_vector_{timestamp}.json")
+            self.gyro_file = self.session_writer.open_json_stream('gyroscope', f"gyroscope_{timestamp}.json")
+            # Accelerometer kept with or without live fusion, so sessions can be fused offline (ahrs.py)
+            self.accel_file = self.session_writer.open_json_stream('accelerometer', f"accelerometer_{timestamp}.json")
+            ahrs_config = self.config['ahrs']
+            if ahrs_config['enabled']:
+                from .ahrs import OrientationFilter
+                self.orientation = OrientationFilter(ahrs_config['method'], ahrs_config['params'])
+                self.orientation_file = self.session_writer.open_json_stream(
+                    'orientation', f"orientation_{timestamp}.json")
+        if self.skeleton_enabled:
+            self.skeleton_file = self.session_writer.open_json_stream('skeleton', f"skeleton_{timestamp}.json")
+            # Fresh filter state per session
+            skeleton_config = self.config['skeleton']
+            if skeleton_config['smoothing'] != 'none':
+                from .smoothing import LandmarkSmoother
+                self.smoother = LandmarkSmoother(skeleton_config['smoothing'], skeleton_config['smoothing_params'])
+        if gps:
+            self.gps_file = self.session_writer.open_json_stream('gps', f"gps_{timestamp}.json")
+            self.clock_file = self.session_writer.open_json_stream('clock', f"clock_{timestamp}.json")
+            # Offset model at session start (updated on every GPS fix while recording)
+            self.clock_file.write(self.clock.state())
+
+        # Marker stream, indexed against camera3 frames
+        self.markers = MarkerChannel(
+            self.session_writer.open_json_stream('markers', f"markers_{timestamp}.json"),
+            self.recordings_dir / f"markers_index_{timestamp}.json",
+            now_fn=self.clock.now,
+            frame_index_fn=lambda: self.stats.frames_written,
+        )
+
+    def create_pipeline(self):
+        """DepthAI pipeline: color preview and IMU"""
+        depthai_config = self.config['depthai']
+        pipeline = dai.Pipeline()
+
+        # Define sources and outputs
+        camRgb = pipeline.create(dai.node.ColorCamera)
+        xlinkOut = pipeline.create(dai.node.XLinkOut)
+        xlinkOut.setStreamName("rgb")
+
+        # Camera properties: the sensor runs at the rate we record and the ISP
+        # scales down on-device, so only frames we keep cross XLink
+        size = (depthai_config['width'], depthai_config['height'])
+        resolution, sensor_width, sensor_height = sensor_mode(*size)
+        camera_fps = float(depthai_config['camera_fps'] or depthai_config['fps'])
+        camRgb.setPreviewSize(*size)
+        camRgb.setBoardSocket(dai.CameraBoardSocket.CAM_A)
+        camRgb.setResolution(getattr(dai.ColorCameraProperties.SensorResolution, resolution))
+        numerator, denominator = isp_scale((sensor_width, sensor_height), size)
+        if numerator != denominator:
+            camRgb.setIspScale(numerator, denominator)
+        camRgb.setFps(camera_fps)
+        print(f"camera3 sensor {resolution} at {camera_fps:g} FPS, ISP scale {numerator}/{denominator}")
+        camRgb.setInterleaved(False)
+        camRgb.setColorOrder(dai.ColorCameraProperties.ColorOrder.BGR)
+        camRgb.preview.link(xlinkOut.input)
+
+        if depthai_config['imu']:
+            imu = pipeline.create(dai.node.IMU)
+            imuXlinkOut = pipeline.create(dai.node.XLinkOut)
+            imuXlinkOut.setStreamName("imu")
+
+            # IMU properties
+            imu.enableIMUSensor(dai.IMUSensor.ACCELEROMETER_RAW, 500)
+            imu.enableIMUSensor(dai.IMUSensor.GYROSCOPE_RAW, 400)
+            if depthai_config['rotation_vector']:
+                # BNO086 only; turn off for BMI270 devices and use the AHRS instead
+                imu.enableIMUSensor(dai.IMUSensor.ROTATION_VECTOR, 400)
+            imu.setBatchReportThreshold(1)
+            imu.setMaxBatchReports(10)
+            imu.out.link(imuXlinkOut.input)
+
+        depth_config = self.config['depth']
+        if depth_config['enabled']:
+            # Mono pair -> StereoDepth, reprojected onto the RGB camera on-device
+            monoLeft = pipeline.create(dai.node.MonoCamera)
+            monoRight = pipeline.create(dai.node.MonoCamera)
+            stereo = pipeline.create(dai.node.StereoDepth)
+            depthXlinkOut = pipeline.create(dai.node.XLinkOut)
+            depthXlinkOut.setStreamName("depth")
+
+            for mono, socket in ((monoLeft, dai.CameraBoardSocket.CAM_B), (monoRight, dai.CameraBoardSocket.CAM_C)):
+                mono.setResolution(dai.MonoCameraProperties.SensorResolution.THE_400_P)
+                mono.setBoardSocket(socket)
+                mono.setFps(float(depth_config['fps']))
+
+            stereo.setDefaultProfilePreset(dai.node.StereoDepth.PresetMode.HIGH_DENSITY)
+            stereo.setLeftRightCheck(True)
+            stereo.setDepthAlign(dai.CameraBoardSocket.CAM_A)
+            stereo.setOutputSize(depth_config['width'], depth_config['height'])
+            monoLeft.out.link(stereo.left)
+            monoRight.out.link(stereo.right)
+            stereo.depth.link(depthXlinkOut.input)
+
+        return pipeline
+
+    def create_watch_pipeline(self):
+        """DepthAI pipeline while armed: tiny low-rate preview and batched accelerometer"""
+        trigger_config = self.config['trigger']
+        pipeline = dai.Pipeline()
+
+        camRgb = pipeline.create(dai.node.ColorCamera)
+        xlinkOut = pipeline.create(dai.node.XLinkOut)
+        xlinkOut.setStreamName("rgb")
+        resolution, sensor_width, sensor_height = SENSOR_RESOLUTIONS[0]
+        camRgb.setBoardSocket(dai.CameraBoardSocket.CAM_A)
+        camRgb.setResolution(getattr(dai.ColorCameraProperties.SensorResolution, resolution))
+        camRgb.setIspScale(*isp_scale((sensor_width, sensor_height), WATCH_PREVIEW_SIZE))
+        camRgb.setPreviewSize(*WATCH_PREVIEW_SIZE)
+        camRgb.setFps(float(trigger_config['watch_fps']))
+        camRgb.setInterleaved(False)
+        camRgb.setColorOrder(dai.ColorCameraProperties.ColorOrder.BGR)
+        camRgb.preview.link(xlinkOut.input)
+
+        if self.config['depthai']['imu']:
+            imu = pipeline.create(dai.node.IMU)
+            imuXlinkOut = pipeline.create(dai.node.XLinkOut)
+            imuXlinkOut.setStreamName("imu")
+            rate = int(trigger_config['watch_imu_rate'])
+            imu.enableIMUSensor(dai.IMUSensor.ACCELEROMETER_RAW, rate)
+            # About ten messages per second: the variance only needs batch sums
+            imu.setBatchReportThreshold(max(1, rate // 10))
+            imu.setMaxBatchReports(max(10, rate // 5))
+            imu.out.link(imuXlinkOut.input)
+
+        return pipeline
+
+    def open_camera3_writer(self, timestamp, size, fps, block=False):
+        """camera3 video file as a session stream (None if the writer fails); block: never drop frames"""
+        depthai_config = self.config['depthai']
+        video_filename = f"camera3_{timestamp}.{depthai_config['extension']}"
+        video_filepath = self.recordings_dir / video_filename
+        fourcc = cv2.VideoWriter_fourcc(*depthai_config['codec'])
+        out = cv2.VideoWriter(str(video_filepath), fourcc, fps, size)
+
+        if not out.isOpened():
+            print("Error: Could not initialize video writer")
+            return None
+
+        print(f"camera3 video recording: {video_filename} at {fps:g} FPS")
+
+        # Raw video: overlay data goes to a per-frame metadata stream instead
+        if self.burn_overlay:
+            self.info_overlay = overlay.InfoOverlay()
+        else:
+            self.frames_file = self.session_writer.open_json_stream('frames', f"frames_{timestamp}.json")
+
+        # Frames are encoded on the writer's video lane, not here
+        return self.session_writer.open_video_stream('camera3', out, block=block)
+
+    def open_depth_streams(self, timestamp, device):
+        """Depth PNG sequence and its index, starting with the RGB-aligned intrinsics"""
+        from .depth import DepthImageWriter
+        depth_config = self.config['depth']
+        size = (depth_config['width'], depth_config['height'])
+        writer = DepthImageWriter(self.recordings_dir / f"depth_{timestamp}", depth_config['png_compression'])
+        # Own lane and a short buffer: depth is dropped before it can delay camera3
+        self.depth_stream = self.session_writer.open_video_stream(
+            'depth', writer, max_buffered=depth_config['max_buffered'], lane='depth')
+        self.depth_index = self.session_writer.open_json_stream('depth_index', f"depth_{timestamp}.json")
+        self.depth_count = 0
+
+        record = {'intrinsics': None, 'width': size[0], 'height': size[1], 'units': 'mm'}
+        try:
+            calibration = device.readCalibration()
+            record['intrinsics'] = calibration.getCameraIntrinsics(dai.CameraBoardSocket.CAM_A, *size)
+        except Exception as e:
+            print(f"Could not read camera intrinsics: {e}")
+        self.depth_index.write(record)
+        self.depth_intrinsics = record['intrinsics']
+        self.latest_depth = None
+        print(f"Depth recording: depth_{timestamp}/ at {depth_config['fps']:g} FPS, {size[0]}x{size[1]}")
+
+    def record_depth(self, inDepth, frame_count):
+        """Queue one depth image; indexed against the latest camera3 frame"""
+        depth = inDepth.getFrame()
+        device_time = inDepth.getTimestamp().total_seconds()
+        if not self.depth_stream.write(depth):
+            PROFILER.count('depth.dropped')
+            return
+        self.depth_index.write({
+            'depth_frame': self.depth_count,
+            'timestamp': self.clock.now(),
+            'device_time': device_time,
+            'rgb_frame': frame_count - 1,
+        })
+        self.latest_depth = (device_time, self.depth_count, depth)
+        self.depth_count += 1
+
+    def depth_for_frame(self, device_time):
+        """Newest depth image if it was taken within one depth interval of the frame"""
+        latest = self.latest_depth
+        if latest is None or device_time is None or self.depth_intrinsics is None:
+            return None
+        if abs(device_time - latest[0]) > 1.0 / self.config['depth']['fps']:
+            return None
+        return latest
+
+    def depthai_recording_thread(self, timestamp):
+        """Thread for DepthAI camera and IMU recording"""
+        depthai_config = self.config['depthai']
+        try:
+            # No-op once the background preload is done
+            load_capture_modules()
+            pipeline = self.create_pipeline()
+
+            # Connect to device
+            with dai.Device(pipeline) as device:
+                print("DepthAI device connected successfully!")
+
+                # Output queues
+                qRgb = device.getOutputQueue(name="rgb", maxSize=4, blocking=False)
+                qImu = None
+                if depthai_config['imu']:
+                    qImu = device.getOutputQueue(name="imu", maxSize=50, blocking=False)
+                qDepth = None
+                if self.config['depth']['enabled']:
+                    qDepth = device.getOutputQueue(name="depth", maxSize=2, blocking=False)
+
+                fps = float(depthai_config['fps'])
+                video_stream = self.open_camera3_writer(
+                    timestamp, (depthai_config['width'], depthai_config['height']), fps)
+                if video_stream is None:
+                    return
+                if qDepth is not None:
+                    self.open_depth_streams(timestamp, device)
+                if qImu is not None and depthai_config['frame_imu']:
+                    self.open_frame_imu(timestamp)
+
+                # Frames are placed by device timestamp, not by when the host got to them
+                pacer = self.pacer = FramePacer(fps, depthai_config['pacing'])
+                frame_count = 0
+                last_frame = None
+
+                perf_counter_ns = time.perf_counter_ns
+                while not self.stop_recording_event.is_set():
+                    start = perf_counter_ns()
+                    inRgb = qRgb.tryGet()
+                    if inRgb is not None:
+                        RGB_RECEIVE.record(perf_counter_ns() - start)
+
+                    start = perf_counter_ns()
+                    inImu = qImu.tryGet() if qImu is not None else None
+                    if inImu is not None:
+                        IMU_RECEIVE.record(perf_counter_ns() - start)
+
+                    if inRgb is not None:
+                        start = perf_counter_ns()
+                        frame = inRgb.getCvFrame()
+                        RGB_FRAME.record(perf_counter_ns() - start)
+                        PROFILER.count('rgb.bytes', frame.nbytes)
+                        self.stats.frame_received(inRgb.getSequenceNum())
+
+                        trigger = self.trigger
+                        if trigger and trigger.wants_frame(time.monotonic()):
+                            # Before process_frame, which may draw into the frame
+                            start = perf_counter_ns()
+                            trigger.add_frame(frame, time.monotonic())
+                            TRIGGER_FRAME.record(perf_counter_ns() - start)
+
+                        device_time = inRgb.getTimestamp().total_seconds()
+                        repeat, keep = pacer.submit(device_time)
+                        if repeat and last_frame is not None:
+                            # Grid slots with no frame hold the previous one
+                            self.write_duplicates(last_frame, frame_count, repeat, fps, video_stream)
+                            frame_count += repeat
+                            PROFILER.count('rgb.duplicated', repeat)
+                        if keep and video_stream.full():
+                            # Writer behind: drop before any metadata is written, so frame
+                            # indices stay video frame numbers; CFR repeats the previous frame
+                            video_stream.drop()
+                            PROFILER.count('camera3.dropped')
+                            pacer.discard()
+                            if pacer.mode == 'cfr' and last_frame is not None:
+                                self.write_duplicates(last_frame, frame_count, 1, fps, video_stream)
+                                frame_count += 1
+                        elif keep:
+                            frame_count += 1
+                            start = perf_counter_ns()
+                            written = self.process_frame(frame, frame_count, fps, video_stream, device_time)
+                            FRAME_TOTAL.record(perf_counter_ns() - start)
+                            if written is not None:
+                                last_frame = written
+                                self.stats.frame_written()
+                        else:
+                            PROFILER.count('rgb.paced_out')
+
+                    if inImu is not None:
+                        start = perf_counter_ns()
+                        self.record_imu_packets(inImu.packets)
+                        IMU_PARSE.record(perf_counter_ns() - start)
+
+                    inDepth = qDepth.tryGet() if qDepth is not None else None
+                    if inDepth is not None:
+                        start = perf_counter_ns()
+                        self.record_depth(inDepth, frame_count)
+                        DEPTH_RECEIVE.record(perf_counter_ns() - start)
+
+                    if inRgb is None and inImu is None and inDepth is None:
+                        # Nothing queued; don't spin on tryGet
+                        time.sleep(0.002)
+
+                # Cleanup (drains queued frames, then releases the writer)
+                self.close_frame_imu()
+                self.session_writer.close_stream('camera3')
+                if qDepth is not None:
+                    self.session_writer.close_stream('depth')
+                self.finish_pacing(timestamp)
+
+        except Exception as e:
+            print(f"Error in DepthAI recording thread: {e}")
+
+    def open_frame_imu(self, timestamp):
+        """frame_imu_<session>.json, fed by process_frame and record_imu_packets"""
+        from .imu_sync import FrameImuAssociator
+        self.frame_imu = FrameImuAssociator(
+            self.session_writer.open_json_stream('frame_imu', f"frame_imu_{timestamp}.json"))
+
+    def close_frame_imu(self):
+        """Write the frames still waiting for IMU samples"""
+        if self.frame_imu:
+            self.frame_imu.close()
+            print(f"Frame/IMU association: {self.frame_imu.written} frames")
+
+    def write_duplicates(self, frame, frame_count, repeat, fps, video_stream):
+        """Write the previous frame again for `repeat` empty grid slots (CFR pacing)"""
+        for n in range(repeat):
+            if self.frames_file:
+                self.frames_file.write({'frame': frame_count + n, 'timestamp': self.last_frame_timestamp,
+                                        'fps': fps, 'duplicate': True})
+            if self.frame_imu and self.last_frame_device_time is not None:
+                # Same image, so the same IMU state
+                self.frame_imu.add_frame(frame_count + n, self.last_frame_device_time, self.last_frame_timestamp)
+            self.stats.frame_written()
+        # One queue item the writer expands, so a long gap can't overflow the buffer
+        video_stream.write_repeat(frame, repeat)
+
+    def finish_pacing(self, timestamp):
+        """Print target vs effective FPS; write the VFR timecodes"""
+        pacer = self.pacer
+        summary = pacer.summary()
+        print(f"camera3 pacing ({summary['mode']}): {summary['effective_fps']:.2f} FPS effective, "
+              f"target {summary['target_fps']:g}; {summary['duplicated']} duplicated, "
+              f"{summary['dropped']} dropped of {summary['received']}")
+        if pacer.mode == 'vfr':
+            try:
+                pacer.write_timecodes(self.recordings_dir / f"timecodes_{timestamp}.txt")
+            except Exception as e:
+                print(f"Error writing timecodes: {e}")
+
+    def process_frame(self, frame, frame_count, fps, video_stream, device_time=None):
+        """Overlay, skeleton detection and write of one camera3 frame
+
+        Returns the written frame, or None if the video buffer was full (the
+        recording thread checks for room first, so only other callers see that).
+        """
+        perf_counter_ns = time.perf_counter_ns
+        timestamp = self.last_frame_timestamp = self.clock.now()
+        self.last_frame_device_time = device_time
+        # Position of this frame in the video
+        index = frame_count - 1
+
+        if self.frame_imu and device_time is not None:
+            self.frame_imu.add_frame(index, device_time, timestamp)
+
+        if self.burn_overlay:
+            # Add timestamp and frame counter
+            start = perf_counter_ns()
+            self.info_overlay.draw(frame, timestamp, frame_count, fps)
+            OVERLAY_TEXT.record(perf_counter_ns() - start)
+        elif self.frames_file:
+            record = {'frame': index, 'timestamp': timestamp, 'fps': fps}
+            if device_time is not None:
+                record['device_time'] = device_time
+            self.frames_file.write(record)
+
+        if self.skeleton_enabled and self.pose_detector:
+            skeleton_config = self.config['skeleton']
+            try:
+                # Convert BGR to RGB for MediaPipe
+                start = perf_counter_ns()
+                mp_image = self.pose_detector.prepare(frame)
+                SKELETON_CONVERT.record(perf_counter_ns() - start)
+
+                # Detect pose landmarks
+                start = perf_counter_ns()
+                detection_result = self.pose_detector.detect_image(mp_image)
+                elapsed = perf_counter_ns() - start
+                SKELETON_DETECT.record(elapsed)
+                self.stats.inference_done(elapsed / 1e9)
+
+                # Temporal smoothing of the landmark arrays
+                landmarks = None
+                if detection_result.pose_landmarks and self.smoother:
+                    from .skeleton import landmark_array
+                    start = perf_counter_ns()
+                    landmarks = self.smoother.smooth(landmark_array(detection_result),
+                                                     timestamp if device_time is None else device_time)
+                    SKELETON_SMOOTH.record(perf_counter_ns() - start)
+
+                # Metric 3D joints from the matching depth image
+                points_3d = None
+                depth = None
+                if detection_result.pose_landmarks and skeleton_config['depth_lift']:
+                    depth = self.depth_for_frame(device_time)
+                if depth is not None:
+                    from .depth import lift_points
+                    from .skeleton import landmark_array
+                    start = perf_counter_ns()
+                    points = (landmarks if landmarks is not None else landmark_array(detection_result))[..., :2]
+                    points_3d = lift_points(points, depth[2], self.depth_intrinsics, skeleton_config['depth_window'])
+                    SKELETON_LIFT.record(perf_counter_ns() - start)
+
+                # Save skeleton data
+                start = perf_counter_ns()
+                if detection_result.pose_landmarks and self.skeleton_file:
+                    for record in self.pose_detector.records(detection_result, timestamp, index,
+                                                             skeleton_config['world_landmarks'], points_3d,
+                                                             landmarks):
+                        if landmarks is not None:
+                            record['smoothing'] = self.smoother.method
+                        if depth is not None:
+                            record['depth_frame'] = depth[1]
+                        self.skeleton_file.write(record)
+                SKELETON_RECORD.record(perf_counter_ns() - start)
+
+                # Frame with skeleton overlay
+                if self.burn_overlay:
+                    start = perf_counter_ns()
+                    frame = self.pose_detector.draw(frame, detection_result)
+                    OVERLAY_SKELETON.record(perf_counter_ns() - start)
+
+            except Exception as e:
+                print(f"Error in skeleton processing: {e}")
+                # Fallback to original frame
+
+        start = perf_counter_ns()
+        written = video_stream.write(frame)
+        VIDEO_SUBMIT.record(perf_counter_ns() - start)
+        if not written:
+            PROFILER.count('camera3.dropped')
+            return None
+        return frame
+
+    def record_imu_packets(self, imuPackets):
+        """Write gyroscope, accelerometer and rotation vector samples of one IMU message"""
+        # Same device clock as camera3 frames (synced to the host), so frames and samples line up
+        frame_imu = self.frame_imu
+        trigger = self.trigger
+        # Real packets always carry a rotationVector field; it is zeros unless the sensor is enabled
+        rotation_vector = self.config['depthai']['rotation_vector']
+        for imuPacket in imuPackets:
+            # Get gyroscope data
+            if hasattr(imuPacket, 'gyroscope'):
+                gyroValues = imuPacket.gyroscope
+                gyro_time = gyroValues.getTimestamp().total_seconds()
+                self.gyro_file.write({
+                    'x': gyroValues.x,
+                    'y': gyroValues.y,
+                    'z': gyroValues.z,
+                    'timestamp': self.clock.now(),
+                    'device_time': gyro_time
+                })
+                if frame_imu:
+                    frame_imu.add_sample('gyroscope', gyro_time, (gyroValues.x, gyroValues.y, gyroValues.z))
+
+            if hasattr(imuPacket, 'acceleroMeter'):
+                accValues = imuPacket.acceleroMeter
+                acc_time = accValues.getTimestamp().total_seconds()
+                self.accel_file.write({
+                    'x': accValues.x,
+                    'y': accValues.y,
+                    'z': accValues.z,
+                    'timestamp': self.clock.now(),
+                    'device_time': acc_time
+                })
+                if frame_imu:
+                    frame_imu.add_sample('accelerometer', acc_time, (accValues.x, accValues.y, accValues.z))
+                if trigger:
+                    trigger.add_accel(accValues.x, accValues.y, accValues.z)
+
+                # Orientation at the gyroscope rate from gyro + latest accelerometer sample
+                if self.orientation and hasattr(imuPacket, 'gyroscope'):
+                    start = time.perf_counter_ns()
+                    w, x, y, z = self.orientation.update((gyroValues.x, gyroValues.y, gyroValues.z),
+                                                         (accValues.x, accValues.y, accValues.z), gyro_time)
+                    AHRS_UPDATE.record(time.perf_counter_ns() - start)
+                    self.orientation_file.write({'w': w, 'x': x, 'y': y, 'z': z, 'device_time': gyro_time})
+                    if frame_imu:
+                        frame_imu.add_sample('orientation', gyro_time, (w, x, y, z))
+
+            # Get rotation vector data
+            if rotation_vector and hasattr(imuPacket, 'rotationVector'):
+                rvValues = imuPacket.rotationVector
+                rv_time = rvValues.getTimestamp().total_seconds()
+                self.imu_file.write({
+                    'i': rvValues.i,
+                    'j': rvValues.j,
+                    'k': rvValues.k,
+                    'real': rvValues.real,
+                    'accuracy': float(rvValues.accuracy),
+                    'timestamp': self.clock.now(),
+                    'device_time': rv_time
+                })
+                if frame_imu:
+                    frame_imu.add_sample('rotation_vector', rv_time,
+                                         (rvValues.i, rvValues.j, rvValues.k, rvValues.real))
+
+        if trigger:
+            trigger.end_batch(time.monotonic())
+
+        # Frames the new samples have caught up with
+        if frame_imu:
+            start = time.perf_counter_ns()
+            frame_imu.flush()
+            FRAME_IMU.record(time.perf_counter_ns() - start)
+
+    def stop_session(self):
+        """Stop DepthAI recording and close every session stream"""
+        self.stop_recording_event.set()
+
+        if self.depthai_thread:
+            self.depthai_thread.join(timeout=5)
+            self.depthai_thread = None
+
+        # Offset model at session end
+        if self.clock_file:
+            self.clock_file.write(self.clock.state())
+
+        # Marker index for the session
+        if self.markers:
+            markers, self.markers = self.markers, None
+            try:
+                markers.close()
+            except Exception as e:
+                print(f"Error writing marker index: {e}")
+
+        # Final drain and close of every session stream
+        io_metrics = None
+        if self.session_writer:
+            io_metrics = self.session_writer.close()
+            self.session_writer = None
+            self.print_io_metrics(io_metrics)
+
+        if PROFILER.enabled:
+            self.write_perf_report(io_metrics)
+
+        self.imu_file = None
+        self.gyro_file = None
+        self.skeleton_file = None
+        self.frames_file = None
+        self.gps_file = None
+        self.clock_file = None
+        self.accel_file = None
+        self.orientation_file = None
+        self.orientation = None
+        self.frame_imu = None
+        self.depth_index = None
+        self.depth_stream = None
+        self.latest_depth = None
+        self.smoother = None
+
+        print("Session streams closed")
+
+    def perf_report(self, io_metrics=None):
+        """Probe percentiles, frame and I/O drops and startup phases"""
+        report = PROFILER.report()
+        report.update({
+            'session': self.stats.session,
+            'duration_s': time.monotonic() - self.stats.session_start,
+            'frames': {
+                'received': self.stats.frames_received,
+                'written': self.stats.frames_written,
+                'dropped': self.stats.frames_dropped,
+            },
+            'startup': self.startup.as_dict(),
+        })
+        if self.pacer is not None:
+            report['pacing'] = self.pacer.summary()
+        writer = self.session_writer
+        if io_metrics is None and writer is not None:
+            io_metrics = writer.metrics()
+        if io_metrics:
+            report['io_dropped'] = {name: stream['dropped'] for name, stream in io_metrics['streams'].items()}
+        return report
+
+    def write_perf_report(self, io_metrics):
+        """Write perf_<session>.json and print the probe table"""
+        report = self.perf_report(io_metrics)
+        try:
+            with open(self.recordings_dir / f"perf_{self.session_timestamp}.json", 'w') as f:
+                json.dump(report, f, indent=2)
+        except Exception as e:
+            print(f"Error writing performance report: {e}")
+        if self.config['profiling']['print_report']:
+            print(PROFILER.format_report(report))
+
+    def print_io_metrics(self, io_metrics):
+        """Print buffer drops and write latency for the finished session"""
+        if not io_metrics:
+            return
+        for name, stream in io_metrics['streams'].items():
+            failed = f", {stream['failed']} unserializable" if stream['failed'] else ""
+            print(f"I/O {name}: {stream['records_written']} written, {stream['dropped']} dropped{failed}, "
+                  f"peak buffer {stream['peak_buffered']}/{stream['max_buffered']}")
+        for name, lane in io_metrics['lanes'].items():
+            print(f"I/O lane {name}: avg {lane['avg_latency_ms']:.1f} ms, max {lane['max_latency_ms']:.1f} ms per write")
+
+    def mark_event(self, source, label=None):
+        """Add a timestamped marker to the current session"""
+        markers = self.markers
+        if markers is None:
+            print("Not recording - marker ignored")
+            return None
+        marker = markers.mark(source, label)
+        self.notify('marker', marker)
+        return marker
+
+    def handle_control_command(self, command, argument):
+        """Handle a command from the local control socket"""
+        if command == 'mark':
+            marker = self.mark_event('socket', argument)
+            return f"ok marker {marker['index']}" if marker else "error not recording"
+        if command == 'start':
+            self.start_recording()
+            return "ok"
+        if command == 'stop':
+            self.stop_recording()
+            return "ok"
+        if command == 'arm':
+            return "ok" if self.arm() else "error cannot arm"
+        if command == 'disarm':
+            self.disarm()
+            return "ok"
+        if command == 'perf':
+            # Live snapshot of the current session, one JSON line
+            return json.dumps(self.perf_report())
+        return f"error unknown command '{command}'"
+
+    def cleanup(self):
+        """Cleanup resources"""
+        self.disarm()
+        if self.recording:
+            self.stop_recording()
+
+        for control_input in self.inputs:
+            control_input.stop()
+        self.notify('stop')
+
+        # Stop GPS reader and PPS listener
+        self.gps_stop_event.set()
+        if self.gps_thread:
+            self.gps_thread.join(timeout=5)
+        if self.pps_listener:
+            self.pps_listener.stop()
+
+        print("Cleanup completed")
+
+    def run(self):
+        """Main run loop; inputs drive the recorder from their own threads"""
+        try:
+            print(f"Multi-Camera Recording System Ready ({self.name})")
+            print("Press Ctrl+C to exit")
+            self.exit_event.wait()
+
+        except KeyboardInterrupt:
+            print("\nShutting down...")
+        self.cleanup()
+        sys.exit(0)
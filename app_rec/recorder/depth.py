@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Depth stream
+StereoDepth frames from the OAK's mono pair, aligned to camera3 (RGB) on
+the device, stored as lossless 16-bit PNGs (depth in millimetres, 0 = no
+measurement):
+
+    recordings/depth_<session>/000000.png, 000001.png, ...
+    recordings/depth_<session>.json   intrinsics record, then one record per
+                                      image: depth_frame, timestamp,
+                                      device_time, rgb_frame
+
+Depth is a side stream with its own budget: it runs at a lower rate than
+RGB ("depth": {"fps": 5}) and is compressed on its own writer lane with a
+short buffer, so when the Pi cannot keep up depth images are dropped (and
+counted) while camera3 keeps its rate.
+
+lift_points() turns skeleton landmarks into metric 3D joints from a depth
+image (used live by the recorder and offline by batch_skeleton.py).
+"""
+
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# PNG zlib level; 1 is several times faster than the default and close in size
+PNG_COMPRESSION = 1
+
+# Share of a landmark's neighbourhood that must have depth for a 3D point
+MIN_VALID_FRACTION = 0.25
+
+
+class DepthImageWriter:
+    """Numbered 16-bit PNG sequence with the write/release interface of cv2.VideoWriter"""
+
+    def __init__(self, directory, compression=PNG_COMPRESSION):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.params = [cv2.IMWRITE_PNG_COMPRESSION, compression]
+        self.count = 0
+
+    def write(self, frame):
+        cv2.imwrite(str(self.directory / f"{self.count:06d}.png"), frame, self.params)
+        self.count += 1
+
+    def release(self):
+        pass
+
+
+def depth_path(recordings_dir, session, depth_frame):
+    return Path(recordings_dir) / f"depth_{session}" / f"{depth_frame:06d}.png"
+
+
+def load_depth_index(recordings_dir, session):
+    """(intrinsics record or None, per-image records) of a session's depth stream"""
+    intrinsics = None
+    records = []
+    path = Path(recordings_dir) / f"depth_{session}.json"
+    if not path.exists():
+        return intrinsics, records
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if 'intrinsics' in record:
+                intrinsics = record
+            elif 'depth_frame' in record:
+                records.append(record)
+    return intrinsics, records
+
+
+def load_depth(recordings_dir, session, depth_frame):
+    """Depth image in millimetres (uint16), or None if it was dropped"""
+    return cv2.imread(str(depth_path(recordings_dir, session, depth_frame)), cv2.IMREAD_UNCHANGED)
+
+
+def window_offsets(size):
+    """Row and column offsets of a size x size neighbourhood, flattened"""
+    radius = size // 2
+    rows, cols = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+    return rows.ravel(), cols.ravel()
+
+
+def lift_points(points, depth, intrinsics, window=5):
+    """Metric 3D camera coordinates (metres) of normalized image points
+
+    points: (..., 2) normalized x, y (skeleton landmark convention);
+    depth: millimetre image aligned to camera3; intrinsics: 3x3 at the depth
+    size. Each point takes the median of the valid depths in a window x window
+    neighbourhood, for all points in one gather and one sort. Returns
+    (..., 3) float32, NaN where a point is off-image or has too few valid
+    depths.
+    """
+    points = np.asarray(points, np.float32)
+    shape = points.shape[:-1]
+    flat = points.reshape(-1, 2)
+    height, width = depth.shape
+    u = flat[:, 0] * width
+    v = flat[:, 1] * height
+
+    row_offsets, col_offsets = window_offsets(window)
+    rows = np.clip(v.astype(np.intp)[:, None] + row_offsets, 0, height - 1)
+    cols = np.clip(u.astype(np.intp)[:, None] + col_offsets, 0, width - 1)
+    # 0 (no measurement) sorts first; the median of the valid tail follows
+    samples = np.sort(depth[rows, cols], axis=1)
+    valid = np.count_nonzero(samples, axis=1)
+    middle = np.minimum(samples.shape[1] - valid + valid // 2, samples.shape[1] - 1)
+    z = np.take_along_axis(samples, middle[:, None], axis=1)[:, 0] * np.float32(0.001)
+
+    (fx, _, cx), (_, fy, cy) = intrinsics[0], intrinsics[1]
+    lifted = np.stack([(u - cx) * z / fx, (v - cy) * z / fy, z], axis=1)
+    usable = (u >= 0) & (u < width) & (v >= 0) & (v < height) & (valid >= MIN_VALID_FRACTION * samples.shape[1])
+    lifted[~usable] = np.nan
+    return lifted.reshape(shape + (3,))
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Frame / IMU association
+Writes frame_imu_<session>.json during recording: one record per camera3
+frame with the IMU state interpolated at the frame's timestamp, so
+"orientation at frame i" needs no join afterwards:
+
+    {"frame": 12, "device_time": ..., "timestamp": ...,
+     "gyroscope": [x, y, z], "accelerometer": [x, y, z],
+     "rotation_vector": [i, j, k, real], "orientation": [w, x, y, z]}
+
+Streams the device does not provide are null (rotation_vector without the
+BNO086, orientation without the AHRS). Vectors are interpolated linearly,
+quaternions with normalized lerp.
+
+Recent samples are kept per stream in a fixed-size ring. A frame usually
+arrives before the IMU samples that follow it, so frames wait in a short
+queue until every active stream has a sample at or after the frame time
+(or MAX_WAIT_S passes, then the newest sample is used).
+"""
+
+import numpy as np
+
+# Samples kept per stream (about 2 s at 500 Hz)
+RING_SIZE = 1024
+
+# A frame is written with the newest samples if it waits longer than this
+MAX_WAIT_S = 0.5
+
+# name: (values per sample, quaternion)
+STREAMS = {
+    'gyroscope': (3, False),
+    'accelerometer': (3, False),
+    'rotation_vector': (4, True),
+    'orientation': (4, True),
+}
+
+
+class SampleRing:
+    """The last `size` (time, values) samples of one stream, in arrival order"""
+
+    def __init__(self, width, quaternion=False, size=RING_SIZE):
+        self.times = np.zeros(size)
+        self.values = np.zeros((size, width))
+        self.quaternion = quaternion
+        self.size = size
+        self.count = 0
+
+    def append(self, timestamp, values):
+        slot = self.count % self.size
+        self.times[slot] = timestamp
+        self.values[slot] = values
+        self.count += 1
+
+    @property
+    def latest(self):
+        return self.times[(self.count - 1) % self.size] if self.count else None
+
+    def at(self, timestamp):
+        """Values interpolated at timestamp (clamped to the buffered span), or None if empty"""
+        if not self.count:
+            return None
+        order = np.arange(max(0, self.count - self.size), self.count) % self.size
+        times = self.times[order]
+        after = int(np.searchsorted(times, timestamp))
+        if after == 0:
+            return self.values[order[0]].tolist()
+        if after == len(order):
+            return self.values[order[-1]].tolist()
+        t0, t1 = times[after - 1], times[after]
+        v0, v1 = self.values[order[after - 1]], self.values[order[after]]
+        weight = (timestamp - t0) / (t1 - t0) if t1 > t0 else 0.0
+        if self.quaternion and np.dot(v0, v1) < 0:
+            # q and -q are the same rotation; interpolate the short way
+            v1 = -v1
+        values = v0 + weight * (v1 - v0)
+        if self.quaternion:
+            norm = np.linalg.norm(values)
+            # All-zero samples (no fix yet) would turn into NaN, which is not valid JSON
+            if norm > 0:
+                values /= norm
+        return values.tolist()
+
+
+class FrameImuAssociator:
+    """Per-frame IMU records, interpolated as samples come in"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.rings = {name: SampleRing(width, quaternion) for name, (width, quaternion) in STREAMS.items()}
+        # (frame, device time, host timestamp) waiting for later IMU samples
+        self.pending = []
+        self.written = 0
+
+    def add_sample(self, name, timestamp, values):
+        self.rings[name].append(timestamp, values)
+
+    def add_frame(self, frame, device_time, timestamp):
+        self.pending.append((frame, device_time, timestamp))
+
+    def flush(self, force=False):
+        """Write the pending frames every active stream has caught up with"""
+        if not self.pending:
+            return
+        latest = [ring.latest for ring in self.rings.values() if ring.count]
+        if not latest:
+            if force:
+                for frame in self.pending:
+                    self.write(*frame)
+                self.pending = []
+            return
+        covered = min(latest)
+        newest = max(max(latest), self.pending[-1][1])
+        while self.pending:
+            frame, device_time, timestamp = self.pending[0]
+            if not force and device_time > covered and newest - device_time < MAX_WAIT_S:
+                break
+            self.pending.pop(0)
+            self.write(frame, device_time, timestamp)
+
+    def write(self, frame, device_time, timestamp):
+        record = {'frame': frame, 'device_time': device_time, 'timestamp': timestamp}
+        for name, ring in self.rings.items():
+            record[name] = ring.at(device_time)
+        self.stream.write(record)
+        self.written += 1
+
+    def close(self):
+        """Write every frame still waiting"""
+        self.flush(force=True)
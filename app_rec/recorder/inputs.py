@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Control inputs
+Each input turns some external trigger into recorder calls
+(toggle_recording, stop_recording, mark_event, handle_control_command).
+
+Button inputs share one gesture scheme, whatever the GPIO library:
+  single press - start (immediately) / stop recording
+  long press   - stop recording
+  double press - event marker while recording
+"""
+
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from button_events import ButtonEvents, GestureDetector
+from event_markers import ControlSocket
+
+
+def button_detector(recorder, button_config):
+    """GestureDetector wired to the recorder's button actions"""
+    return GestureDetector(
+        on_single=recorder.on_button_single,
+        on_double=recorder.on_button_double,
+        on_long=recorder.on_button_long,
+        immediate_single=lambda: not recorder.recording,
+        long_press=button_config['long_press'],
+        double_window=button_config['double_window'],
+        debounce=button_config['debounce_ms'] / 1000.0,
+    )
+
+
+class CallbackButtonInput(ABC):
+    """Base for libraries that deliver edges as callbacks (gpiozero, RPi.GPIO)
+
+    Edges arrive on the library's thread; a small timer thread fires the
+    time-based gestures (long press while held, single press after the
+    double-press window).
+    """
+
+    name = 'button'
+
+    def __init__(self, recorder, config):
+        self.recorder = recorder
+        self.pin = config['button']['pin']
+        self.detector = button_detector(recorder, config['button'])
+        self.lock = threading.Lock()
+        self.wake_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def edge(self, pressed):
+        with self.lock:
+            self.detector.edge(pressed, time.monotonic())
+        self.wake_event.set()
+
+    def run_timer(self):
+        while not self.stop_event.is_set():
+            with self.lock:
+                deadline = self.detector.next_deadline()
+            timeout = 0.5 if deadline is None else max(0.0, deadline - time.monotonic())
+            self.wake_event.wait(timeout)
+            self.wake_event.clear()
+            with self.lock:
+                self.detector.poll(time.monotonic())
+
+    def start(self):
+        if not self.open():
+            return False
+        self.thread = threading.Thread(target=self.run_timer, name=f"{self.name}-gestures")
+        self.thread.daemon = True
+        self.thread.start()
+        print(f"✅ Button on GPIO{self.pin} using {self.name}")
+        return True
+
+    @abstractmethod
+    def open(self):
+        """Attach the edge callback to the pin; False if the library or pin is unavailable"""
+
+    def close(self):
+        pass
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
+        if self.thread:
+            self.thread.join(timeout=1)
+            self.thread = None
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class GpiozeroInput(CallbackButtonInput):
+    """Button through gpiozero callbacks"""
+
+    name = 'gpiozero'
+
+    def open(self):
+        try:
+            from gpiozero import Button
+            self.button = Button(self.pin, pull_up=True)
+            self.button.when_pressed = lambda: self.edge(True)
+            self.button.when_released = lambda: self.edge(False)
+            return True
+        except Exception as e:
+            print(f"❌ gpiozero button setup failed: {e}")
+            return False
+
+    def close(self):
+        self.button.close()
+
+
+class RpiGpioInput(CallbackButtonInput):
+    """Button through RPi.GPIO edge interrupts"""
+
+    name = 'RPi.GPIO'
+
+    def open(self):
+        try:
+            import RPi.GPIO as GPIO
+            self.GPIO = GPIO
+            GPIO.setmode(GPIO.BCM)
+            GPIO.setup(self.pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+            GPIO.add_event_detect(self.pin, GPIO.BOTH, callback=self.on_edge)
+            return True
+        except Exception as e:
+            print(f"❌ RPi.GPIO button setup failed: {e}")
+            return False
+
+    def on_edge(self, channel):
+        # Active low: a low level after the edge is a press
+        self.edge(self.GPIO.input(channel) == self.GPIO.LOW)
+
+    def close(self):
+        self.GPIO.remove_event_detect(self.pin)
+        self.GPIO.cleanup(self.pin)
+
+
+class GpiodInput:
+    """Button through kernel edge events (gpiod v2, gpiod v1, sysfs fallback)"""
+
+    backends = None
+
+    def __init__(self, recorder, config):
+        button = config['button']
+        self.button_events = ButtonEvents(
+            button['pin'],
+            button_detector(recorder, button),
+            chip=button['chip'],
+            debounce_ms=button['debounce_ms'],
+            backends=self.backends,
+        )
+
+    def start(self):
+        return self.button_events.start()
+
+    def stop(self):
+        self.button_events.stop()
+
+
+class SysfsInput(GpiodInput):
+    """Button through /sys/class/gpio edge polling only"""
+
+    backends = ('sysfs',)
+
+
+class StdinInput:
+    """Enter toggles recording, 'm [label]' adds an event marker, 'arm'/'disarm' the motion trigger"""
+
+    def __init__(self, recorder, config):
+        self.recorder = recorder
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="stdin")
+        self.thread.daemon = True
+        self.thread.start()
+        print("Press Enter to start/stop recording")
+        print("Type 'm [label]' and Enter to add an event marker")
+        print("Type 'arm' or 'disarm' for motion-triggered recording")
+        return True
+
+    def run(self):
+        for line in sys.stdin:
+            try:
+                command, _, label = line.strip().partition(' ')
+                if command == "":
+                    self.recorder.toggle_recording()
+                elif command in ('m', 'mark'):
+                    self.recorder.mark_event('stdin', label.strip() or None)
+                elif command == 'arm':
+                    self.recorder.arm()
+                elif command == 'disarm':
+                    self.recorder.disarm()
+                else:
+                    print(f"Unknown command: {command}")
+            except Exception as e:
+                print(f"Error handling command: {e}")
+        print("stdin closed, keyboard control disabled")
+
+    def stop(self):
+        # Blocked in readline; the daemon thread ends with the process
+        pass
+
+
+class SocketInput:
+    """Local control socket ('mark [label]', 'start', 'stop', 'arm', 'disarm')"""
+
+    def __init__(self, recorder, config):
+        self.control_socket = ControlSocket(recorder.handle_control_command, config['control_socket'])
+
+    def start(self):
+        return self.control_socket.start()
+
+    def stop(self):
+        self.control_socket.stop()
+
+
+INPUTS = {
+    'gpiozero': GpiozeroInput,
+    'gpiod': GpiodInput,
+    'sysfs': SysfsInput,
+    'rpigpio': RpiGpioInput,
+    'stdin': StdinInput,
+    'socket': SocketInput,
+}
+
+
+def create_inputs(recorder, config):
+    """Instantiate and start the configured inputs (unknown or failing ones are skipped)"""
+    inputs = []
+    for name in config['inputs']:
+        input_class = INPUTS.get(name)
+        if input_class is None:
+            print(f"Unknown input '{name}', available: {', '.join(INPUTS)}")
+            continue
+        try:
+            control_input = input_class(recorder, config)
+            if control_input.start():
+                inputs.append(control_input)
+        except Exception as e:
+            print(f"Input '{name}' failed to start: {e}")
+    return inputs
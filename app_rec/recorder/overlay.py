@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Video overlays
+The timestamp and frame counter drawn on camera3 frames. The recorder
+burns them in with "overlay": "burn"; otherwise they are kept in
+frames_<session>.json and render.py draws them when the video is watched.
+
+cv2.putText rasterizes every glyph on every call. InfoOverlay draws with
+pre-rendered alpha tiles (text_tiles.py) instead: the timestamp's tile
+changes once per second, and the counter's last digit comes from cached
+digit tiles, so its line changes only every tenth frame. Blending still
+costs about 75-90% of putText per frame; see bench_overlay.py.
+"""
+
+import datetime
+
+import cv2
+
+from text_tiles import FONT, TextTile
+
+TIMESTAMP_STYLE = ((10, 30), 1, (255, 255, 255), 2)
+COUNTER_STYLE = ((10, 70), 0.7, (0, 255, 0), 2)
+
+
+def timestamp_text(timestamp):
+    """Overlay text for a session timestamp (local time)"""
+    return datetime.datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def frame_text(frame_number, fps):
+    return f"Frame: {frame_number} ({fps:g} FPS)"
+
+
+def draw_info(frame, timestamp, frame_number, fps):
+    """Draw the timestamp and frame counter into the frame with cv2.putText"""
+    origin, scale, color, thickness = TIMESTAMP_STYLE
+    cv2.putText(frame, timestamp_text(timestamp), origin, FONT, scale, color, thickness, cv2.LINE_AA)
+    origin, scale, color, thickness = COUNTER_STYLE
+    cv2.putText(frame, frame_text(frame_number, fps), origin, FONT, scale, color, thickness, cv2.LINE_AA)
+
+
+class InfoOverlay:
+    """Cached-tile equivalent of draw_info"""
+
+    def __init__(self):
+        self.second = None
+        self.timestamp_tile = None
+        # Counter line with its last digit blank, plus one tile per digit
+        self.counter_tile = None
+        _, scale, color, thickness = COUNTER_STYLE
+        self.digits = [TextTile(str(d), scale, color, thickness) for d in range(10)]
+
+    def draw(self, frame, timestamp, frame_number, fps):
+        """Draw the timestamp and frame counter into the frame"""
+        # The text changes once per second; skip strftime in between
+        second = int(timestamp)
+        if second != self.second:
+            self.second = second
+            origin, scale, color, thickness = TIMESTAMP_STYLE
+            self.timestamp_tile = TextTile(timestamp_text(timestamp), scale, color, thickness)
+        x, y = TIMESTAMP_STYLE[0]
+        self.timestamp_tile.draw(frame, x, y)
+
+        # Re-rendered every tenth frame; Hershey digits all share one advance
+        tens, last = divmod(frame_number, 10)
+        prefix = f"Frame: {tens}" if tens else "Frame: "
+        text = f"{prefix}0 ({fps:g} FPS)"
+        if self.counter_tile is None or self.counter_tile.text != text:
+            _, scale, color, thickness = COUNTER_STYLE
+            self.counter_tile = TextTile(text, scale, color, thickness, blank=len(prefix))
+        x, y = COUNTER_STYLE[0]
+        self.counter_tile.draw(frame, x, y)
+        self.digits[last].draw(frame, x + self.counter_tile.blank_x, y)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Frame pacing
+Chooses which camera3 frames are written, from the device timestamps
+rather than the host's wall clock.
+
+cfr: the video is a grid of slots 1/fps apart, starting at the first frame.
+     Each frame takes the slot nearest to its timestamp. A second frame for
+     the same slot is dropped. Slots no frame landed on are filled by
+     repeating the previous frame, so playback at the container's fixed rate
+     matches real time even when the host falls behind.
+vfr: frames are kept at up to fps with no duplicates, and each frame's
+     presentation time is written to timecodes_<session>.txt (mkvmerge v2
+     format). The AVI itself still plays at the nominal rate; remux with
+     mkvmerge --timestamps 0:timecodes_<session>.txt for true timing.
+"""
+
+# Gaps longer than this restart the grid instead of writing a run of duplicates
+MAX_GAP_S = 2.0
+
+
+class FramePacer:
+    """Maps device frame timestamps onto the output video"""
+
+    def __init__(self, fps, mode='cfr'):
+        if mode not in ('cfr', 'vfr'):
+            raise ValueError(f"Unknown pacing mode '{mode}' (cfr or vfr)")
+        self.fps = fps
+        self.mode = mode
+        self.interval = 1.0 / fps
+        self.origin = None
+        self.next_slot = 0
+        # Grid slot of the last kept frame, vfr only
+        self.last_kept = None
+        self.first = None
+        self.last = None
+        self.received = 0
+        self.written = 0
+        self.duplicated = 0
+        self.dropped = 0
+        self.resyncs = 0
+        # Presentation times (ms from the first frame) of written frames, vfr only
+        self.timecodes = []
+
+    def submit(self, timestamp):
+        """(previous-frame repeats, keep this frame) for a frame at device time `timestamp` (s)"""
+        self.received += 1
+        if self.first is None:
+            self.first = timestamp
+        self.last = timestamp
+        if self.mode == 'vfr':
+            return 0, self.keep_vfr(timestamp)
+
+        if self.origin is None:
+            self.origin = timestamp
+        slot = round((timestamp - self.origin) / self.interval)
+        if slot < self.next_slot:
+            self.dropped += 1
+            return 0, False
+
+        repeat = slot - self.next_slot
+        if repeat * self.interval > MAX_GAP_S:
+            # Device stall or reconnect: start a new grid at this frame
+            self.resyncs += 1
+            self.origin = timestamp - self.next_slot * self.interval
+            repeat = 0
+            slot = self.next_slot
+        self.next_slot = slot + 1
+        self.duplicated += repeat
+        self.written += repeat + 1
+        return repeat, True
+
+    def keep_vfr(self, timestamp):
+        # At most one frame per grid slot, but no slot is ever filled in
+        slot = round((timestamp - self.first) / self.interval)
+        if self.last_kept is not None and slot <= self.last_kept:
+            self.dropped += 1
+            return False
+        self.last_kept = slot
+        self.written += 1
+        self.timecodes.append((timestamp - self.first) * 1000.0)
+        return True
+
+    def discard(self):
+        """The frame just kept could not be written (video writer behind)"""
+        self.dropped += 1
+        if self.mode == 'vfr':
+            self.written -= 1
+            self.timecodes.pop()
+        else:
+            # Its slot holds a repeat of the previous frame instead
+            self.duplicated += 1
+
+    def write_timecodes(self, path):
+        """mkvmerge timestamp file (format v2) for the written frames"""
+        with open(path, 'w') as f:
+            f.write("# timestamp format v2\n")
+            for ms in self.timecodes:
+                f.write(f"{ms:.3f}\n")
+
+    def summary(self):
+        """Target vs effective frame rate of the written video"""
+        span = (self.last - self.first) if self.first is not None else 0.0
+        return {
+            'mode': self.mode,
+            'target_fps': self.fps,
+            # Distinct frames per second of device time (duplicates excluded)
+            'effective_fps': (self.written - self.duplicated) / span if span > 0 else 0.0,
+            'input_fps': self.received / span if span > 0 else 0.0,
+            'span_s': span,
+            'received': self.received,
+            'written': self.written,
+            'duplicated': self.duplicated,
+            'dropped': self.dropped,
+            'resyncs': self.resyncs,
+        }
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Overlay renderer
+Draws the timestamp, frame counter and skeleton onto a raw camera3 video
+from its metadata streams (frames_<session>.json, skeleton_<session>.json),
+either into a new video file or in a preview window.
+
+Usage (from app_rec/):
+    python -m recorder.render recordings --session 20261019_101500
+    python -m recorder.render recordings --session 20261019_101500 --preview
+    python -m recorder.render recordings --session 20261019_101500 --skeleton recordings/skeleton/skeleton_20261019_101500.json
+
+The default output is recordings/annotated_<session>.<extension>, encoded
+with the config's camera3 codec. CFR duplicate frames (see pacing.py) have
+no skeleton records of their own; they show the poses of the frame they
+repeat, as the live overlay does.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import cv2
+
+from .config import load_config
+from .overlay import InfoOverlay
+
+
+def load_by_frame(path):
+    """Records of a JSON-lines stream grouped by their 'frame' field"""
+    by_frame = {}
+    if not path or not Path(path).exists():
+        return by_frame
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if 'frame' in record:
+                by_frame.setdefault(record['frame'], []).append(record)
+    return by_frame
+
+
+def pose_landmarks(records):
+    """Skeleton records as landmark lists for skeleton.draw_poses"""
+    return [[SimpleNamespace(x=lm['x'], y=lm['y'], z=lm['z']) for lm in record['landmarks']]
+            for record in records]
+
+
+def render_session(recordings_dir, session, output=None, preview=False, skeleton=True, skeleton_path=None):
+    """Composite overlays onto a session's raw camera3 video; returns frames rendered"""
+    recordings_dir = Path(recordings_dir)
+    video_path = next(iter(sorted(recordings_dir.glob(f"camera3_{session}.*"))), None)
+    if video_path is None:
+        raise FileNotFoundError(f"No camera3 video for session {session} in {recordings_dir}")
+
+    frames = {frame: records[0] for frame, records in load_by_frame(recordings_dir / f"frames_{session}.json").items()}
+    if not frames:
+        print(f"No frame metadata for {session}; rendering the skeleton only")
+
+    poses = {}
+    draw_poses = None
+    if skeleton:
+        poses = load_by_frame(skeleton_path or recordings_dir / f"skeleton_{session}.json")
+        try:
+            from .skeleton import draw_poses
+        except Exception as e:
+            print(f"Skeleton overlay unavailable: {e}")
+
+    capture = cv2.VideoCapture(str(video_path))
+    fps = capture.get(cv2.CAP_PROP_FPS) or 15.0
+    size = (int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)), int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+    writer = None
+    if not preview:
+        depthai_config = load_config()['depthai']
+        output = output or recordings_dir / f"annotated_{session}.{depthai_config['extension']}"
+        writer = cv2.VideoWriter(str(output), cv2.VideoWriter_fourcc(*depthai_config['codec']), fps, size)
+        if not writer.isOpened():
+            capture.release()
+            raise RuntimeError(f"Could not open video writer for {output}")
+
+    info_overlay = InfoOverlay()
+    # Poses of the last detected frame, repeated on its CFR duplicates
+    shown_poses = None
+    index = 0
+    delay = 1.0 / fps
+    next_time = time.monotonic()
+    try:
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+
+            info = frames.get(index)
+            if info:
+                info_overlay.draw(frame, info['timestamp'], index + 1, info['fps'])
+            if index in poses:
+                shown_poses = poses[index]
+            elif not (info and info.get('duplicate')):
+                shown_poses = None
+            if draw_poses and shown_poses:
+                frame = draw_poses(frame, pose_landmarks(shown_poses))
+
+            if writer:
+                writer.write(frame)
+            else:
+                cv2.imshow(f"camera3 {session}", frame)
+                next_time += delay
+                wait_ms = max(1, int((next_time - time.monotonic()) * 1000))
+                if cv2.waitKey(wait_ms) & 0xFF in (ord('q'), 27):
+                    break
+            index += 1
+    finally:
+        capture.release()
+        if writer:
+            writer.release()
+        else:
+            cv2.destroyAllWindows()
+
+    if writer:
+        print(f"Rendered {index} frames to {output}")
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Draw overlays onto a raw camera3 recording")
+    parser.add_argument('recordings_dir', help="directory with the recorded session files")
+    parser.add_argument('--session', required=True, help="session name")
+    parser.add_argument('--output', help="output video (default: <recordings_dir>/annotated_<session>.<ext>)")
+    parser.add_argument('--preview', action='store_true', help="show in a window instead of writing a file")
+    parser.add_argument('--skeleton', help="skeleton stream to draw (default: the session's own)")
+    parser.add_argument('--no-skeleton', action='store_true', help="draw the text overlay only")
+    args = parser.parse_args()
+
+    render_session(args.recordings_dir, args.session, output=args.output, preview=args.preview,
+                   skeleton=not args.no_skeleton, skeleton_path=args.skeleton)
+
+
+if __name__ == "__main__":
+    main()
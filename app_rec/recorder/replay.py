@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Session replay
+Feeds a recorded session (camera3 video, IMU, gyroscope, accelerometer and
+GPS streams) back through the recorder's processing stages: frame overlay,
+skeleton detection, video encode, IMU and GPS recording, AHRS fusion and
+the per-frame IMU table. The output is a new session with the same name in
+another directory.
+
+Usage (from app_rec/):
+    python -m recorder.replay recordings --session 20261019_101500
+    python -m recorder.replay recordings --all --speed 0 --workers 4
+    python -m recorder.replay recordings --session 20261019_101500 --start 60 --end 90
+
+--speed 1 replays with the original timing, --speed 0 as fast as possible.
+--workers replays several sessions in parallel, one process per session.
+
+Frames are placed at their recorded times from frames_<session>.json
+(timestamp, and device_time when present). Frames without a record (older
+sessions, or burned-in overlays) fall back to first_sample + n / video_fps.
+Frames recorded with an overlay keep it, and the replay draws its own on
+top. camera3 is written through a blocking stream, so a fast replay waits
+for the encoder instead of dropping frames.
+
+Gyroscope and accelerometer records are written one of each per IMU
+packet, so they are paired again into packets like the device's. Sessions
+recorded with orientation_<session>.json are fused again (ahrs.enabled),
+and frame_imu_<session>.json is rebuilt when the IMU and frame device
+times are there.
+"""
+
+import argparse
+import datetime
+import heapq
+import json
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from types import SimpleNamespace
+
+from session_clock import SessionClock
+
+from .config import load_config
+
+# Event order for equal timestamps: sensor samples before the frame they precede
+EVENT_ORDER = {'gps': 0, 'gyroscope': 1, 'rotation_vector': 2, 'frame': 3}
+
+# Session-time field of each stream's records
+TIME_KEYS = {'gps': 'utc_corrected', 'gyroscope': 'timestamp', 'rotation_vector': 'timestamp'}
+
+
+class ReplayClock(SessionClock):
+    """Session clock that reports the timestamp of the event being replayed"""
+
+    def __init__(self, start):
+        super().__init__()
+        self.current = start
+        self.source = 'replay'
+
+    def add_fix(self, fix):
+        # Recorded fixes already carry corrected UTC
+        return False
+
+    def add_pps(self, edge_monotonic):
+        return False
+
+    def from_monotonic(self, host_monotonic):
+        return self.current
+
+    def now(self):
+        return self.current
+
+
+def read_json_lines(path, start=None, end=None, key='timestamp'):
+    """Records of a JSON-lines stream within [start, end) of their `key` time"""
+    if not path.exists():
+        return
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            timestamp = record.get(key)
+            if timestamp is None:
+                continue
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp >= end:
+                break
+            yield record
+
+
+def load_frame_records(recordings_dir, session):
+    """frames_<session>.json records by camera3 frame index (first record per frame); {} if absent"""
+    records = {}
+    for record in read_json_lines(Path(recordings_dir) / f"frames_{session}.json"):
+        if 'frame' in record:
+            records.setdefault(record['frame'], record)
+    return records
+
+
+def first_timestamp(path, key='timestamp'):
+    for record in read_json_lines(path, key=key):
+        return record[key]
+    return None
+
+
+class SessionReplay:
+    """Time-ordered events of one recorded session, with seeking"""
+
+    def __init__(self, recordings_dir, session):
+        self.recordings_dir = Path(recordings_dir)
+        self.session = session
+        self.paths = {
+            'rotation_vector': self.recordings_dir / f"imu_vector_{session}.json",
+            'gyroscope': self.recordings_dir / f"gyroscope_{session}.json",
+            'gps': self.recordings_dir / f"gps_{session}.json",
+        }
+        # Replayed with the gyroscope stream; orientation is fused again, not replayed
+        self.accelerometer_path = self.recordings_dir / f"accelerometer_{session}.json"
+        self.orientation_path = self.recordings_dir / f"orientation_{session}.json"
+        self.video_path = next(iter(sorted(self.recordings_dir.glob(f"camera3_{session}.*"))), None)
+        # Recorded per-frame times (CFR duplicates included)
+        self.frame_records = load_frame_records(self.recordings_dir, session)
+
+        # Video properties
+        self.fps = None
+        self.frame_count = 0
+        self.size = None
+        if self.video_path:
+            import cv2
+            capture = cv2.VideoCapture(str(self.video_path))
+            self.fps = capture.get(cv2.CAP_PROP_FPS) or 15.0
+            self.frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+            self.size = (int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)), int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+            capture.release()
+
+        # Session start: the earliest sample of any stream
+        starts = [first_timestamp(path, TIME_KEYS[kind]) for kind, path in self.paths.items()]
+        if self.frame_records:
+            starts.append(self.frame_records[min(self.frame_records)]['timestamp'])
+        starts = [t for t in starts if t is not None]
+        self.start_time = min(starts) if starts else self.session_time()
+        self.position = self.start_time
+
+    def session_time(self):
+        """Start time from the session name (local time), for video-only sessions"""
+        try:
+            return time.mktime(time.strptime(self.session, '%Y%m%d_%H%M%S'))
+        except ValueError:
+            return 0.0
+
+    @property
+    def duration(self):
+        return self.frame_count / self.fps if self.fps else 0.0
+
+    def frame_time(self, index):
+        """Recorded session time of frame index, else estimated from the frame rate"""
+        record = self.frame_records.get(index)
+        if record is not None:
+            return record['timestamp']
+        return self.start_time + index / self.fps
+
+    def first_frame_at(self, start):
+        """Index of the first frame at or after session time start"""
+        if not self.frame_records:
+            return max(0, math.ceil((start - self.start_time) * self.fps))
+        count = max(self.frame_count, max(self.frame_records) + 1)
+        return next((n for n in range(count) if self.frame_time(n) >= start), count)
+
+    def seek(self, seconds):
+        """Start the next events() at this offset into the session"""
+        self.position = self.start_time + max(0.0, seconds)
+
+    def frames(self, start, end):
+        if not self.video_path:
+            return
+        import cv2
+        capture = cv2.VideoCapture(str(self.video_path))
+        index = self.first_frame_at(start)
+        if index:
+            capture.set(cv2.CAP_PROP_POS_FRAMES, index)
+        try:
+            while True:
+                timestamp = self.frame_time(index)
+                if end is not None and timestamp >= end:
+                    break
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                yield timestamp, EVENT_ORDER['frame'], index, 'frame', (index, frame)
+                index += 1
+        finally:
+            capture.release()
+
+    def records(self, kind, start, end):
+        if kind == 'gyroscope':
+            yield from self.imu_records(start, end)
+            return
+        key = TIME_KEYS[kind]
+        for n, record in enumerate(read_json_lines(self.paths[kind], start, end, key)):
+            yield record[key], EVENT_ORDER[kind], n, kind, record
+
+    def imu_records(self, start, end):
+        """Gyroscope records with the accelerometer record of the same packet (None if not recorded)"""
+        # Both streams get one record per packet, so they pair up in file order
+        accelerometer = read_json_lines(self.accelerometer_path)
+        for n, record in enumerate(read_json_lines(self.paths['gyroscope'])):
+            acceleration = next(accelerometer, None)
+            timestamp = record['timestamp']
+            if timestamp < start:
+                continue
+            if end is not None and timestamp >= end:
+                break
+            yield timestamp, EVENT_ORDER['gyroscope'], n, 'gyroscope', (record, acceleration)
+
+    def events(self, duration=None):
+        """(timestamp, kind, payload) from the seek position, merged across streams"""
+        start = self.position
+        end = start + duration if duration is not None else None
+        streams = [self.frames(start, end)] + [self.records(kind, start, end) for kind in self.paths]
+        for timestamp, _, _, kind, payload in heapq.merge(*streams, key=lambda e: e[:3]):
+            yield timestamp, kind, payload
+
+
+class Pacer:
+    """Sleeps so events come out at `speed` x their original rate (0 = no pacing)"""
+
+    def __init__(self, speed):
+        self.speed = speed
+        self.origin = None
+
+    def wait(self, timestamp):
+        if not self.speed:
+            return
+        now = time.monotonic()
+        if self.origin is None:
+            self.origin = (now, timestamp)
+            return
+        due = self.origin[0] + (timestamp - self.origin[1]) / self.speed
+        if due > now:
+            time.sleep(due - now)
+
+
+class ReplayReading(SimpleNamespace):
+    """IMU reading with the recorded device time (older sessions: the host time)"""
+
+    def getTimestamp(self):
+        return datetime.timedelta(seconds=self.device_time)
+
+
+def imu_reading(record):
+    return ReplayReading(x=record['x'], y=record['y'], z=record['z'],
+                         device_time=record.get('device_time', record['timestamp']))
+
+
+def imu_packet(kind, record):
+    """Packet shaped like a DepthAI IMU packet for record_imu_packets"""
+    if kind == 'gyroscope':
+        gyroscope, accelerometer = record
+        if accelerometer is None:
+            return SimpleNamespace(gyroscope=imu_reading(gyroscope))
+        return SimpleNamespace(gyroscope=imu_reading(gyroscope), acceleroMeter=imu_reading(accelerometer))
+    return SimpleNamespace(rotationVector=ReplayReading(
+        i=record['i'], j=record['j'], k=record['k'], real=record['real'], accuracy=record['accuracy'],
+        device_time=record.get('device_time', record['timestamp'])))
+
+
+def replay_session(recordings_dir, session, output_dir, speed=0.0, start=0.0, duration=None,
+                   skeleton=True, config_overrides=None):
+    """Replay one session into output_dir; returns a summary dict"""
+    from .core import MultiCameraRecorder, load_capture_modules
+    load_capture_modules(with_depthai=False)
+
+    replay = SessionReplay(recordings_dir, session)
+    replay.seek(start)
+
+    config = load_config(overrides={
+        'name': 'replay',
+        'recordings_dir': str(output_dir),
+        'inputs': [],
+        'sinks': [],
+        'cameras': {'camera1': {'enabled': False}, 'camera2': {'enabled': False}},
+        'depthai': {'enabled': False},
+        'skeleton': {'enabled': skeleton},
+        'gps': {'enabled': False, 'pps_pin': None},
+        'profiling': {'print_report': False},
+        # Fused live, so fused again
+        'ahrs': {'enabled': replay.orientation_path.exists()},
+    })
+    if config_overrides:
+        from .config import merge
+        config = merge(config, config_overrides)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    recorder = MultiCameraRecorder(config)
+    recorder.models_ready.wait(timeout=120)
+
+    # Stamp every output with the replayed time
+    recorder.clock = ReplayClock(replay.position)
+
+    counts = {'frame': 0, 'gyroscope': 0, 'accelerometer': 0, 'rotation_vector': 0, 'gps': 0}
+    started = time.monotonic()
+    pacer = Pacer(speed)
+    video_stream = None
+    try:
+        recorder.stats.reset(session)
+        recorder.open_session_streams(
+            session,
+            imu=any(replay.paths[kind].exists() for kind in ('rotation_vector', 'gyroscope')),
+            gps=replay.paths['gps'].exists(),
+        )
+        if replay.video_path:
+            # Offline: wait for the encoder rather than drop frames
+            video_stream = recorder.open_camera3_writer(session, replay.size, replay.fps, block=True)
+            if recorder.gyro_file and config['depthai']['frame_imu']:
+                recorder.open_frame_imu(session)
+
+        for timestamp, kind, payload in replay.events(duration):
+            pacer.wait(timestamp)
+            recorder.clock.current = timestamp
+            counts[kind] += 1
+            if kind == 'frame':
+                recorder.stats.frame_received()
+                if video_stream is not None:
+                    index, frame = payload
+                    record = replay.frame_records.get(index, {})
+                    # CFR duplicates have no device time of their own; live, they repeat the previous frame's
+                    device_time = record.get('device_time')
+                    if record.get('duplicate'):
+                        device_time = recorder.last_frame_device_time
+                    recorder.process_frame(frame, counts['frame'], replay.fps, video_stream, device_time)
+                    recorder.stats.frame_written()
+            elif kind == 'gps':
+                recorder.record_gps_fix(payload)
+            else:
+                if kind == 'gyroscope' and payload[1] is not None:
+                    counts['accelerometer'] += 1
+                recorder.record_imu_packets([imu_packet(kind, payload)])
+
+        if video_stream is not None:
+            recorder.close_frame_imu()
+            recorder.session_writer.close_stream('camera3')
+    finally:
+        recorder.stop_session()
+        recorder.cleanup()
+
+    elapsed = time.monotonic() - started
+    replayed = (recorder.clock.current - replay.position) if counts['frame'] or counts['gyroscope'] else 0.0
+    return {
+        'session': session,
+        'output_dir': str(output_dir),
+        'events': counts,
+        'replayed_s': replayed,
+        'wall_s': elapsed,
+        'realtime_factor': replayed / elapsed if elapsed > 0 else None,
+    }
+
+
+def find_sessions(recordings_dir):
+    """Session names that have a camera3 video or IMU stream"""
+    sessions = set()
+    for pattern in ('camera3_*.*', 'imu_vector_*.json'):
+        for path in Path(recordings_dir).glob(pattern):
+            sessions.add(path.stem.split('_', 1)[1] if path.stem.startswith('camera3_')
+                         else path.stem[len('imu_vector_'):])
+    return sorted(sessions)
+
+
+def replay_sessions(recordings_dir, sessions, output_dir, workers=1, **options):
+    """Replay several sessions, `workers` processes at a time"""
+    if workers <= 1:
+        return [replay_session(recordings_dir, session, output_dir, **options) for session in sessions]
+
+    # Fresh interpreters: OpenCV's codec threads do not survive fork()
+    results = []
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {pool.submit(replay_session, recordings_dir, session, output_dir, **options): session
+                   for session in sessions}
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"Replay of {futures[future]} failed: {e}")
+    return sorted(results, key=lambda r: r['session'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded sessions through the recorder pipeline")
+    parser.add_argument('recordings_dir', help="directory with the recorded session files")
+    parser.add_argument('--session', action='append', default=[], help="session name (repeatable)")
+    parser.add_argument('--all', action='store_true', help="replay every session in the directory")
+    parser.add_argument('--output', help="output directory (default: <recordings_dir>/replay)")
+    parser.add_argument('--speed', type=float, default=0.0, help="1 = original timing, 0 = as fast as possible")
+    parser.add_argument('--start', type=float, default=0.0, help="seek: seconds into the session")
+    parser.add_argument('--end', type=float, help="stop at this many seconds into the session")
+    parser.add_argument('--workers', type=int, default=1, help="sessions replayed in parallel")
+    parser.add_argument('--no-skeleton', action='store_true', help="skip pose detection")
+    args = parser.parse_args()
+
+    sessions = find_sessions(args.recordings_dir) if args.all else args.session
+    if not sessions:
+        parser.error("no sessions given (--session NAME or --all)")
+    output_dir = args.output or str(Path(args.recordings_dir) / "replay")
+    duration = args.end - args.start if args.end is not None else None
+
+    results = replay_sessions(args.recordings_dir, sessions, output_dir, workers=args.workers,
+                              speed=args.speed, start=args.start, duration=duration,
+                              skeleton=not args.no_skeleton)
+    for result in results:
+        events = result['events']
+        factor = result['realtime_factor']
+        print(f"{result['session']}: {events['frame']} frames, {events['rotation_vector']} IMU, "
+              f"{events['gyroscope']} gyro, {events['accelerometer']} accel, {events['gps']} GPS in {result['wall_s']:.1f} s "
+              f"({factor:.2f}x realtime)" if factor else f"{result['session']}: nothing replayed")
+
+
+if __name__ == "__main__":
+    main()
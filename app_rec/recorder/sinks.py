@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Status sinks
+Sinks show recorder state to the operator. Each one gets:
+  start()                      - once, after the recorder is set up
+  recording_changed(recording) - on start/stop
+  marker(marker)               - when an event marker is added
+  stop()                       - on shutdown
+
+Session data (video, IMU, GPS, skeleton) does not go through sinks; it is
+written by the SessionWriter lanes.
+"""
+
+import os
+import time
+
+from lcd_service import LcdService
+from status_dashboard import StatusDashboard
+
+
+class LedSink:
+    """Recording LED (on while recording) through gpiozero, gpiod, RPi.GPIO or sysfs"""
+
+    def __init__(self, recorder, config):
+        self.pin = config['led']['pin']
+        self.backend = config['led']['backend']
+        self.chip = None
+        self.line = None
+        self.request = None
+        self.led = None
+        self.GPIO = None
+
+    def start(self):
+        openers = {
+            'gpiozero': self.open_gpiozero,
+            'gpiod': self.open_gpiod,
+            'rpigpio': self.open_rpigpio,
+            'sysfs': self.open_sysfs,
+        }
+        # Configured backend first, sysfs as the fallback
+        for name in dict.fromkeys((self.backend, 'sysfs')):
+            try:
+                openers[name]()
+                self.backend = name
+                self.set(False)
+                print(f"✅ LED on GPIO{self.pin} using {name}")
+                return True
+            except Exception as e:
+                print(f"❌ LED setup with {name} failed: {e}")
+        print("Continuing without LED...")
+        self.backend = None
+        return False
+
+    def open_gpiozero(self):
+        from gpiozero import LED
+        self.led = LED(self.pin)
+
+    def open_gpiod(self):
+        import gpiod
+        if hasattr(gpiod, 'request_lines'):
+            from gpiod.line import Direction
+            self.request = gpiod.request_lines(
+                "/dev/gpiochip0", consumer="led",
+                config={self.pin: gpiod.LineSettings(direction=Direction.OUTPUT)},
+            )
+        else:
+            self.chip = gpiod.Chip('gpiochip0')
+            self.line = self.chip.get_line(self.pin)
+            self.line.request(consumer="led", type=gpiod.LINE_REQ_DIR_OUT)
+
+    def open_rpigpio(self):
+        import RPi.GPIO as GPIO
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(self.pin, GPIO.OUT)
+        self.GPIO = GPIO
+
+    def open_sysfs(self):
+        if not os.path.exists(f"/sys/class/gpio/gpio{self.pin}"):
+            with open("/sys/class/gpio/export", "w") as f:
+                f.write(str(self.pin))
+            time.sleep(0.1)
+        with open(f"/sys/class/gpio/gpio{self.pin}/direction", "w") as f:
+            f.write("out")
+
+    def set(self, state):
+        """Switch the LED; errors are ignored so the LED never stops a recording"""
+        try:
+            if self.backend == 'gpiozero':
+                self.led.value = 1 if state else 0
+            elif self.backend == 'gpiod' and self.request:
+                from gpiod.line import Value
+                self.request.set_value(self.pin, Value.ACTIVE if state else Value.INACTIVE)
+            elif self.backend == 'gpiod':
+                self.line.set_value(1 if state else 0)
+            elif self.backend == 'rpigpio':
+                self.GPIO.output(self.pin, self.GPIO.HIGH if state else self.GPIO.LOW)
+            elif self.backend == 'sysfs':
+                with open(f"/sys/class/gpio/gpio{self.pin}/value", "w") as f:
+                    f.write("1" if state else "0")
+        except Exception:
+            pass
+
+    def recording_changed(self, recording):
+        self.set(recording)
+
+    def marker(self, marker):
+        pass
+
+    def stop(self):
+        self.set(False)
+        try:
+            if self.led:
+                self.led.close()
+            if self.request:
+                self.request.release()
+            if self.line:
+                self.line.release()
+            if self.chip:
+                self.chip.close()
+            if self.GPIO:
+                self.GPIO.cleanup(self.pin)
+        except Exception:
+            pass
+
+
+class LcdSink:
+    """Grove LCD RGB with the live status dashboard"""
+
+    def __init__(self, recorder, config):
+        lcd_config = config['lcd']
+        # All I2C traffic happens on the LCD service thread
+        self.lcd = LcdService()
+        self.dashboard = None
+        if lcd_config['dashboard']:
+            # Live status pages (FPS, drops, free space, GPS) sampled from recorder counters
+            self.dashboard = StatusDashboard(
+                self.lcd, recorder.stats, recorder.recordings_dir,
+                sample_interval=lcd_config['sample_interval'],
+                page_seconds=lcd_config['page_seconds'],
+            )
+
+    def start(self):
+        self.lcd.start()
+        self.lcd.show("SOGO READY", (0, 128, 64))  # Green color
+        if self.dashboard:
+            self.dashboard.start()
+        return True
+
+    def recording_changed(self, recording):
+        if self.dashboard:
+            self.dashboard.set_recording(recording)
+        if recording:
+            self.lcd.show("RECORDING", (255, 0, 0))  # Red color for recording
+        else:
+            self.lcd.show("SOGO READY", (0, 128, 64))  # Green color for ready
+
+    def marker(self, marker):
+        self.lcd.show(f"MARK #{marker['index']}\n{marker['label'] or marker['source']}"[:33])
+
+    def stop(self):
+        if self.dashboard:
+            self.dashboard.stop()
+        self.lcd.stop()
+
+
+SINKS = {
+    'led': LedSink,
+    'lcd': LcdSink,
+}
+
+
+def create_sinks(recorder, config):
+    """Instantiate and start the configured sinks (unknown or failing ones are skipped)"""
+    sinks = []
+    for name in config['sinks']:
+        sink_class = SINKS.get(name)
+        if sink_class is None:
+            print(f"Unknown sink '{name}', available: {', '.join(SINKS)}")
+            continue
+        try:
+            sink = sink_class(recorder, config)
+            sink.start()
+            sinks.append(sink)
+        except Exception as e:
+            print(f"Sink '{name}' failed to start: {e}")
+    return sinks
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Skeleton recognition
+MediaPipe PoseLandmarker wrapper: detection, overlay drawing and the
+per-frame landmark record written to skeleton_<session>.json.
+
+Records always hold the normalized image landmarks. Optionally they also
+hold MediaPipe's world landmarks (metres, origin between the hips) and
+depth-lifted camera-frame joints (metres, see depth.lift_points).
+"""
+
+import os
+
+import cv2
+import numpy as np
+
+# MediaPipe imports for skeleton recognition
+import mediapipe as mp
+from mediapipe.tasks import python
+from mediapipe.tasks.python import vision
+from mediapipe.framework.formats import landmark_pb2
+from mediapipe import solutions
+
+from .config import APP_DIR
+
+# Suppress TensorFlow warnings
+os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
+
+
+class PoseDetector:
+    """MediaPipe pose landmarker on BGR frames"""
+
+    def __init__(self, model):
+        model_path = APP_DIR / model
+        if not model_path.exists():
+            raise FileNotFoundError(f"Skeleton model not found at {model_path}")
+
+        base_options = python.BaseOptions(model_asset_path=str(model_path))
+        options = vision.PoseLandmarkerOptions(
+            base_options=base_options,
+            output_segmentation_masks=False  # Disable for better performance
+        )
+        self.landmarker = vision.PoseLandmarker.create_from_options(options)
+
+    def prepare(self, frame):
+        """BGR frame to a MediaPipe RGB image"""
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
+
+    def detect_image(self, mp_image):
+        """Detect pose landmarks on a prepared image"""
+        return self.landmarker.detect(mp_image)
+
+    def detect(self, frame):
+        """Detect pose landmarks on a BGR frame"""
+        return self.detect_image(self.prepare(frame))
+
+    def draw(self, frame, detection_result):
+        """Draw skeleton landmarks on a copy of the frame"""
+        return draw_poses(frame, detection_result.pose_landmarks)
+
+    def records(self, detection_result, timestamp, frame=None, world=False, points_3d=None, landmarks=None):
+        """One landmark record per detected pose (frame: position in the video)
+
+        world: add pose_world_landmarks; points_3d: (poses, 33, 3) lifted
+        joints; landmarks: (poses, 33, 4) values to save instead of the
+        detected ones (smoothing.py).
+        """
+        world_poses = detection_result.pose_world_landmarks if world else None
+        for pose_index, pose_landmarks in enumerate(detection_result.pose_landmarks):
+            record = {'timestamp': timestamp} if frame is None else {'timestamp': timestamp, 'frame': frame}
+            if landmarks is None:
+                record['landmarks'] = [
+                    {
+                        'id': i,
+                        'x': landmark.x,
+                        'y': landmark.y,
+                        'z': landmark.z,
+                        'visibility': getattr(landmark, 'visibility', 0.0)
+                    }
+                    for i, landmark in enumerate(pose_landmarks)
+                ]
+            else:
+                record['landmarks'] = [
+                    {'id': i, 'x': x, 'y': y, 'z': z, 'visibility': visibility}
+                    for i, (x, y, z, visibility) in enumerate(landmarks[pose_index].tolist())
+                ]
+            if world_poses:
+                record['world_landmarks'] = [
+                    {'id': i, 'x': landmark.x, 'y': landmark.y, 'z': landmark.z}
+                    for i, landmark in enumerate(world_poses[pose_index])
+                ]
+            if points_3d is not None:
+                # NaN (no usable depth) becomes null
+                record['landmarks_3d'] = [point if point[2] == point[2] else None
+                                          for point in points_3d[pose_index].tolist()]
+            yield record
+
+
+def landmark_array(detection_result):
+    """(poses, 33, 4) normalized x, y, z and visibility of every detected pose"""
+    return np.array([[(landmark.x, landmark.y, landmark.z, getattr(landmark, 'visibility', 0.0))
+                      for landmark in pose_landmarks]
+                     for pose_landmarks in detection_result.pose_landmarks], np.float32)
+
+
+def draw_poses(frame, poses):
+    """Draw poses (lists of landmarks with x, y, z) on a copy of the frame"""
+    if not poses:
+        return frame
+
+    annotated_frame = frame.copy()
+
+    for pose_landmarks in poses:
+        pose_landmarks_proto = landmark_pb2.NormalizedLandmarkList()
+        pose_landmarks_proto.landmark.extend(
+            [landmark_pb2.NormalizedLandmark(x=landmark.x, y=landmark.y, z=landmark.z)
+             for landmark in pose_landmarks]
+        )
+        solutions.drawing_utils.draw_landmarks(
+            annotated_frame,
+            pose_landmarks_proto,
+            solutions.pose.POSE_CONNECTIONS,
+            solutions.drawing_styles.get_default_pose_landmarks_style()
+        )
+
+    return annotated_frame
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Landmark smoothing
+Temporal filters for skeleton landmarks, applied to whole (33, 4) arrays
+(x, y, z, visibility per landmark) per frame with NumPy. Used live by the
+recorder ("skeleton": {"smoothing": "one_euro"}) and offline on stored
+skeleton streams:
+
+    python -m recorder.smoothing recordings/skeleton_20261019_101500.json --method kalman
+
+one_euro: One-Euro filter (Casiez et al.): a low-pass whose cutoff rises
+          with speed, so slow jitter is removed and fast motion lags little.
+kalman:   constant-velocity Kalman filter per coordinate.
+
+Each detected pose (by its index in the detection result) is a track with
+its own filter state; a track that is not seen for MAX_GAP_S starts over.
+"""
+
+import argparse
+import json
+import math
+import os
+from pathlib import Path
+
+import numpy as np
+
+# A track unseen for longer than this restarts instead of smoothing across the gap
+MAX_GAP_S = 0.5
+
+# Defaults for normalized image coordinates at 15-30 FPS
+DEFAULT_PARAMS = {
+    'one_euro': {'min_cutoff': 1.0, 'beta': 20.0, 'd_cutoff': 1.0},
+    'kalman': {'process_noise': 0.1, 'measurement_noise': 0.005},
+}
+
+
+def smoothing_factor(cutoff, dt):
+    """Exponential smoothing factor of a first-order low-pass at `cutoff` Hz"""
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """One-Euro filter over arrays of any shape"""
+
+    def __init__(self, min_cutoff=1.0, beta=0.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.value = None
+        self.speed = None
+
+    def __call__(self, values, dt):
+        values = np.asarray(values, np.float64)
+        if self.value is None or dt <= 0:
+            self.value = values.copy()
+            self.speed = np.zeros_like(values)
+            return self.value
+        # Smoothed speed sets the cutoff, per element
+        speed = (values - self.value) / dt
+        self.speed += smoothing_factor(self.d_cutoff, dt) * (speed - self.speed)
+        cutoff = self.min_cutoff + self.beta * np.abs(self.speed)
+        alpha = 1.0 / (1.0 + 1.0 / (2 * math.pi * cutoff * dt))
+        self.value += alpha * (values - self.value)
+        return self.value
+
+
+class KalmanFilter:
+    """Constant-velocity Kalman filter, one independent (position, velocity) state per element
+
+    process_noise: acceleration noise density; measurement_noise: standard
+    deviation of a measurement, both in the units of the values.
+    """
+
+    def __init__(self, process_noise=1.0, measurement_noise=0.01):
+        self.q = process_noise
+        self.r = measurement_noise ** 2
+        self.value = None
+
+    def __call__(self, values, dt):
+        values = np.asarray(values, np.float64)
+        if self.value is None or dt <= 0:
+            self.value = values.copy()
+            self.velocity = np.zeros_like(values)
+            # Covariance [[p00, p01], [p01, p11]] per element
+            self.p00 = np.full_like(values, self.r)
+            self.p01 = np.zeros_like(values)
+            self.p11 = np.full_like(values, 1.0)
+            return self.value
+
+        # Predict
+        self.value += self.velocity * dt
+        q = self.q
+        p00 = self.p00 + dt * (2 * self.p01 + dt * self.p11) + q * dt ** 3 / 3
+        p01 = self.p01 + dt * self.p11 + q * dt ** 2 / 2
+        p11 = self.p11 + q * dt
+
+        # Update with the measured position
+        innovation = values - self.value
+        gain0 = p00 / (p00 + self.r)
+        gain1 = p01 / (p00 + self.r)
+        self.value += gain0 * innovation
+        self.velocity += gain1 * innovation
+        self.p00 = (1 - gain0) * p00
+        self.p01 = (1 - gain0) * p01
+        self.p11 = p11 - gain1 * p01
+        return self.value
+
+
+FILTERS = {'one_euro': OneEuroFilter, 'kalman': KalmanFilter}
+
+
+class LandmarkSmoother:
+    """Per-track filters for the poses of successive frames"""
+
+    def __init__(self, method='one_euro', params=None):
+        if method not in FILTERS:
+            raise ValueError(f"Unknown smoothing method '{method}' ({', '.join(FILTERS)})")
+        self.method = method
+        self.params = dict(DEFAULT_PARAMS[method], **(params or {}))
+        # Per track: [filter, timestamp of the last update]
+        self.tracks = {}
+
+    def smooth(self, poses, timestamp):
+        """Smoothed (poses, 33, 4) array of a frame's (33, 4) landmark arrays"""
+        smoothed = []
+        for track, landmarks in enumerate(poses):
+            state = self.tracks.get(track)
+            if state is None or timestamp - state[1] > MAX_GAP_S:
+                state = self.tracks[track] = [FILTERS[self.method](**self.params), timestamp]
+            dt = timestamp - state[1]
+            state[1] = timestamp
+            smoothed.append(state[0](landmarks, dt))
+        return np.array(smoothed)
+
+
+def landmarks_array(record):
+    """(33, 4) x, y, z, visibility of a skeleton record"""
+    return np.array([(lm['x'], lm['y'], lm['z'], lm.get('visibility', 0.0)) for lm in record['landmarks']])
+
+
+def set_landmarks(record, landmarks):
+    """Write a (33, 4) array back into a skeleton record's landmarks"""
+    for lm, (x, y, z, visibility) in zip(record['landmarks'], landmarks.tolist()):
+        lm['x'], lm['y'], lm['z'], lm['visibility'] = x, y, z, visibility
+
+
+def smooth_stream(path, output, method='one_euro', params=None):
+    """Smooth a stored skeleton stream into output; returns records written"""
+    smoother = LandmarkSmoother(method, params)
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+
+    # Consecutive records with the same timestamp are the poses of one frame
+    frames = []
+    for record in records:
+        if frames and frames[-1][0]['timestamp'] == record['timestamp']:
+            frames[-1].append(record)
+        else:
+            frames.append([record])
+
+    tmp = Path(str(output) + '.tmp')
+    with open(tmp, 'w') as out:
+        for frame in frames:
+            smoothed = smoother.smooth([landmarks_array(record) for record in frame], frame[0]['timestamp'])
+            for record, landmarks in zip(frame, smoothed):
+                set_landmarks(record, landmarks)
+                record['smoothing'] = method
+                out.write(json.dumps(record) + '\n')
+    os.replace(tmp, output)
+    return len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Smooth a recorded skeleton stream")
+    parser.add_argument('path', help="skeleton_<session>.json")
+    parser.add_argument('--method', choices=sorted(FILTERS), default='one_euro')
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=VALUE',
+                        help="filter parameter, e.g. beta=2.0 (repeatable)")
+    parser.add_argument('--output', help="output file (default: <path stem>_smoothed.json)")
+    args = parser.parse_args()
+
+    params = {name: float(value) for name, value in (param.split('=', 1) for param in args.param)}
+    path = Path(args.path)
+    output = args.output or path.with_name(f"{path.stem}_smoothed.json")
+    count = smooth_stream(path, output, args.method, params)
+    print(f"Smoothed {count} skeleton records ({args.method}) to {output}")
+
+
+if __name__ == "__main__":
+    main()
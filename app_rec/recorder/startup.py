@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Startup timing
+Named phases timed against process launch, so "ready N ms after launch"
+includes interpreter start and imports. Foreground phases (up to ready)
+and background phases (module and model loading) are recorded the same way.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+def process_age():
+    """Seconds since this process was started (Linux /proc), or None"""
+    try:
+        with open('/proc/self/stat') as f:
+            # Field 22 (starttime, clock ticks since boot); skip past "(comm)"
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupTimer:
+    """Phase durations and completion times since launch"""
+
+    def __init__(self):
+        now = time.monotonic()
+        self.origin = now - (process_age() or 0.0)
+        self.phases = []
+        self.ready_at = None
+        self.lock = threading.Lock()
+        # Everything before the recorder was constructed (interpreter + imports)
+        self.phases.append(('launch', now - self.origin, now - self.origin, 'MainThread'))
+
+    def since_launch(self):
+        return time.monotonic() - self.origin
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block as one startup phase"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            end = time.monotonic()
+            with self.lock:
+                self.phases.append((name, end - start, end - self.origin, threading.current_thread().name))
+
+    def ready(self):
+        """Mark the recorder as ready (inputs armed, status shown)"""
+        self.ready_at = self.since_launch()
+        print(f"Ready {self.ready_at * 1000:.0f} ms after launch")
+
+    def report(self):
+        """Human-readable phase table"""
+        lines = ["Startup phases:"]
+        with self.lock:
+            phases = list(self.phases)
+        for name, duration, done_at, thread in phases:
+            lines.append(f"  {name:<16} {duration * 1000:8.1f} ms  done at {done_at * 1000:7.0f} ms  [{thread}]")
+        if self.ready_at is not None:
+            lines.append(f"  ready at {self.ready_at * 1000:.0f} ms")
+        return '\n'.join(lines)
+
+    def as_dict(self):
+        with self.lock:
+            phases = list(self.phases)
+        return {
+            'ready_ms': self.ready_at * 1000 if self.ready_at is not None else None,
+            'phases': [
+                {'name': name, 'duration_ms': duration * 1000, 'done_at_ms': done_at * 1000, 'thread': thread}
+                for name, duration, done_at, thread in phases
+            ],
+        }
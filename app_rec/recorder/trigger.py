@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Motion trigger
+Decides when an armed recorder should start and stop sessions from two
+cheap activity signals:
+
+- IMU: variance of the accelerometer magnitude over the last imu_window
+  seconds (orientation independent, (m/s^2)^2), kept as per-batch sums so
+  each sample costs a few additions
+- frames: mean absolute grey-level difference between consecutive frames
+  subsampled to about 64 pixels wide (a strided view, no resize), fed at
+  most watch_fps times per second so it reads the same whether the frames
+  come from the low-rate watch pipeline or from a recording
+
+Hysteresis: a session starts once either signal stays above its *_start
+threshold for start_hold seconds, and stops once every signal stays below
+its *_stop threshold for stop_hold seconds. Between the two thresholds
+neither timer runs. A signal not updated for STALE_S counts as quiet.
+"""
+
+import threading
+from collections import deque
+
+# Subsampled frame width for the difference energy
+TARGET_WIDTH = 64
+
+# A signal older than this is ignored (e.g. the IMU is off)
+STALE_S = 2.0
+
+
+def downscale(frame):
+    """Grey float32 frame about TARGET_WIDTH pixels wide, by striding"""
+    step = max(1, frame.shape[1] // TARGET_WIDTH)
+    small = frame[::step, ::step]
+    if small.ndim == 3:
+        return small.mean(axis=2, dtype='float32')
+    return small.astype('float32')
+
+
+class MotionTrigger:
+    """Activity detector with start/stop hysteresis"""
+
+    def __init__(self, config):
+        self.imu_start = config['imu_start']
+        self.imu_stop = config['imu_stop']
+        self.imu_window = config['imu_window']
+        self.frame_start = config['frame_start']
+        self.frame_stop = config['frame_stop']
+        self.start_hold = config['start_hold']
+        self.stop_hold = config['stop_hold']
+        # A little under the watch frame interval, so frame timing jitter doesn't skip frames
+        self.frame_interval = 0.9 / config['watch_fps']
+        # Fed from the capture thread, read from the controller thread
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self, active=False):
+        with self.lock:
+            self.active = active
+            # (time, count, sum, sum of squares) of accelerometer magnitudes per batch
+            self.batches = deque()
+            self.batch = [0, 0.0, 0.0]
+            self.imu_variance = None
+            self.imu_time = None
+            self.previous_frame = None
+            self.frame_energy = None
+            self.frame_time = None
+            self.high_since = None
+            self.quiet_since = None
+
+    def add_accel(self, x, y, z):
+        """One accelerometer sample (any rate); folded into the window by end_batch()"""
+        magnitude = (x * x + y * y + z * z) ** 0.5
+        batch = self.batch
+        batch[0] += 1
+        batch[1] += magnitude
+        batch[2] += magnitude * magnitude
+
+    def end_batch(self, now):
+        """Close the current IMU batch and update the windowed variance"""
+        with self.lock:
+            count, total, squares = self.batch
+            if not count:
+                return
+            self.batch = [0, 0.0, 0.0]
+            batches = self.batches
+            batches.append((now, count, total, squares))
+            while batches and now - batches[0][0] > self.imu_window:
+                batches.popleft()
+            n = sum(b[1] for b in batches)
+            mean = sum(b[2] for b in batches) / n
+            self.imu_variance = max(0.0, sum(b[3] for b in batches) / n - mean * mean)
+            self.imu_time = now
+
+    def wants_frame(self, now):
+        """True when a frame is due for the difference energy (at most watch_fps)"""
+        return self.frame_time is None or now - self.frame_time >= self.frame_interval
+
+    def add_frame(self, frame, now):
+        """Frame difference energy against the previous fed frame"""
+        small = downscale(frame)
+        with self.lock:
+            previous = self.previous_frame
+            self.previous_frame = small
+            self.frame_time = now
+            if previous is not None and previous.shape == small.shape:
+                self.frame_energy = float(abs(small - previous).mean())
+
+    def signals(self, now):
+        """(IMU variance, frame energy), None for a stale or missing signal"""
+        imu = self.imu_variance if self.imu_time is not None and now - self.imu_time < STALE_S else None
+        energy = self.frame_energy if self.frame_time is not None and now - self.frame_time < STALE_S else None
+        return imu, energy
+
+    def update(self, now):
+        """'start', 'stop' or None: the transition at `now`, if any"""
+        imu, energy = self.signals(now)
+        high = (imu is not None and imu > self.imu_start) or (energy is not None and energy > self.frame_start)
+        quiet = (imu is None or imu < self.imu_stop) and (energy is None or energy < self.frame_stop)
+        with self.lock:
+            self.high_since = (self.high_since or now) if high else None
+            self.quiet_since = (self.quiet_since or now) if quiet else None
+            if not self.active and self.high_since is not None and now - self.high_since >= self.start_hold:
+                self.active = True
+                return 'start'
+            if self.active and self.quiet_since is not None and now - self.quiet_since >= self.stop_hold:
+                self.active = False
+                return 'stop'
+        return None
+
+    def status(self, now):
+        imu, energy = self.signals(now)
+        imu = f"{imu:.3f}" if imu is not None else "-"
+        energy = f"{energy:.1f}" if energy is not None else "-"
+        return f"IMU variance {imu}, frame energy {energy}"
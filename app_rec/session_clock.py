@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+GPS-disciplined session clock
+The Pi has no RTC, so wall time may drift or start at 1970 without NTP.
+This clock models UTC as a linear function of host monotonic time:
+
+    utc = host_monotonic + offset + drift * (host_monotonic - reference)
+
+NMEA samples (receiver UTC vs. host receive time) arrive late by a variable
+serial/processing delay, so the model is fitted as an upper envelope of the
+recent samples. PPS edges (kernel-timestamped on a GPIO) mark the exact top
+of a UTC second and replace NMEA as the sample source when present.
+
+Until the first sample arrives the clock falls back to the system clock.
+"""
+
+import datetime
+import threading
+import time
+from collections import deque
+
+try:
+    import gpiod
+except ImportError:
+    gpiod = None
+
+# Crystal oscillators are well within this; anything larger is a bad fit
+MAX_DRIFT = 500e-6
+
+
+class SessionClock:
+    """Host monotonic -> UTC offset model"""
+
+    def __init__(self, window=600, nmea_latency=0.0):
+        self.window = window
+        self.nmea_latency = nmea_latency
+        self.samples = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+        # (reference_monotonic, offset, drift) - replaced atomically
+        self.model = None
+        self.source = 'system'
+        self.updates = 0
+        self.residual = None
+        self.last_pps = None
+
+    def fit(self):
+        """Drift from the envelope of each half-window, then shift up to the envelope"""
+        samples = list(self.samples)
+        n = len(samples)
+        reference = samples[-1][0]
+        if n < 8:
+            offset = max(y for _, y in samples)
+            return reference, offset, 0.0, 0.0
+
+        # Least-delayed sample of each half approximates the true UTC line
+        x1, y1 = max(samples[:n // 2], key=lambda s: s[1])
+        x2, y2 = max(samples[n // 2:], key=lambda s: s[1])
+        drift = (y2 - y1) / (x2 - x1) if x2 > x1 else 0.0
+        drift = max(-MAX_DRIFT, min(MAX_DRIFT, drift))
+
+        # Envelope: no sample may be later than the model (delays are >= 0)
+        offset = max(y - drift * (x - reference) for x, y in samples)
+        residual = max(offset - (y - drift * (x - reference)) for x, y in samples)
+        return reference, offset, drift, residual
+
+    def add_sample(self, host_monotonic, utc, source):
+        """Add one (host monotonic, UTC) pair and refit"""
+        with self.lock:
+            if source == 'pps' and self.source == 'nmea':
+                # PPS is exact - drop the latency-biased NMEA history
+                self.samples.clear()
+            elif source == 'nmea' and self.source == 'pps' and self.last_pps is not None \
+                    and host_monotonic - self.last_pps < 5.0:
+                # PPS still alive, ignore NMEA
+                return
+            self.samples.append((host_monotonic, utc - host_monotonic))
+            reference, offset, drift, residual = self.fit()
+            self.model = (reference, offset, drift)
+            self.source = source
+            self.residual = residual
+            self.updates += 1
+
+    def add_fix(self, fix):
+        """Feed a fused GPS fix (gps_fix.FixAssembler output)"""
+        # Only RMC-validated fixes with a full date carry a trustworthy UTC
+        if fix.get('status') != 'A' or fix.get('utc_timestamp') is None:
+            return False
+        self.add_sample(fix['host_monotonic'], fix['utc_timestamp'] + self.nmea_latency, 'nmea')
+        return True
+
+    def add_pps(self, edge_monotonic):
+        """Feed a PPS edge; the UTC second is taken from the current model"""
+        if self.model is None:
+            return False
+        utc_second = round(self.from_monotonic(edge_monotonic))
+        self.last_pps = edge_monotonic
+        self.add_sample(edge_monotonic, float(utc_second), 'pps')
+        return True
+
+    @property
+    def synced(self):
+        return self.model is not None
+
+    def from_monotonic(self, host_monotonic):
+        """Convert a host monotonic timestamp to (corrected) UTC seconds"""
+        model = self.model
+        if model is None:
+            return host_monotonic + (time.time() - time.monotonic())
+        reference, offset, drift = model
+        return host_monotonic + offset + drift * (host_monotonic - reference)
+
+    def now(self):
+        """Corrected UTC seconds"""
+        return self.from_monotonic(time.monotonic())
+
+    def datetime(self):
+        """Corrected time as a local datetime (for filenames and overlays)"""
+        return datetime.datetime.fromtimestamp(self.now())
+
+    def state(self):
+        """Current offset model, for recording in the session"""
+        model = self.model
+        host_monotonic = time.monotonic()
+        state = {
+            'source': self.source,
+            'host_monotonic': host_monotonic,
+            'utc': self.from_monotonic(host_monotonic),
+            'system_time': time.time(),
+            'updates': self.updates,
+        }
+        if model is not None:
+            reference, offset, drift = model
+            state.update({
+                'reference_monotonic': reference,
+                'offset': offset,
+                'drift_ppm': drift * 1e6,
+                'envelope_residual': self.residual,
+                'system_error': state['system_time'] - state['utc'],
+            })
+        return state
+
+
+class PpsListener:
+    """Feeds kernel-timestamped PPS edges from a GPIO line into a SessionClock
+
+    Requires the libgpiod v2 Python bindings (gpiod.request_lines).
+    """
+
+    def __init__(self, clock, pin, chip='/dev/gpiochip0'):
+        self.clock = clock
+        self.pin = pin
+        self.chip = chip
+        self.request = None
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.edges = 0
+
+    def start(self):
+        if gpiod is None or not hasattr(gpiod, 'request_lines'):
+            print("PPS disabled: libgpiod v2 bindings not available")
+            return False
+        try:
+            settings = gpiod.LineSettings(
+                edge_detection=gpiod.line.Edge.RISING,
+                event_clock=gpiod.line.Clock.MONOTONIC,
+            )
+            self.request = gpiod.request_lines(self.chip, consumer="pps", config={self.pin: settings})
+        except Exception as e:
+            print(f"PPS disabled: {e}")
+            return False
+        self.thread = threading.Thread(target=self.run, name="pps")
+        self.thread.daemon = True
+        self.thread.start()
+        print(f"PPS listener started on GPIO{self.pin}")
+        return True
+
+    def run(self):
+        while not self.stop_event.is_set():
+            if not self.request.wait_edge_events(0.5):
+                continue
+            for event in self.request.read_edge_events():
+                self.edges += 1
+                self.clock.add_pps(event.timestamp_ns / 1e9)
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=1)
+            self.thread = None
+        if self.request:
+            self.request.release()
+            self.request = None
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Asynchronous session writer
+Moves all session file I/O off the capture/IMU/GPS threads.
+
+Producers push records into per-stream bounded buffers and never touch the
+disk. One writer thread per lane drains the buffers, serializes JSON records
+and issues one large write per stream per cycle, with optional fsync cadence.
+Video frames go through their own lane so encoding never stalls the JSON
+streams.
+"""
+
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+
+from perf_probes import probe
+
+
+class SessionStream(ABC):
+    """Bounded, non-blocking buffer for one output stream"""
+
+    def __init__(self, name, lane, max_buffered):
+        self.name = name
+        self.lane = lane
+        self.max_buffered = max_buffered
+        self.buffer = deque()
+        self.write_probe = probe(f"write.{name}")
+
+        # Metrics (updated without locks - approximate is fine for reporting)
+        self.peak_buffered = 0
+        self.records_in = 0
+        self.records_written = 0
+        self.dropped = 0
+        # Records the writer could not serialize (skipped, the rest still written)
+        self.failed = 0
+        self.bytes_written = 0
+
+    def write(self, record):
+        """Queue one record; drops (and counts) it if the buffer is full"""
+        buffered = len(self.buffer)
+        if buffered >= self.max_buffered:
+            self.dropped += 1
+            return False
+        self.buffer.append(record)
+        self.records_in += 1
+        if buffered + 1 > self.peak_buffered:
+            self.peak_buffered = buffered + 1
+        self.lane.wake()
+        return True
+
+    def full(self):
+        """True when the next write() would be dropped"""
+        return len(self.buffer) >= self.max_buffered
+
+    def drop(self):
+        """Count a record the producer discarded because the buffer was full"""
+        self.dropped += 1
+
+    def drain(self):
+        """Pop everything currently buffered"""
+        items = []
+        buffer = self.buffer
+        for _ in range(len(buffer)):
+            items.append(buffer.popleft())
+        return items
+
+    @abstractmethod
+    def flush_to_disk(self):
+        """Write out buffered records; returns number of records written"""
+
+    @abstractmethod
+    def close(self):
+        """Release the underlying file or writer"""
+
+    def metrics(self):
+        """Snapshot of buffer occupancy and throughput"""
+        return {
+            'lane': self.lane.name,
+            'buffered': len(self.buffer),
+            'max_buffered': self.max_buffered,
+            'peak_buffered': self.peak_buffered,
+            'records_in': self.records_in,
+            'records_written': self.records_written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'bytes_written': self.bytes_written,
+        }
+
+
+class JsonLinesStream(SessionStream):
+    """JSON-lines file; records are serialized on the writer thread"""
+
+    def __init__(self, name, lane, path, max_buffered):
+        super().__init__(name, lane, max_buffered)
+        self.path = path
+        self.file = open(path, 'w')
+
+    def flush_to_disk(self):
+        items = self.drain()
+        if not items:
+            return 0
+        start = time.perf_counter_ns()
+        # Per record, so one bad record doesn't lose the whole drained batch
+        lines = []
+        for item in items:
+            try:
+                lines.append((item if isinstance(item, str) else json.dumps(item)) + '\n')
+            except Exception as e:
+                if not self.failed:
+                    print(f"Skipping unserializable {self.name} record: {e}")
+                self.failed += 1
+        chunk = ''.join(lines)
+        self.file.write(chunk)
+        self.file.flush()
+        self.write_probe.record(time.perf_counter_ns() - start)
+        self.records_written += len(lines)
+        self.bytes_written += len(chunk)
+        return len(lines)
+
+    def fsync(self):
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+class VideoStream(SessionStream):
+    """Frames handed to a cv2.VideoWriter-like object (anything with write/release)
+
+    block=True makes write() wait for buffer room instead of dropping, for
+    offline producers (replay) that can run faster than the encoder. Items
+    are (frame, repeat); the writer thread writes each frame repeat times.
+    """
+
+    def __init__(self, name, lane, writer, max_buffered, block=False):
+        super().__init__(name, lane, max_buffered)
+        self.writer = writer
+        self.block = block
+        self.room = threading.Event()
+
+    def write(self, frame):
+        if self.block:
+            while len(self.buffer) >= self.max_buffered:
+                self.room.clear()
+                self.room.wait(0.05)
+        return super().write((frame, 1))
+
+    def write_repeat(self, frame, repeat):
+        """Queue `repeat` more copies of a frame as one item; never dropped
+
+        The frame is one already queued or written, so going past
+        max_buffered costs no frame memory, and a run of duplicates can't
+        be cut short by a full buffer.
+        """
+        self.buffer.append((frame, repeat))
+        self.records_in += repeat
+        self.peak_buffered = max(self.peak_buffered, len(self.buffer))
+        self.lane.wake()
+        return True
+
+    def flush_to_disk(self):
+        items = self.drain()
+        self.room.set()
+        written = 0
+        for frame, repeat in items:
+            for _ in range(repeat):
+                start = time.perf_counter_ns()
+                self.writer.write(frame)
+                self.write_probe.record(time.perf_counter_ns() - start)
+                self.bytes_written += getattr(frame, 'nbytes', 0)
+            written += repeat
+        self.records_written += written
+        return written
+
+    def fsync(self):
+        pass
+
+    def close(self):
+        self.writer.release()
+
+
+class WriterLane:
+    """One writer thread draining a group of streams"""
+
+    def __init__(self, name, flush_interval, fsync_interval):
+        self.name = name
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.streams = []
+        self.wake_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = None
+        # Held while writing, so a stream is never closed mid-write
+        self.lock = threading.Lock()
+
+        # Write latency metrics (seconds per drain cycle that wrote something)
+        self.cycles = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+        self.last_fsync = time.monotonic()
+
+    def wake(self):
+        """Signal pending data (cheap no-op when already signalled)"""
+        if not self.wake_event.is_set():
+            self.wake_event.set()
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name=f"writer-{self.name}")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def drain_once(self):
+        """Flush every stream in this lane once"""
+        start = time.perf_counter()
+        written = 0
+        with self.lock:
+            for stream in self.streams:
+                try:
+                    written += stream.flush_to_disk()
+                except Exception as e:
+                    print(f"Error writing stream {stream.name}: {e}")
+
+        if self.fsync_interval is not None and time.monotonic() - self.last_fsync >= self.fsync_interval:
+            for stream in self.streams:
+                try:
+                    stream.fsync()
+                except Exception as e:
+                    print(f"Error syncing stream {stream.name}: {e}")
+            self.last_fsync = time.monotonic()
+
+        if written:
+            latency = time.perf_counter() - start
+            self.cycles += 1
+            self.last_latency = latency
+            self.total_latency += latency
+            if latency > self.max_latency:
+                self.max_latency = latency
+        return written
+
+    def run(self):
+        """Writer thread: batch for flush_interval (or wake per record when 0), then drain"""
+        while not self.stop_event.is_set():
+            if self.flush_interval:
+                # Let producers batch up before the next large write
+                self.stop_event.wait(self.flush_interval)
+            else:
+                self.wake_event.wait(0.1)
+                self.wake_event.clear()
+            self.drain_once()
+
+        # Final drain after stop
+        while self.drain_once():
+            pass
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def metrics(self):
+        return {
+            'cycles': self.cycles,
+            'last_latency_ms': self.last_latency * 1000.0,
+            'max_latency_ms': self.max_latency * 1000.0,
+            'avg_latency_ms': (self.total_latency / self.cycles * 1000.0) if self.cycles else 0.0,
+        }
+
+
+class SessionWriter:
+    """I/O subsystem for one recording session"""
+
+    def __init__(self, directory, flush_interval=0.25, fsync_interval=None):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.lanes = {}
+        self.streams = {}
+        self.closed_streams = {}
+        self.closed = False
+
+    def get_lane(self, name, flush_interval=None):
+        """Get (or create and start) the writer lane with this name"""
+        lane = self.lanes.get(name)
+        if lane is None:
+            if flush_interval is None:
+                flush_interval = self.flush_interval
+            lane = WriterLane(name, flush_interval, self.fsync_interval)
+            self.lanes[name] = lane
+            lane.start()
+        return lane
+
+    def open_json_stream(self, name, filename, max_buffered=20000, lane='data'):
+        """Open a JSON-lines output file and return its stream"""
+        lane = self.get_lane(lane)
+        stream = JsonLinesStream(name, lane, self.directory / filename, max_buffered)
+        lane.streams.append(stream)
+        self.streams[name] = stream
+        return stream
+
+    def open_video_stream(self, name, writer, max_buffered=8, lane='video', block=False):
+        """Wrap an opened video writer so frames are encoded on a writer thread"""
+        # Frames are large and can't be coalesced, so hand them over immediately
+        lane = self.get_lane(lane, flush_interval=0)
+        stream = VideoStream(name, lane, writer, max_buffered, block)
+        lane.streams.append(stream)
+        self.streams[name] = stream
+        return stream
+
+    def close_stream(self, name):
+        """Drain and close one stream, leaving the rest of the session open"""
+        stream = self.streams.pop(name, None)
+        if stream is None:
+            return
+        lane = stream.lane
+        with lane.lock:
+            lane.streams.remove(stream)
+            try:
+                stream.flush_to_disk()
+            finally:
+                stream.close()
+                self.closed_streams[name] = stream.metrics()
+
+    def metrics(self):
+        """Buffer occupancy per stream and write latency per lane"""
+        streams = dict(self.closed_streams)
+        streams.update({name: stream.metrics() for name, stream in self.streams.items()})
+        return {
+            'streams': streams,
+            'lanes': {name: lane.metrics() for name, lane in self.lanes.items()},
+        }
+
+    def close(self):
+        """Stop writer threads after a final drain, then close all files"""
+        if self.closed:
+            return
+        self.closed = True
+        for lane in self.lanes.values():
+            lane.stop()
+        for stream in list(self.streams.values()):
+            try:
+                stream.close()
+            except Exception as e:
+                print(f"Error closing stream {stream.name}: {e}")
+        summary = self.metrics()
+        self.streams = {}
+        return summary
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Live LCD status dashboard
+The capture/GPS threads only bump plain counters on a RecorderStats object.
+A separate dashboard thread samples them at a throttled rate, derives rates
+(FPS, bitrate) and rotates 16x2 status pages through the LcdService.
+
+Pages while recording:
+  REC hh:mm:ss     / C3 fps + inference latency
+  Drops            / received vs written FPS
+  Cameras 1/2/3    / session bitrate
+  Free space       / time remaining at current bitrate
+  GPS fix + sats   / HDOP
+"""
+
+import shutil
+import threading
+import time
+
+
+class RecorderStats:
+    """Counters updated from the recording threads (plain increments, no locks)"""
+
+    def __init__(self):
+        self.reset()
+        self.gps_fix = None
+
+    def reset(self, session=None):
+        self.session = session
+        self.session_start = time.monotonic()
+        self.frames_received = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.inference_count = 0
+        self.inference_time = 0.0
+        self.session_writer = None
+        self.last_sequence = None
+
+    def frame_received(self, sequence_num=None):
+        """Count a camera frame; device sequence gaps are counted as drops"""
+        self.frames_received += 1
+        if sequence_num is not None:
+            if self.last_sequence is not None and sequence_num > self.last_sequence + 1:
+                self.frames_dropped += sequence_num - self.last_sequence - 1
+            self.last_sequence = sequence_num
+
+    def frame_written(self):
+        self.frames_written += 1
+
+    def inference_done(self, seconds):
+        self.inference_count += 1
+        self.inference_time += seconds
+
+
+def format_duration(seconds):
+    seconds = int(max(0, seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+def format_short_duration(seconds):
+    if seconds is None:
+        return "--"
+    minutes = int(seconds // 60)
+    if minutes >= 60:
+        return f"{minutes // 60}h{minutes % 60:02d}m"
+    return f"{minutes}m"
+
+
+def format_bytes(count):
+    for unit in ('B', 'K', 'M', 'G', 'T'):
+        if count < 1024 or unit == 'T':
+            return f"{count:.1f}{unit}" if unit != 'B' else f"{int(count)}B"
+        count /= 1024.0
+
+
+class StatusDashboard:
+    """Throttled metrics sampler and LCD page rotation"""
+
+    def __init__(self, lcd, stats, recordings_dir, sample_interval=1.0, page_seconds=3.0):
+        self.lcd = lcd
+        self.stats = stats
+        self.recordings_dir = recordings_dir
+        self.sample_interval = sample_interval
+        self.page_seconds = page_seconds
+        self.recording = False
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        # Previous sample, for rates
+        self.last_sample_time = None
+        self.last_frames_received = 0
+        self.last_frames_written = 0
+        self.last_inference_count = 0
+        self.last_inference_time = 0.0
+        self.last_file_sizes = {}
+
+        # Derived values shown on the pages
+        self.rx_fps = 0.0
+        self.write_fps = 0.0
+        self.inference_ms = None
+        self.bytes_per_second = 0.0
+        self.session_bytes = 0
+        self.growing = set()
+        self.free_bytes = None
+        self.page_index = 0
+        self.page_started = time.monotonic()
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="dashboard")
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def set_recording(self, recording):
+        """Switch between the ready page and the recording page rotation"""
+        self.recording = recording
+        self.last_sample_time = None
+        self.last_file_sizes = {}
+        self.page_index = 0
+        self.page_started = time.monotonic()
+
+    def session_files(self):
+        session = self.stats.session
+        if not session:
+            return []
+        return list(self.recordings_dir.glob(f"*_{session}.*"))
+
+    def sample(self):
+        """Read counters and file sizes, derive rates since the previous sample"""
+        now = time.monotonic()
+        stats = self.stats
+
+        try:
+            self.free_bytes = shutil.disk_usage(self.recordings_dir).free
+        except OSError:
+            self.free_bytes = None
+
+        sizes = {}
+        for path in self.session_files():
+            try:
+                sizes[path.name] = path.stat().st_size
+            except OSError:
+                pass
+
+        if self.last_sample_time is not None:
+            elapsed = now - self.last_sample_time
+            if elapsed > 0:
+                self.rx_fps = (stats.frames_received - self.last_frames_received) / elapsed
+                self.write_fps = (stats.frames_written - self.last_frames_written) / elapsed
+                inferences = stats.inference_count - self.last_inference_count
+                if inferences:
+                    self.inference_ms = (stats.inference_time - self.last_inference_time) / inferences * 1000.0
+                grown = sum(size - self.last_file_sizes.get(name, 0) for name, size in sizes.items())
+                self.bytes_per_second = max(0.0, grown / elapsed)
+                self.growing = {name.split('_', 1)[0] for name, size in sizes.items()
+                                if size > self.last_file_sizes.get(name, 0)}
+
+        self.session_bytes = sum(sizes.values())
+        self.last_sample_time = now
+        self.last_frames_received = stats.frames_received
+        self.last_frames_written = stats.frames_written
+        self.last_inference_count = stats.inference_count
+        self.last_inference_time = stats.inference_time
+        self.last_file_sizes = sizes
+
+    def io_dropped(self):
+        writer = self.stats.session_writer
+        if writer is None:
+            return 0
+        try:
+            return sum(s['dropped'] for s in writer.metrics()['streams'].values())
+        except Exception:
+            return 0
+
+    def gps_line(self):
+        fix = self.stats.gps_fix
+        if fix is None:
+            return "GPS --"
+        if fix.get('latitude') is None:
+            return f"GPS NOFIX {fix.get('satellites_in_view') or 0}vis"
+        kind = {2: '2D', 3: '3D'}.get(fix.get('fix_type'), 'FIX')
+        return f"GPS {kind} {fix.get('satellites') or 0}sat"
+
+    def ready_page(self):
+        free = format_bytes(self.free_bytes) if self.free_bytes is not None else "--"
+        return "SOGO READY", f"Free {free}"
+
+    def recording_pages(self):
+        stats = self.stats
+        elapsed = time.monotonic() - stats.session_start
+        inference = f"{self.inference_ms:.0f}ms" if self.inference_ms is not None else "--"
+        remaining = None
+        if self.free_bytes is not None and self.bytes_per_second > 0:
+            remaining = self.free_bytes / self.bytes_per_second
+        cameras = ' '.join(
+            f"C{n}{'+' if f'camera{n}' in self.growing else '-'}" for n in (1, 2, 3)
+        )
+        fix = stats.gps_fix or {}
+        hdop = fix.get('hdop')
+
+        return [
+            (f"REC {format_duration(elapsed)}", f"C3 {self.write_fps:4.1f}f {inference}"),
+            (f"Drop F{stats.frames_dropped} IO{self.io_dropped()}", f"Rx{self.rx_fps:4.1f} Wr{self.write_fps:4.1f}"),
+            (cameras, f"{format_bytes(self.bytes_per_second)}/s"),
+            (f"Free {format_bytes(self.free_bytes) if self.free_bytes is not None else '--'}",
+             f"Left {format_short_duration(remaining)}"),
+            (self.gps_line(), f"HDOP {hdop}" if hdop is not None else "HDOP --"),
+        ]
+
+    def render(self):
+        if not self.recording:
+            return self.ready_page(), (0, 128, 64)
+        pages = self.recording_pages()
+        now = time.monotonic()
+        if now - self.page_started >= self.page_seconds:
+            self.page_index = (self.page_index + 1) % len(pages)
+            self.page_started = now
+        return pages[self.page_index % len(pages)], (255, 0, 0)
+
+    def run(self):
+        while not self.stop_event.wait(self.sample_interval):
+            try:
+                self.sample()
+                (line1, line2), rgb = self.render()
+                self.lcd.show(f"{line1[:16]}\n{line2[:16]}", rgb)
+            except Exception as e:
+                print(f"Dashboard update failed: {e}")
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+            self.thread = None
@@ -7,15 +7,19 @@ import serial
 import time
 import json
 from pathlib import Path
+from nmea_parser import NmeaParser
+from recorder.config import load_config
 
 def test_gps_connection():
     """Test GPS serial connection and data parsing"""
     print("Testing GPS connection...")
     
     try:
-        # Open serial connection to GPS
-        gps_serial = serial.Serial('/dev/ttyUSB0', baudrate=9600, timeout=1)
+        # Open serial connection to GPS (config file and GPS_* environment, as the recorder)
+        settings = load_config()['gps']
+        gps_serial = serial.Serial(settings['port'], baudrate=settings['baudrate'], timeout=1)
         print("✅ GPS serial connection opened successfully")
+        parser = NmeaParser()
         
         # Test reading GPS data
         print("Reading GPS data for 10 seconds...")
@@ -29,18 +33,21 @@ def test_gps_connection():
                     print(f"GPS: {gps_line}")
                     
                     # Test parsing
-                    if gps_line.startswith('$GPGGA') or gps_line.startswith('$GPRMC'):
-                        parts = gps_line.split(',')
-                        if len(parts) >= 5:
-                            lat = parts[2] if parts[2] else "N/A"
-                            lon = parts[4] if parts[4] else "N/A"
-                            print(f"   Location: {lat}, {lon}")
+                    gps_data = parser.parse(gps_line)
+                    if gps_data and gps_data['type'] in ('GGA', 'RMC'):
+                        lat = gps_data['latitude']
+                        lon = gps_data['longitude']
+                        if lat is not None and lon is not None:
+                            print(f"   Location: {lat:.6f}, {lon:.6f} ({gps_data['talker']}{gps_data['type']})")
+                        else:
+                            print("   Location: N/A (no fix)")
                 
             except Exception as e:
                 print(f"Error reading GPS: {e}")
                 break
         
         gps_serial.close()
+        print(f"   Parser stats: {parser.stats()}")
         print("✅ GPS test completed successfully")
         
     except Exception as e:
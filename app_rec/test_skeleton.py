@@ -19,6 +19,9 @@ def test_skeleton_initialization():
     try:
         recorder = MultiCameraRecorder()
         
+        # The pose model loads in the background after startup
+        recorder.models_ready.wait(timeout=60)
+        
         if recorder.skeleton_enabled:
             print("✅ Skeleton recognition initialized successfully")
             print(f"   - Model loaded: {recorder.pose_detector is not None}")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Pre-rendered text tiles
+cv2.putText rasterizes every glyph on every call. A TextTile renders a
+string once into an anti-aliased coverage map and then alpha-blends the
+text colour over the frame through it, so text that changes rarely (a
+timestamp once per second) costs one small blend per frame and looks the
+same as putText with LINE_AA. The blend touches every pixel of the tile's
+box, so it is only somewhat cheaper than putText (see bench_overlay.py).
+
+Used by the recorder's camera3 overlay (recorder/overlay.py).
+"""
+
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+def pen_advance(text, scale, thickness, font=FONT):
+    """x distance putText moves the pen for text (getTextSize's width is one pixel more)"""
+    return cv2.getTextSize(text, font, scale, thickness)[0][0] - 1 if text else 0
+
+
+class TextTile:
+    """A string pre-rendered as an alpha tile, blended into frames
+
+    blank: index of one character to leave out (drawn separately, e.g. a
+    digit that changes every frame); its pen position is blank_x.
+    """
+
+    def __init__(self, text, scale, color, thickness, blank=None, font=FONT):
+        (width, height), baseline = cv2.getTextSize(text, font, scale, thickness)
+        self.text = text
+        # Room for the stroke around the text box
+        pad = thickness + 1
+        ascent = height + pad
+        coverage = np.zeros((height + baseline + 2 * pad, width + 2 * pad), np.uint8)
+        if blank is None:
+            self.blank_x = None
+            cv2.putText(coverage, text, (pad, ascent), font, scale, 255, thickness, cv2.LINE_AA)
+        else:
+            self.blank_x = pen_advance(text[:blank], scale, thickness, font)
+            after = pen_advance(text[:blank + 1], scale, thickness, font)
+            cv2.putText(coverage, text[:blank], (pad, ascent), font, scale, 255, thickness, cv2.LINE_AA)
+            cv2.putText(coverage, text[blank + 1:], (pad + after, ascent), font, scale, 255, thickness, cv2.LINE_AA)
+
+        # Blend only the inked box; (top, left) is its corner relative to the pen origin
+        x, y, width, height = cv2.boundingRect(coverage)
+        # A blank string keeps one transparent pixel
+        coverage = coverage[y:y + max(height, 1), x:x + max(width, 1)]
+        self.top, self.left = y - ascent, x - pad
+
+        # frame * (255 - alpha) / 255 + colour * alpha / 255, as two saturating cv2 ops per draw
+        self.shape = coverage.shape
+        self.inverse = cv2.merge([255 - coverage] * 3)
+        self.tint = cv2.merge([cv2.multiply(coverage, channel / 255.0) for channel in color])
+
+    def draw(self, frame, x, y):
+        """Blend into the frame at baseline origin (x, y), clipped to the frame"""
+        top, left = y + self.top, x + self.left
+        height, width = self.shape
+        y0, x0 = max(top, 0), max(left, 0)
+        y1, x1 = min(top + height, frame.shape[0]), min(left + width, frame.shape[1])
+        if y0 >= y1 or x0 >= x1:
+            return
+        tile = (slice(y0 - top, y1 - top), slice(x0 - left, x1 - left))
+        # In place: the ROI view shares the frame's memory
+        roi = frame[y0:y1, x0:x1]
+        cv2.multiply(roi, self.inverse[tile], dst=roi, scale=1 / 255.0)
+        cv2.add(roi, self.tint[tile], dst=roi)